@@ -37,19 +37,12 @@ class User(AbstractUser):
         they are associated with all of the residents' homes.
         """
         from residents.models import Resident
-        from homes.models import HomeUserRelation
 
         if self.is_superuser:
             return True
 
-        residents = Resident.objects.filter(id__in=resident_ids)
-
-        for resident in residents:
-            # Check if the user is associated with the resident's home
-            if HomeUserRelation.objects.filter(
-                home=resident.current_home,
-                user=self,
-            ).exists():
-                return True
-
-        return False
+        # Check if the user is associated with a resident's current home
+        return Resident.objects.filter(
+            id__in=resident_ids,
+            current_residency__home__home_user_relations__user=self,
+        ).exists()
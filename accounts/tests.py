@@ -51,6 +51,12 @@ class CanManageResidentsTest(TestCase):
         ]
         self.assertTrue(self.regular_user.can_manage_residents(resident_ids))
 
+    def test_single_query(self):
+        resident_ids = [self.resident2.id, self.resident1.id]
+
+        with self.assertNumQueries(1):
+            self.regular_user.can_manage_residents(resident_ids)
+
     def test_regular_user_cannot_manage_unassociated_residents(self):
         resident_ids = [
             self.resident2.id,
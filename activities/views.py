@@ -64,7 +64,9 @@ class ResidentActivityFormView(LoginRequiredMixin, FormView):
 
             for resident_id in resident_ids:
                 try:
-                    resident = Resident.objects.get(id=resident_id)
+                    resident = Resident.objects.select_related(
+                        "current_residency__home",
+                    ).get(id=resident_id)
                     _create_resident_activity(resident, group_activity_id, form)
                 except Resident.DoesNotExist:
                     transaction.set_rollback(True)
@@ -96,13 +98,9 @@ def _create_resident_activity(
 ):
     """Create a resident activity for the given resident and form."""
 
-    try:
-        residency = Residency.objects.get(
-            resident=resident,
-            move_out__isnull=True,
-        )
-    except Residency.DoesNotExist:
-        raise
+    residency = resident.current_residency
+    if residency is None:
+        raise Residency.DoesNotExist
 
     home = residency.home
     activity_type = form.cleaned_data["activity_type"]
@@ -0,0 +1,491 @@
+"""Builders for the fixed chart shapes used on the dashboards.
+
+plotly express converts its input to a DataFrame, infers the column types and
+groups the data generically before building any traces. These builders build
+the plotly graph_objects traces straight from the query rows instead, and
+produce the same figures as the plotly express calls they replace.
+"""
+
+import datetime
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import qualitative
+from plotly.subplots import make_subplots
+
+from core.constants import WEEK_DAYS
+
+# Spacing between facet rows, as a fraction of the chart height
+FACET_ROW_SPACING = 0.03
+# Default share of the points that each LOWESS trendline point is fitted to
+LOWESS_FRAC = 2 / 3
+# Points per LOWESS distance matrix
+LOWESS_CHUNK_SIZE = 512
+# Distance between two days on a date axis fitted as seconds
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _get_colorway(template: str | dict | None) -> list[str]:
+    """Return the colors assigned to the color groups of a chart, in order."""
+    if isinstance(template, dict):
+        return template["layout"].get("colorway") or qualitative.Plotly
+
+    template = pio.templates[template or pio.templates.default]
+
+    return list(template.layout.colorway or qualitative.Plotly)
+
+
+def _get_group_values(rows: list[Mapping], column: str | None) -> list[Any]:
+    """Return the distinct values of a column, in order of appearance."""
+    if column is None:
+        return [None]
+
+    return list(dict.fromkeys(row[column] for row in rows))
+
+
+def _get_column_values(rows: list[Mapping], column: str) -> np.ndarray:
+    """Return the values of a column as an array, which plotly copies and
+    serializes faster than a list."""
+    values = np.array([row[column] for row in rows])
+
+    if values.dtype == np.object_ and isinstance(values[0], datetime.date):
+        return values.astype("datetime64")
+
+    return values
+
+
+def _get_axis_reference(axis: str, row: int) -> str:
+    return axis if row == 1 else f"{axis}{row}"
+
+
+def _build_hovertemplate(
+    group_labels: list[tuple[str, Any]],
+    x_label: str,
+    y_label: str,
+    y_suffix: str = "",
+) -> str:
+    return (
+        "<br>".join(
+            [
+                *[f"{label}={value}" for label, value in group_labels],
+                f"{x_label}=%{{x}}",
+                f"{y_label}=%{{y}}{y_suffix}",
+            ],
+        )
+        + "<extra></extra>"
+    )
+
+
+def _build_layout(
+    x_label: str,
+    y_label: str,
+    title: str | None,
+    template: str | dict | None,
+    legend_title: str | None = None,
+) -> dict:
+    layout = {
+        "template": template or pio.templates.default,
+        "xaxis": {"anchor": "y", "domain": [0.0, 1.0], "title": {"text": x_label}},
+        "yaxis": {"anchor": "x", "domain": [0.0, 1.0], "title": {"text": y_label}},
+        "legend": {"tracegroupgap": 0},
+    }
+
+    if legend_title is not None:
+        layout["legend"]["title"] = {"text": legend_title}
+
+    if title:
+        layout["title"] = {"text": title}
+    else:
+        layout["margin"] = {"t": 60}
+
+    return layout
+
+
+def _build_facet_row_figure(
+    facet_labels: list[str],
+    x_label: str,
+    y_label: str,
+) -> go.Figure:
+    """Create a figure with one row of subplots for each facet label, the
+    first label at the top, laid out like plotly express facet rows."""
+    facet_count = len(facet_labels)
+
+    figure = make_subplots(
+        rows=facet_count,
+        cols=1,
+        specs=[[{"type": "xy"}]] * facet_count,
+        shared_xaxes="all",
+        shared_yaxes="all",
+        row_titles=list(reversed(facet_labels)),
+        horizontal_spacing=0.02,
+        vertical_spacing=FACET_ROW_SPACING,
+        row_heights=[1.0] * facet_count,
+        column_widths=[1.0],
+        start_cell="bottom-left",
+    )
+
+    # Let the template style the facet labels
+    for annotation in figure.layout.annotations:
+        annotation.update(font=None)
+
+    figure.update_xaxes(title_text=x_label, row=1)
+    figure.update_yaxes(title_text=y_label)
+
+    return figure
+
+
+def build_bar_chart(
+    rows: Iterable[Mapping],
+    x: str,
+    y: str,
+    color: str | None = None,
+    facet_row: str | None = None,
+    orientation: str = "v",
+    title: str | None = None,
+    labels: Mapping[str, str] | None = None,
+    text_auto: bool = False,
+    template: str | dict | None = None,
+) -> go.Figure:
+    """Build a stacked, horizontal or facet row bar chart from query rows.
+
+    Args:
+        rows (Iterable[Mapping]): Query rows, e.g. from QuerySet.values().
+        x (str): Column with the x values.
+        y (str): Column with the y values.
+        color (str, optional): Column with the stacked bar groups.
+        facet_row (str, optional): Column with the chart rows.
+        orientation (str): "v" for vertical bars or "h" for horizontal bars.
+        title (str, optional): Chart title.
+        labels (Mapping, optional): Display labels by column.
+        text_auto (bool): Whether to show the bar values on the bars.
+        template (str | dict, optional): The plotly template or its name,
+            e.g. from common.chart_templates.get_chart_template.
+
+    Returns:
+        go.Figure: The same figure as plotly.express.bar with these arguments.
+    """
+    rows = list(rows)
+    labels = labels or {}
+    x_label = labels.get(x, x)
+    y_label = labels.get(y, y)
+    color_label = labels.get(color, color)
+    facet_label = labels.get(facet_row, facet_row)
+
+    colorway = _get_colorway(template)
+    color_values = _get_group_values(rows, color)
+    facet_values = _get_group_values(rows, facet_row)
+
+    grouped_rows = {}
+    for row in rows:
+        group = (
+            row[color] if color else None,
+            row[facet_row] if facet_row else None,
+        )
+        grouped_rows.setdefault(group, []).append(row)
+
+    traces = []
+    for color_index, color_value in enumerate(color_values):
+        # Show each color group in the legend once
+        showlegend = bool(color)
+
+        for facet_index, facet_value in enumerate(facet_values):
+            group_rows = grouped_rows.get((color_value, facet_value))
+            if not group_rows:
+                continue
+
+            group_labels = []
+            trace_name = ""
+            if color:
+                trace_name = str(color_value)
+                group_labels.append((color_label, trace_name))
+            if facet_row:
+                group_labels.append((facet_label, str(facet_value)))
+
+            # The first facet is at the top, in the last subplot row
+            subplot_row = len(facet_values) - facet_index
+
+            trace = {
+                "type": "bar",
+                "alignmentgroup": "True",
+                "hovertemplate": _build_hovertemplate(group_labels, x_label, y_label),
+                "legendgroup": trace_name,
+                "marker": {
+                    "color": colorway[color_index % len(colorway)],
+                    "pattern": {"shape": ""},
+                },
+                "name": trace_name,
+                "offsetgroup": trace_name,
+                "orientation": orientation,
+                "showlegend": showlegend,
+                "textposition": "auto",
+                "x": _get_column_values(group_rows, x),
+                "xaxis": _get_axis_reference("x", subplot_row),
+                "y": _get_column_values(group_rows, y),
+                "yaxis": _get_axis_reference("y", subplot_row),
+            }
+            if text_auto:
+                trace["texttemplate"] = "%{x}" if orientation == "h" else "%{y}"
+
+            traces.append(trace)
+            showlegend = False
+
+    layout = _build_layout(
+        x_label,
+        y_label,
+        title,
+        template,
+        legend_title=color_label if color else None,
+    )
+    layout["barmode"] = "relative"
+
+    if not facet_row:
+        return go.Figure(data=traces, layout=layout)
+
+    figure = _build_facet_row_figure(
+        [f"{facet_label}={facet_value}" for facet_value in facet_values],
+        x_label,
+        y_label,
+    )
+    del layout["xaxis"], layout["yaxis"]
+    figure.update_layout(layout)
+    figure.add_traces(traces)
+
+    return figure
+
+
+def _fit_ols_trendline(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    x: str,
+    y: str,
+    trendline_options: Mapping,
+    x_step: float,
+) -> tuple[np.ndarray, str]:
+    """Fit an ordinary least squares line in closed form, with the same
+    results and hover text as the statsmodels OLS trendline of plotly
+    express."""
+    x_centered = x_values - x_values.mean()
+    y_centered = y_values - y_values.mean()
+    x_sum_of_squares = np.dot(x_centered, x_centered)
+
+    slope = np.dot(x_centered, y_centered) / x_sum_of_squares
+    intercept = y_values.mean() - slope * x_values.mean()
+    fitted_y_values = intercept + slope * x_values
+
+    residuals = y_values - fitted_y_values
+    y_sum_of_squares = np.dot(y_centered, y_centered)
+    r_squared = (
+        1 - np.dot(residuals, residuals) / y_sum_of_squares
+        if y_sum_of_squares
+        else np.nan
+    )
+
+    hover_header = (
+        "<b>OLS trendline</b><br>"
+        f"{y} = {slope:g} * {x} + {intercept:g}<br>"
+        f"R<sup>2</sup>={r_squared:f}<br><br>"
+    )
+
+    return fitted_y_values, hover_header
+
+
+def _fit_rolling_mean_trendline(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    x: str,
+    y: str,
+    trendline_options: Mapping,
+    x_step: float,
+) -> tuple[np.ndarray, str]:
+    """Average the y values of the trendline_options["window"] calendar days
+    up to each point, counting days without a point as 0. Points without a
+    full window have no trendline value.
+
+    Consecutive days are x_step apart on the x axis.
+    """
+    window = trendline_options.get("window", WEEK_DAYS)
+
+    # Resample the points to one value per day, so the window spans days
+    # rather than points
+    day_numbers = np.rint((x_values - x_values[0]) / x_step).astype(np.int64)
+    daily_y_values = np.zeros(day_numbers[-1] + 1)
+    np.add.at(daily_y_values, day_numbers, y_values)
+
+    cumulative_sums = np.concatenate([[0.0], np.cumsum(daily_y_values)])
+    daily_rolling_means = np.full(len(daily_y_values), np.nan)
+    daily_rolling_means[window - 1 :] = (
+        cumulative_sums[window:] - cumulative_sums[:-window]
+    ) / window
+
+    return (
+        daily_rolling_means[day_numbers],
+        f"<b>{window}-day rolling mean trendline</b><br><br>",
+    )
+
+
+def _fit_lowess_trendline(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    x: str,
+    y: str,
+    trendline_options: Mapping,
+    x_step: float,
+) -> tuple[np.ndarray, str]:
+    """Fit a line around each point to its nearest trendline_options["frac"]
+    share of points, weighted by distance with the tricube function.
+
+    This is a single LOWESS pass, without the robustifying iterations that
+    reduce the weight of outliers.
+    """
+    frac = trendline_options.get("frac", LOWESS_FRAC)
+    neighbor_count = min(max(int(frac * len(x_values) + 1e-10), 2), len(x_values))
+    fitted_y_values = np.empty(len(x_values))
+
+    # Fit the points in chunks, to bound the size of the distance matrix
+    for start in range(0, len(x_values), LOWESS_CHUNK_SIZE):
+        chunk_x_values = x_values[start : start + LOWESS_CHUNK_SIZE, np.newaxis]
+
+        # Each point's bandwidth is the distance to its furthest neighbor
+        distances = np.abs(chunk_x_values - x_values)
+        bandwidths = np.partition(distances, neighbor_count - 1, axis=1)[
+            :,
+            [neighbor_count - 1],
+        ]
+        scaled_distances = distances / np.maximum(bandwidths, np.finfo(float).tiny)
+        weights = np.clip(1 - scaled_distances**3, 0, None) ** 3
+
+        weight_sums = weights.sum(axis=1, keepdims=True)
+        x_means = (weights @ x_values)[:, np.newaxis] / weight_sums
+        y_means = (weights @ y_values)[:, np.newaxis] / weight_sums
+        x_deviations = x_values - x_means
+        x_sums_of_squares = (weights * x_deviations**2).sum(axis=1, keepdims=True)
+        xy_sums = (weights * x_deviations * (y_values - y_means)).sum(
+            axis=1,
+            keepdims=True,
+        )
+        slopes = np.divide(
+            xy_sums,
+            x_sums_of_squares,
+            out=np.zeros_like(xy_sums),
+            where=x_sums_of_squares > 0,
+        )
+
+        fitted_y_values[start : start + LOWESS_CHUNK_SIZE] = (
+            y_means + slopes * (chunk_x_values - x_means)
+        )[:, 0]
+
+    return fitted_y_values, "<b>LOWESS trendline</b><br><br>"
+
+
+# Trendline fitting functions by the trendline argument of build_scatter_chart
+TRENDLINES = {
+    "ols": _fit_ols_trendline,
+    "rolling": _fit_rolling_mean_trendline,
+    "lowess": _fit_lowess_trendline,
+}
+
+
+def build_scatter_chart(
+    rows: Iterable[Mapping],
+    x: str,
+    y: str,
+    title: str | None = None,
+    labels: Mapping[str, str] | None = None,
+    trendline: str | None = None,
+    trendline_options: Mapping | None = None,
+    trendline_color: str | None = None,
+    template: str | dict | None = None,
+) -> go.Figure:
+    """Build a scatter chart from query rows, with an optional trendline.
+
+    Args:
+        rows (Iterable[Mapping]): Query rows, ordered by the x column.
+        x (str): Column with the x values, which may be dates.
+        y (str): Column with the y values.
+        title (str, optional): Chart title.
+        labels (Mapping, optional): Display labels by column.
+        trendline (str, optional): One of TRENDLINES: "ols" for an ordinary
+            least squares line, "rolling" for a rolling mean over calendar
+            days or "lowess" for a locally weighted line.
+        trendline_options (Mapping, optional): The rolling mean "window" in
+            days or the LOWESS "frac".
+        trendline_color (str, optional): Color of the trendline.
+        template (str | dict, optional): The plotly template or its name,
+            e.g. from common.chart_templates.get_chart_template.
+
+    Returns:
+        go.Figure: The same figure as plotly.express.scatter with these
+            arguments.
+    """
+    if trendline is not None and trendline not in TRENDLINES:
+        raise ValueError(f"Unknown trendline: {trendline}")
+
+    rows = list(rows)
+    labels = labels or {}
+    x_label = labels.get(x, x)
+    y_label = labels.get(y, y)
+
+    marker = {"color": _get_colorway(template)[0], "symbol": "circle"}
+    x_values = _get_column_values(rows, x)
+    y_values = _get_column_values(rows, y)
+
+    traces = [
+        {
+            "type": "scatter",
+            "hovertemplate": _build_hovertemplate([], x_label, y_label),
+            "legendgroup": "",
+            "marker": marker,
+            "mode": "markers",
+            "name": "",
+            "orientation": "v",
+            "showlegend": False,
+            "x": x_values,
+            "xaxis": "x",
+            "y": y_values,
+            "yaxis": "y",
+        },
+    ]
+
+    if trendline and len(rows) > 1:
+        x_numbers = x_values
+        x_step = 1
+        if np.issubdtype(x_values.dtype, np.datetime64):
+            # Fit dates as seconds since the epoch
+            x_numbers = x_values.astype("datetime64[s]").astype(np.int64)
+            x_step = DAY_SECONDS
+
+        trendline_y_values, hover_header = TRENDLINES[trendline](
+            x_numbers.astype(np.float64),
+            y_values.astype(np.float64),
+            x,
+            y,
+            trendline_options or {},
+            x_step,
+        )
+
+        trendline_trace = {
+            "type": "scatter",
+            "hovertemplate": hover_header
+            + _build_hovertemplate([], x_label, y_label, " <b>(trend)</b>"),
+            "legendgroup": "",
+            "marker": marker,
+            "mode": "lines",
+            "name": "",
+            "showlegend": False,
+            "x": x_values,
+            "xaxis": "x",
+            "y": trendline_y_values,
+            "yaxis": "y",
+        }
+        if trendline_color:
+            trendline_trace["line"] = {"color": trendline_color}
+
+        traces.append(trendline_trace)
+
+    return go.Figure(
+        data=traces,
+        layout=_build_layout(x_label, y_label, title, template),
+    )
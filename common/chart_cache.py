@@ -0,0 +1,167 @@
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils import translation
+
+# Objects whose charts are cached, each with its own data version
+CHART_DATA_SCOPES = ("home", "resident")
+
+# Cache of the chart data versions and the hit and miss counts, apart from
+# the rendered charts, so evicting charts never drops a version or a count
+CHART_METADATA_CACHE = "chart_metadata"
+
+CHART_CACHE_STATS_KEYS = {
+    "hits": "chart-cache-stats:hits",
+    "misses": "chart-cache-stats:misses",
+}
+
+
+def _get_metadata_cache():
+    return caches[CHART_METADATA_CACHE]
+
+
+def _get_data_version_key(scope: str, object_id: int) -> str:
+    return f"chart-data-version:{scope}:{object_id}"
+
+
+def get_chart_data_version(scope: str, object_id: int) -> int:
+    """Return the current chart data version of a home or resident.
+
+    Versions are time based, so a version that was evicted from the cache
+    never comes back with the value of an older version.
+    """
+    return _get_metadata_cache().get_or_set(
+        _get_data_version_key(scope, object_id),
+        time.time_ns,
+        timeout=None,
+    )
+
+
+def bump_chart_data_version(scope: str, object_ids: Iterable[int | None]) -> None:
+    """Start a new chart data version for the given homes or residents, so
+    that their cached charts are no longer used."""
+    version = time.time_ns()
+
+    _get_metadata_cache().set_many(
+        {
+            _get_data_version_key(scope, object_id): version
+            for object_id in set(object_ids)
+            if object_id is not None
+        },
+        timeout=None,
+    )
+
+
+def _count_chart_cache_lookup(stat: str) -> None:
+    key = CHART_CACHE_STATS_KEYS[stat]
+    metadata_cache = _get_metadata_cache()
+
+    metadata_cache.add(key, 0, timeout=None)
+    try:
+        metadata_cache.incr(key)
+    except ValueError:
+        # The counter was evicted between add and incr
+        metadata_cache.set(key, 1, timeout=None)
+
+
+def get_cached_chart(
+    chart_name: str,
+    scope: str,
+    object_id: int,
+    chart_format: str,
+    render_chart: Callable[[], str],
+) -> str:
+    """Return a rendered chart from the cache, rendering and caching it on a
+    miss.
+
+    Args:
+        chart_name (str): Name of the chart function or registry entry.
+        scope (str): The kind of object the chart is about, one of
+            CHART_DATA_SCOPES.
+        object_id (int): ID of the home or resident.
+        chart_format (str): How the chart is rendered, e.g. "html" or "json".
+        render_chart (Callable): Renders the chart on a cache miss.
+
+    Returns:
+        str: The rendered chart.
+    """
+    if chart_format == "html" and not settings.CHARTS_SHARED_PLOTLYJS:
+        chart_format = "inline-html"
+
+    key = ":".join(
+        [
+            "chart",
+            chart_name,
+            scope,
+            str(object_id),
+            translation.get_language() or settings.LANGUAGE_CODE,
+            str(get_chart_data_version(scope, object_id)),
+            chart_format,
+        ],
+    )
+
+    chart = cache.get(key)
+    if chart is not None:
+        _count_chart_cache_lookup("hits")
+        return chart
+
+    _count_chart_cache_lookup("misses")
+    chart = render_chart()
+    cache.set(key, chart, timeout=settings.CHARTS_CACHE_TIMEOUT)
+
+    return chart
+
+
+def get_cached_chart_data(
+    data_name: str,
+    scope: str,
+    object_id: int,
+    compute_data: Callable[[], Any],
+) -> Any:
+    """Return data that several charts of a home or resident are built from,
+    from the cache, computing and caching it on a miss.
+
+    The data is cached under the chart data version, like the charts, so
+    charts that are built in separate requests share one computation.
+
+    Args:
+        data_name (str): Name of the chart data.
+        scope (str): The kind of object the data is about, one of
+            CHART_DATA_SCOPES.
+        object_id (int): ID of the home or resident.
+        compute_data (Callable): Computes the data on a cache miss.
+
+    Returns:
+        Any: The chart data.
+    """
+    key = ":".join(
+        [
+            "chart-data",
+            data_name,
+            scope,
+            str(object_id),
+            str(get_chart_data_version(scope, object_id)),
+        ],
+    )
+
+    data = cache.get(key)
+    if data is None:
+        data = compute_data()
+        cache.set(key, data, timeout=settings.CHARTS_CACHE_TIMEOUT)
+
+    return data
+
+
+def get_chart_cache_stats() -> dict[str, int]:
+    """Return the chart cache hit and miss counts."""
+    counts = _get_metadata_cache().get_many(CHART_CACHE_STATS_KEYS.values())
+
+    return {stat: counts.get(key, 0) for stat, key in CHART_CACHE_STATS_KEYS.items()}
+
+
+def reset_chart_cache_stats() -> None:
+    """Reset the chart cache hit and miss counts to zero."""
+    _get_metadata_cache().delete_many(CHART_CACHE_STATS_KEYS.values())
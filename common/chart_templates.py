@@ -0,0 +1,139 @@
+"""Registry of the prebuilt layout templates of the dashboard charts.
+
+Each chart kind registers a function that returns its translated title and
+labels, and the layout that the chart would otherwise set with
+update_layout. The plotly template of a chart kind is built once per
+language and reused, so building a chart only adds its data traces.
+
+The templates only keep the parts of the base template that apply to the
+trace types of the chart kind on 2D axes. plotly validates and serializes
+the whole template of each figure, and most of the base template styles
+trace types and subplots (maps, 3D scenes, polar axes) that the dashboards
+do not use.
+"""
+
+import functools
+from collections.abc import Callable
+from typing import NamedTuple
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from django.utils import translation
+
+# Name of the plotly template that the chart templates extend
+BASE_TEMPLATE = "plotly_dark"
+
+# Base template layout properties that apply to charts on 2D axes
+CARTESIAN_LAYOUT_KEYS = {
+    "annotationdefaults",
+    "autotypenumbers",
+    "colorway",
+    "font",
+    "hoverlabel",
+    "hovermode",
+    "paper_bgcolor",
+    "plot_bgcolor",
+    "title",
+    "xaxis",
+    "yaxis",
+}
+
+# Layout shared by all dashboard charts
+BASE_LAYOUT = {
+    # Set plot background/paper color to transparent
+    "plot_bgcolor": "rgba(0, 0, 0, 0)",
+    "paper_bgcolor": "rgba(0, 0, 0, 0)",
+    # ensure text is visible on dark background
+    "font": {"color": "#FFFFFF"},
+}
+
+# Layout of charts with the title centered above the plot
+CENTERED_TITLE_LAYOUT = {
+    "title": {"y": 0.9, "x": 0.5, "xanchor": "center", "yanchor": "top"},
+    "legend": {"title": {"text": ""}},
+}
+
+# Layout of charts with one bar per month
+MONTHLY_LAYOUT = {
+    # only display month on x-axis
+    "xaxis": {"dtick": "M1", "tickformat": "%b\n%Y"},
+}
+
+# Layout of charts with percents on the y-axis
+PERCENT_LAYOUT = {
+    "yaxis": {"tickformat": ",.0%"},
+}
+
+
+class ChartTemplate(NamedTuple):
+    title: str
+    labels: dict[str, str]
+    template: dict
+
+
+# Functions returning the options of each chart kind, by chart kind
+CHART_TEMPLATES: dict[str, Callable[[], dict]] = {}
+
+
+def register_chart_template(kind: str) -> Callable:
+    """Register a function that returns the options of a chart kind,
+    translated to the active language.
+
+    The options are the chart "title", the column "labels", and optionally
+    the "layouts" to apply on top of BASE_LAYOUT and the "trace_types" of
+    the chart, which default to bar traces.
+    """
+
+    def decorator(get_chart_options: Callable[[], dict]) -> Callable:
+        CHART_TEMPLATES[kind] = get_chart_options
+
+        # Discard the templates built with the options of a replaced kind
+        _build_chart_template.cache_clear()
+
+        return get_chart_options
+
+    return decorator
+
+
+@functools.cache
+def _build_chart_template(kind: str, language: str | None) -> ChartTemplate:
+    with translation.override(language):
+        options = CHART_TEMPLATES[kind]()
+
+    base_template = pio.templates[BASE_TEMPLATE].to_plotly_json()
+    template = go.layout.Template(
+        data={
+            trace_type: base_template["data"][trace_type]
+            for trace_type in options.get("trace_types", ["bar"])
+        },
+        layout={
+            key: value
+            for key, value in base_template["layout"].items()
+            if key in CARTESIAN_LAYOUT_KEYS
+        },
+    )
+    for layout in [BASE_LAYOUT, *options.get("layouts", [])]:
+        template.layout.update(layout)
+
+    return ChartTemplate(
+        title=options["title"],
+        labels=options["labels"],
+        # plotly validates a template faster from a dict than from an object
+        template=template.to_plotly_json(),
+    )
+
+
+def get_chart_template(kind: str) -> ChartTemplate:
+    """Return the template of a chart kind for the active language.
+
+    Args:
+        kind (str): The kind the chart template is registered as.
+
+    Returns:
+        ChartTemplate: The translated title and labels, and the plotly
+            template as a dict, which is shared and must not be modified.
+    """
+    if kind not in CHART_TEMPLATES:
+        raise ValueError(f"Unknown chart template: {kind}")
+
+    return _build_chart_template(kind, translation.get_language())
@@ -0,0 +1,150 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import plotly.graph_objects as go
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import translation
+from django.utils.html import format_html, format_html_join
+from django.utils.translation import gettext as _
+from plotly.offline import get_plotlyjs_version
+
+# Static path of the plotly.js bundle, versioned so it can be cached forever
+PLOTLY_JS_STATIC_PATH = f"vendor/plotly-{get_plotlyjs_version()}/plotly.min.js"
+
+
+def render_chart_html(chart: go.Figure, **kwargs) -> str:
+    """Render a chart as HTML.
+
+    With CHARTS_SHARED_PLOTLYJS enabled, only the chart div and figure
+    JSON are rendered and the page loads plotly.js once from static
+    files. Otherwise each chart inlines the full plotly.js library.
+    """
+    if settings.CHARTS_SHARED_PLOTLYJS:
+        return chart.to_html(include_plotlyjs=False, full_html=False, **kwargs)
+
+    return chart.to_html(**kwargs)
+
+
+def render_lazy_chart_html(chart_url: str) -> str:
+    """Render a placeholder that lazy_charts.js fills with the chart JSON
+    from chart_url once the placeholder scrolls into view."""
+    return format_html(
+        '<div class="lazy-chart" data-chart-url="{}" data-error-message="{}" '
+        'style="min-height: 450px"></div>',
+        chart_url,
+        _("The chart could not be loaded."),
+    )
+
+
+def _format_svg_number(number: float) -> str:
+    return f"{round(number, 2):g}"
+
+
+def render_percent_bar_svg(segments: list[dict]) -> str:
+    """Render a stacked percent bar as a small inline SVG, without plotly.
+
+    Args:
+        segments (list[dict]): The bar segments, in order, each with a
+            "label", a "percent" from 0 to 100 and either a Tailwind
+            "fill_class" or a "color".
+
+    Returns:
+        str: The SVG, which stretches to the width of its container.
+    """
+    titles = []
+    rects = []
+    x = 0.0
+
+    for segment in segments:
+        title = f"{segment['label']}: {segment['percent']:.0f}%"
+        titles.append(title)
+
+        # Empty segments are only listed in the accessible label
+        if segment["percent"] > 0:
+            rects.append(
+                (
+                    _format_svg_number(x),
+                    _format_svg_number(segment["percent"]),
+                    segment.get("fill_class", ""),
+                    segment.get("color", "currentColor"),
+                    title,
+                ),
+            )
+            x += segment["percent"]
+
+    return format_html(
+        '<svg class="w-full h-4 rounded-lg" viewBox="0 0 100 1" '
+        'preserveAspectRatio="none" role="img" aria-label="{}">{}</svg>',
+        ", ".join(titles),
+        format_html_join(
+            "",
+            '<rect x="{}" width="{}" height="1" class="{}" fill="{}">'
+            "<title>{}</title></rect>",
+            rects,
+        ),
+    )
+
+
+def _run_chart_task(build_chart: Callable[[], Any], language: str | None) -> Any:
+    """Run one chart task in a worker thread, with the request language and
+    its own database connection, which is closed when the task is done."""
+    try:
+        with translation.override(language):
+            return build_chart()
+    finally:
+        connections.close_all()
+
+
+def _can_prepare_charts_concurrently(chart_count: int) -> bool:
+    if settings.CHARTS_MAX_WORKERS <= 1 or chart_count <= 1:
+        return False
+
+    # SQLite serializes access to the database file, so threads only add
+    # overhead
+    if connection.vendor == "sqlite":
+        return False
+
+    # Worker threads use their own connections, which can't see writes that
+    # are not committed yet. Only the request transaction may be open.
+    request_atomic_blocks = 1 if connection.settings_dict["ATOMIC_REQUESTS"] else 0
+
+    return len(connection.atomic_blocks) <= request_atomic_blocks
+
+
+def prepare_charts(charts: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+    """Run independent chart tasks, concurrently when possible.
+
+    Up to CHARTS_MAX_WORKERS tasks run at once in a thread pool, so preparing
+    several charts takes about as long as the slowest one. Tasks run one
+    after another when CHARTS_MAX_WORKERS is 1, on SQLite, or when the
+    current transaction has writes that other connections can't see.
+
+    Args:
+        charts (dict): Chart names mapped to functions that prepare the chart.
+
+    Returns:
+        dict: Chart names mapped to the prepared charts.
+    """
+    if not _can_prepare_charts_concurrently(len(charts)):
+        return {chart_name: build_chart() for chart_name, build_chart in charts.items()}
+
+    language = translation.get_language()
+
+    with ThreadPoolExecutor(
+        max_workers=min(settings.CHARTS_MAX_WORKERS, len(charts)),
+        thread_name_prefix="charts",
+    ) as executor:
+        try:
+            futures = {
+                chart_name: executor.submit(_run_chart_task, build_chart, language)
+                for chart_name, build_chart in charts.items()
+            }
+        except RuntimeError:
+            # The interpreter is shutting down and can't start new threads
+            return {
+                chart_name: build_chart() for chart_name, build_chart in charts.items()
+            }
+
+        return {chart_name: future.result() for chart_name, future in futures.items()}
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from common.chart_cache import CHART_METADATA_CACHE
+
+LOCAL_MEMORY_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+@register(Tags.caches)
+def check_shared_chart_cache(app_configs, **kwargs):
+    """Warn when the chart cache is not shared between processes.
+
+    Each process has its own local memory cache, so a chart data version
+    bumped by one web worker leaves the charts cached by the others stale,
+    and the chart cache hit and miss counts only cover one worker.
+    """
+    return [
+        Warning(
+            f"The {alias} cache is a local memory cache, which each process "
+            "keeps on its own.",
+            hint=(
+                "Charts cached by other web workers are not invalidated when "
+                "the data changes. Use a database, Redis or Memcached cache "
+                "through CACHE_URL."
+            ),
+            id="common.W001",
+        )
+        for alias in ["default", CHART_METADATA_CACHE]
+        if settings.CACHES.get(alias, {}).get("BACKEND") == LOCAL_MEMORY_CACHE_BACKEND
+    ]
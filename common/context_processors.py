@@ -0,0 +1,16 @@
+from django.conf import settings
+
+from common.charts import PLOTLY_JS_STATIC_PATH
+
+
+def plotly_js(request):
+    """Return the static path of the shared plotly.js bundle, if charts use
+    it, and whether charts are lazy loaded."""
+    uses_shared_plotlyjs = settings.CHARTS_SHARED_PLOTLYJS or settings.CHARTS_LAZY_LOAD
+
+    return {
+        "plotly_js_static_path": (
+            PLOTLY_JS_STATIC_PATH if uses_shared_plotlyjs else None
+        ),
+        "charts_lazy_load": settings.CHARTS_LAZY_LOAD,
+    }
@@ -0,0 +1,236 @@
+"""Bulk import of records from CSV files.
+
+The rows of a CSV file are streamed and handled in batches. The references
+of each row, such as homes or caregiver roles, are resolved through lookup
+maps that are loaded once per import, so validating a batch does not query
+the database. The valid rows of a batch are inserted with one chunked
+bulk_create, or with COPY on PostgreSQL, and rejected rows are reported
+with their line number instead of stopping the import.
+"""
+
+import abc
+import csv
+import datetime
+import io
+import itertools
+import time
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple, TextIO
+
+from django.db import connection, models, transaction
+
+# Rows validated and inserted together
+CSV_IMPORT_BATCH_SIZE = 5000
+
+# Rows per INSERT statement of bulk_create
+CSV_IMPORT_INSERT_SIZE = 1000
+
+
+class CsvRowError(ValueError):
+    """A CSV row that cannot be imported."""
+
+
+class RejectedRow(NamedTuple):
+    line_number: int
+    reason: str
+
+
+class CsvImportResult(NamedTuple):
+    imported_count: int
+    rejected_rows: list[RejectedRow]
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        row_count = self.imported_count + len(self.rejected_rows)
+
+        return row_count / self.seconds if self.seconds else 0.0
+
+
+class Lookup:
+    """Map of the names of referenced objects to their IDs.
+
+    Names are matched case-insensitively. A name shared by several objects
+    is ambiguous, and rows that use it are rejected.
+    """
+
+    _AMBIGUOUS = object()
+
+    def __init__(self, label: str, names_and_ids: Iterable[tuple[str, object]]):
+        self.label = label
+        self._ids: dict[str, object] = {}
+
+        for name, object_id in names_and_ids:
+            key = self._get_key(name)
+            if self._ids.get(key, object_id) != object_id:
+                object_id = self._AMBIGUOUS
+            self._ids[key] = object_id
+
+    @staticmethod
+    def _get_key(name: str) -> str:
+        return str(name).strip().casefold()
+
+    def resolve(self, name: str) -> object:
+        """Return the ID of the object with the given name.
+
+        Raises:
+            CsvRowError: If no object, or several objects, have the name.
+        """
+        object_id = self._ids.get(self._get_key(name))
+
+        if object_id is None:
+            raise CsvRowError(f"Unknown {self.label}: {name!r}")
+
+        if object_id is self._AMBIGUOUS:
+            raise CsvRowError(f"Ambiguous {self.label}: {name!r}")
+
+        return object_id
+
+
+def parse_date(value: str) -> datetime.date:
+    """Parse an ISO 8601 date column."""
+    try:
+        return datetime.date.fromisoformat(value.strip())
+    except ValueError:
+        raise CsvRowError(f"Invalid date: {value!r}") from None
+
+
+def parse_minutes(value: str) -> int:
+    """Parse a column of a positive number of minutes."""
+    try:
+        minutes = int(value.strip())
+    except ValueError:
+        raise CsvRowError(f"Invalid minutes: {value!r}") from None
+
+    if minutes <= 0:
+        raise CsvRowError(f"Minutes must be positive: {value!r}")
+
+    return minutes
+
+
+class CsvImporter(abc.ABC):
+    """Base class of the CSV importers of a model.
+
+    Subclasses set the model and the required columns, load their lookup
+    maps in load_lookups, build an unsaved object from each row in
+    build_object, and refresh the rollups of the model, which COPY does
+    not do, in refresh_rollups.
+    """
+
+    model: type[models.Model]
+    columns: tuple[str, ...]
+
+    def load_lookups(self) -> None:
+        """Load the lookup maps of the references of the rows."""
+
+    @abc.abstractmethod
+    def build_object(self, row: dict[str, str]) -> models.Model:
+        """Return an unsaved object of a row.
+
+        Raises:
+            CsvRowError: If the row is invalid.
+        """
+
+    @abc.abstractmethod
+    def refresh_rollups(self, objs: list[models.Model]) -> None:
+        """Refresh the rollups of objects inserted with COPY."""
+
+    def run(
+        self,
+        csv_file: TextIO,
+        batch_size: int = CSV_IMPORT_BATCH_SIZE,
+    ) -> CsvImportResult:
+        """Import the rows of a CSV file.
+
+        Args:
+            csv_file (TextIO): The CSV file, with a header row.
+            batch_size (int): The number of rows validated and inserted
+                together.
+
+        Returns:
+            CsvImportResult: The number of imported rows, the rejected rows
+                and the duration of the import.
+
+        Raises:
+            ValueError: If the header lacks required columns.
+        """
+        start = time.perf_counter()
+
+        reader = csv.DictReader(csv_file)
+        missing_columns = [
+            column for column in self.columns if column not in (reader.fieldnames or [])
+        ]
+        if missing_columns:
+            raise ValueError(f"Missing columns: {', '.join(missing_columns)}")
+
+        self.load_lookups()
+
+        imported_count = 0
+        rejected_rows = []
+        for batch in itertools.batched(self._read_rows(reader), batch_size):
+            objs = []
+            for line_number, row in batch:
+                try:
+                    self._check_values(row)
+                    objs.append(self.build_object(row))
+                except CsvRowError as error:
+                    rejected_rows.append(RejectedRow(line_number, str(error)))
+
+            self.insert(objs)
+            imported_count += len(objs)
+
+        return CsvImportResult(
+            imported_count=imported_count,
+            rejected_rows=rejected_rows,
+            seconds=time.perf_counter() - start,
+        )
+
+    def _check_values(self, row: dict[str, str | None]) -> None:
+        """Check that a row has a value in each required column."""
+        empty_columns = [
+            column for column in self.columns if not (row[column] or "").strip()
+        ]
+        if empty_columns:
+            raise CsvRowError(f"Missing values: {', '.join(empty_columns)}")
+
+    def _read_rows(self, reader: csv.DictReader) -> Iterator[tuple[int, dict]]:
+        """Yield the rows with the line numbers they end on."""
+        for row in reader:
+            yield reader.line_num, row
+
+    def insert(self, objs: list[models.Model]) -> None:
+        """Insert a batch of objects, with COPY on PostgreSQL."""
+        if not objs:
+            return
+
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                self._copy(objs)
+                self.refresh_rollups(objs)
+            else:
+                self.model.objects.bulk_create(objs, batch_size=CSV_IMPORT_INSERT_SIZE)
+
+    def _copy(self, objs: list[models.Model]) -> None:
+        fields = [
+            field for field in self.model._meta.concrete_fields if not field.primary_key
+        ]
+
+        # Quote all values except None, which COPY reads as NULL
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+        for obj in objs:
+            writer.writerow(
+                [
+                    field.get_db_prep_save(getattr(obj, field.attname), connection)
+                    for field in fields
+                ],
+            )
+        buffer.seek(0)
+
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"copy {self.model._meta.db_table} ({columns}) "
+                "from stdin with (format csv)",
+                buffer,
+            )
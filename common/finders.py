@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import plotly
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.utils import matches_patterns
+from django.core.files.storage import FileSystemStorage
+
+from common.charts import PLOTLY_JS_STATIC_PATH
+
+PLOTLY_JS_FILE_NAME = "plotly.min.js"
+
+
+class PlotlyJsFinder(finders.BaseFinder):
+    """Static files finder for the plotly.js bundle shipped with the plotly
+    package, served under its versioned PLOTLY_JS_STATIC_PATH."""
+
+    def __init__(self, *args, **kwargs):
+        self.storage = FileSystemStorage(
+            location=Path(plotly.__file__).parent / "package_data",
+        )
+        # Prefix used by collectstatic when copying the bundle
+        self.storage.prefix = PLOTLY_JS_STATIC_PATH.removesuffix(
+            f"/{PLOTLY_JS_FILE_NAME}",
+        )
+        super().__init__(*args, **kwargs)
+
+    def find(self, path, all=False):
+        if self.storage.location not in finders.searched_locations:
+            finders.searched_locations.append(self.storage.location)
+
+        if path != PLOTLY_JS_STATIC_PATH:
+            return []
+
+        matched_path = self.storage.path(PLOTLY_JS_FILE_NAME)
+
+        return [matched_path] if all else matched_path
+
+    def list(self, ignore_patterns):
+        if not matches_patterns(PLOTLY_JS_FILE_NAME, ignore_patterns):
+            yield PLOTLY_JS_FILE_NAME, self.storage
@@ -0,0 +1,20 @@
+from collections.abc import Iterable
+
+from django.db import models
+
+
+def lock_rows(model: type[models.Model], ids: Iterable[int]) -> None:
+    """Lock the rows of the given IDs until the current transaction commits.
+
+    The rows are locked in ID order, so transactions that lock overlapping
+    rows do not deadlock. The lock is a no key update lock, which does not
+    conflict with the key share locks that inserting rows referencing the
+    locked rows takes. Databases without row locks, such as SQLite, skip the
+    lock and serialize writes instead.
+    """
+    list(
+        model.objects.select_for_update(no_key=True)
+        .filter(id__in=set(ids))
+        .order_by("id")
+        .values_list("id", flat=True),
+    )
@@ -0,0 +1,202 @@
+import datetime
+import statistics
+import time
+from collections.abc import Callable
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from django.core.management.base import BaseCommand
+
+from common.chart_builders import build_bar_chart, build_scatter_chart
+
+DEFAULT_SIZES = [1, 10]
+ROLE_NAMES = ["Nurse", "Practical nurse", "Volunteer", "Family"]
+WORK_TYPES = ["Cooking", "Cleaning", "Laundry", "Outdoor", "Medicine", "Shopping"]
+ACTIVITY_TYPES = ["Outdoor", "Indoor", "Social", "Creative", "Sports"]
+LABELS = {
+    "role_name": "Caregiver role",
+    "work_type": "Type of work",
+    "total_hours": "Total hours",
+    "percent": "Work percent",
+    "full_name": "Resident Name",
+    "activity_type": "Activity Type",
+    "activity_hours": "Activity hours",
+    "total_activity_minutes": "Total activity minutes",
+}
+
+
+def get_benchmark_charts(
+    size: int,
+) -> dict[str, tuple[Callable[[], go.Figure], Callable[[], go.Figure]]]:
+    """Return the plotly express and graph_objects builds of each chart
+    shape, for query rows that grow with the given size.
+
+    Each plotly express build makes the same call as the chart functions
+    did before they used common.chart_builders.
+    """
+    start_date = datetime.date(2024, 1, 1)
+    dates = [start_date + datetime.timedelta(days=day) for day in range(30 * size)]
+
+    stacked_rows = [
+        {"role_name": role_name, "work_type": work_type, "total_hours": 1.5}
+        for role_name in ROLE_NAMES
+        for work_type in WORK_TYPES
+    ]
+    horizontal_rows = [
+        {
+            "full_name": f"Resident {index}",
+            "activity_type": activity_type,
+            "activity_hours": index % 7,
+        }
+        for index in range(10 * size)
+        for activity_type in ACTIVITY_TYPES
+    ]
+    facet_rows = [
+        {
+            "date": date,
+            "role_name": role_name,
+            "work_type": work_type,
+            "percent": 0.25,
+        }
+        for date in dates
+        for role_name in ROLE_NAMES[:3]
+        for work_type in WORK_TYPES[:4]
+    ]
+    scatter_rows = [
+        {"activity_date": date, "total_activity_minutes": (index * 7) % 90}
+        for index, date in enumerate(dates)
+    ]
+
+    def scatter_with_express() -> go.Figure:
+        scatter_data = pd.DataFrame(scatter_rows)
+        scatter_data["activity_date"] = pd.to_datetime(scatter_data["activity_date"])
+
+        return px.scatter(
+            scatter_data,
+            x="activity_date",
+            y="total_activity_minutes",
+            title="Daily activity minutes",
+            labels=LABELS,
+            trendline="ols",
+            trendline_color_override="burlywood",
+        )
+
+    bar_arguments = {
+        "stacked bar": (
+            stacked_rows,
+            {
+                "x": "role_name",
+                "y": "total_hours",
+                "color": "work_type",
+                "title": "Work hours by caregiver role and work type",
+                "labels": LABELS,
+                "text_auto": True,
+                "template": "plotly_dark",
+            },
+        ),
+        "horizontal bar": (
+            horizontal_rows,
+            {
+                "x": "activity_hours",
+                "y": "full_name",
+                "color": "activity_type",
+                "orientation": "h",
+                "title": "Resident activity count by type",
+                "labels": LABELS,
+                "template": "plotly_dark",
+            },
+        ),
+        "faceted bar": (
+            facet_rows,
+            {
+                "x": "date",
+                "y": "percent",
+                "facet_row": "role_name",
+                "color": "work_type",
+                "title": "Daily work percent by caregiver role and work type",
+                "labels": LABELS,
+                "text_auto": True,
+                "template": "plotly_dark",
+            },
+        ),
+    }
+
+    charts = {
+        name: (
+            lambda rows=rows, arguments=arguments: px.bar(rows, **arguments),
+            lambda rows=rows, arguments=arguments: build_bar_chart(rows, **arguments),
+        )
+        for name, (rows, arguments) in bar_arguments.items()
+    }
+    charts["scatter with trendline"] = (
+        scatter_with_express,
+        lambda: build_scatter_chart(
+            scatter_rows,
+            x="activity_date",
+            y="total_activity_minutes",
+            title="Daily activity minutes",
+            labels=LABELS,
+            trendline="ols",
+            trendline_color="burlywood",
+        ),
+    )
+
+    return charts
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks building the dashboard chart shapes with plotly express "
+        "and with the graph_objects builders in common.chart_builders."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=DEFAULT_SIZES,
+            help="Data sizes to benchmark, 1 is about a month of data",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed runs per implementation",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            self.stdout.write("Invalid repeat. Please try again.")
+            return
+
+        self.stdout.write(
+            f"{'size':>5} {'chart':>24} {'express ms':>11} "
+            f"{'graph_objects ms':>17} {'speedup':>8}",
+        )
+
+        for size in options["sizes"]:
+            charts = get_benchmark_charts(size)
+
+            for name, (build_with_express, build_with_graph_objects) in charts.items():
+                express_ms = self._time(build_with_express, options["repeat"])
+                graph_objects_ms = self._time(
+                    build_with_graph_objects,
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{size:>5} {name:>24} {express_ms:>11.1f} "
+                    f"{graph_objects_ms:>17.1f} {express_ms / graph_objects_ms:>7.1f}x",
+                )
+
+    def _time(self, build_chart, repeat: int) -> float:
+        """Return the median time in milliseconds to build a chart and
+        serialize it to JSON."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build_chart().to_json()
+            timings.append(time.perf_counter() - start)
+
+        return statistics.median(timings) * 1000
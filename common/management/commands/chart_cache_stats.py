@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from common.chart_cache import get_chart_cache_stats, reset_chart_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Shows the chart cache hit and miss counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counts after showing them",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_chart_cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_ratio = stats["hits"] / lookups if lookups else 0
+
+        self.stdout.write(f"Chart cache hits: {stats['hits']}")
+        self.stdout.write(f"Chart cache misses: {stats['misses']}")
+        self.stdout.write(f"Chart cache hit ratio: {hit_ratio:.1%}")
+
+        if options["reset"]:
+            reset_chart_cache_stats()
+            self.stdout.write("Chart cache counts reset.")
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.csv_import import CSV_IMPORT_BATCH_SIZE
+from metrics.csv_import import ResidentActivityCsvImporter
+from work.csv_import import WorkCsvImporter
+
+# CSV importers, by the kind of records they import
+CSV_IMPORTERS = {
+    "work": WorkCsvImporter,
+    "resident_activity": ResidentActivityCsvImporter,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports work or resident activities from a CSV file with a header "
+        "row. Rows that cannot be imported are reported with their line "
+        "number and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=CSV_IMPORTERS)
+        parser.add_argument("csv_path", help="Path of the CSV file")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=CSV_IMPORT_BATCH_SIZE,
+            help="Number of rows validated and inserted together",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("The batch size must be at least 1.")
+
+        importer = CSV_IMPORTERS[options["kind"]]()
+
+        with open(options["csv_path"], newline="", encoding="utf-8-sig") as csv_file:
+            try:
+                result = importer.run(csv_file, batch_size=options["batch_size"])
+            except ValueError as error:
+                raise CommandError(error) from error
+
+        for rejected_row in result.rejected_rows:
+            self.stderr.write(
+                f"Rejected line {rejected_row.line_number}: {rejected_row.reason}",
+            )
+
+        self.stdout.write(
+            f"Imported {result.imported_count} rows and rejected "
+            f"{len(result.rejected_rows)} rows in {result.seconds:.1f} seconds "
+            f"({result.rows_per_second:.0f} rows/second).",
+        )
@@ -0,0 +1,53 @@
+// Render the charts of the page from their JSON endpoints, once each chart
+// placeholder scrolls into view.
+(function () {
+  async function renderChart(element) {
+    try {
+      const response = await fetch(element.dataset.chartUrl, {
+        headers: { Accept: "application/json" },
+      });
+
+      if (!response.ok) {
+        throw new Error(`Chart request failed with ${response.status}`);
+      }
+
+      const figure = await response.json();
+
+      element.style.minHeight = "";
+      Plotly.newPlot(element, figure.data, figure.layout, { responsive: true });
+    } catch (error) {
+      element.classList.add("text-error");
+      element.textContent = element.dataset.errorMessage || error.message;
+    }
+  }
+
+  function observeCharts() {
+    const elements = document.querySelectorAll(".lazy-chart[data-chart-url]");
+
+    if (!("IntersectionObserver" in window)) {
+      elements.forEach(renderChart);
+      return;
+    }
+
+    const observer = new IntersectionObserver(
+      (entries) => {
+        entries.forEach((entry) => {
+          if (entry.isIntersecting) {
+            observer.unobserve(entry.target);
+            renderChart(entry.target);
+          }
+        });
+      },
+      // Start loading shortly before the chart becomes visible
+      { rootMargin: "200px" },
+    );
+
+    elements.forEach((element) => observer.observe(element));
+  }
+
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", observeCharts);
+  } else {
+    observeCharts();
+  }
+})();
@@ -0,0 +1,709 @@
+import copy
+import datetime
+import json
+import re
+import sys
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import plotly.graph_objects as go
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles import finders
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import translation
+from django.utils.translation import gettext as _
+
+from caregivers.factories import CaregiverRoleFactory
+from common.chart_builders import TRENDLINES, build_bar_chart, build_scatter_chart
+from common.chart_cache import (
+    CHART_METADATA_CACHE,
+    get_cached_chart,
+    get_chart_cache_stats,
+    get_chart_data_version,
+)
+from common.chart_templates import (
+    CHART_TEMPLATES,
+    get_chart_template,
+    register_chart_template,
+)
+from common.charts import (
+    PLOTLY_JS_STATIC_PATH,
+    prepare_charts,
+    render_chart_html,
+    render_percent_bar_svg,
+)
+from common.checks import LOCAL_MEMORY_CACHE_BACKEND, check_shared_chart_cache
+from common.csv_import import CsvImporter
+from common.finders import PlotlyJsFinder
+from common.management.commands.benchmark_chart_builders import (
+    get_benchmark_charts,
+)
+from homes.factories import HomeFactory, HomeUserRelationFactory
+from homes.models import Home
+from metrics.factories import ResidentActivityFactory
+from metrics.models import ResidentActivity, ResidentDailyActivity
+from residents.factories import ResidencyFactory, ResidentFactory
+from work.factories import WorkFactory, WorkTypeFactory
+from work.models import Work, WorkDailyTotal
+
+User = get_user_model()
+
+
+class RenderChartHtmlTest(TestCase):
+    def setUp(self):
+        self.chart = go.Figure(go.Bar(x=["a", "b"], y=[1, 2]))
+
+    def test_shared_plotlyjs_renders_chart_only(self):
+        chart_html = render_chart_html(self.chart)
+
+        self.assertTrue(chart_html.startswith("<div>"))
+        self.assertIn("Plotly.newPlot", chart_html)
+        self.assertLess(len(chart_html), 100_000)
+
+    @override_settings(CHARTS_SHARED_PLOTLYJS=False)
+    def test_inline_plotlyjs(self):
+        chart_html = render_chart_html(self.chart)
+
+        self.assertIn("<html>", chart_html)
+        self.assertGreater(len(chart_html), 1_000_000)
+
+
+class ChartBuildersTest(SimpleTestCase):
+    def get_chart_json(self, chart: go.Figure) -> dict:
+        """Return the chart JSON, with midnight datetimes as dates, since
+        plotly express turns dates into datetimes."""
+        return json.loads(
+            re.sub(r'"(\d{4}-\d{2}-\d{2})T00:00:00"', r'"\1"', chart.to_json()),
+        )
+
+    def test_charts_match_plotly_express(self):
+        for name, (
+            build_with_express,
+            build_with_graph_objects,
+        ) in get_benchmark_charts(1).items():
+            with self.subTest(chart=name):
+                chart_json = self.get_chart_json(build_with_graph_objects())
+                express_chart_json = self.get_chart_json(build_with_express())
+
+                # The numpy and statsmodels trendline fits differ by rounding
+                for trace, express_trace in zip(
+                    chart_json["data"],
+                    express_chart_json["data"],
+                ):
+                    if trace.get("mode") == "lines":
+                        np.testing.assert_allclose(
+                            trace.pop("y"),
+                            express_trace.pop("y"),
+                        )
+
+                self.assertEqual(chart_json, express_chart_json)
+
+    def test_facet_rows_and_legend(self):
+        chart = get_benchmark_charts(1)["faceted bar"][1]()
+
+        # The first facet row is at the top
+        self.assertEqual(
+            [annotation.text for annotation in chart.layout.annotations],
+            [
+                "Caregiver role=Volunteer",
+                "Caregiver role=Practical nurse",
+                "Caregiver role=Nurse",
+            ],
+        )
+        self.assertEqual(chart.data[0].yaxis, "y3")
+        self.assertEqual(
+            [trace.name for trace in chart.data if trace.showlegend],
+            ["Cooking", "Cleaning", "Laundry", "Outdoor"],
+        )
+
+    def test_trendlines(self):
+        rows = [
+            {"day": datetime.date(2024, 1, day), "minutes": 10 + 2 * day}
+            for day in range(1, 11)
+        ]
+
+        for trendline, expected_y_values in [
+            ("ols", [10 + 2 * day for day in range(1, 11)]),
+            ("lowess", [10 + 2 * day for day in range(1, 11)]),
+            ("rolling", [np.nan, np.nan, 14, 16, 18, 20, 22, 24, 26, 28]),
+        ]:
+            with self.subTest(trendline=trendline):
+                chart = build_scatter_chart(
+                    rows,
+                    x="day",
+                    y="minutes",
+                    trendline=trendline,
+                    trendline_options={"window": 3},
+                )
+
+                self.assertEqual(len(chart.data), 2)
+                np.testing.assert_allclose(chart.data[1].y, expected_y_values)
+
+    def test_rolling_mean_trendline_spans_calendar_days(self):
+        rows = [
+            {"day": datetime.date(2024, 1, day), "minutes": 30}
+            for day in [1, 2, 3, 5, 6, 10]
+        ]
+
+        chart = build_scatter_chart(
+            rows,
+            x="day",
+            y="minutes",
+            trendline="rolling",
+            trendline_options={"window": 3},
+        )
+
+        # Days without a point count as 0 minutes
+        np.testing.assert_allclose(chart.data[1].y, [np.nan, np.nan, 30, 20, 20, 10])
+        self.assertIn("3-day rolling mean", chart.data[1].hovertemplate)
+
+    def test_trendlines_do_not_import_statsmodels(self):
+        rows = [
+            {"day": datetime.date(2024, 1, day), "minutes": day % 4}
+            for day in range(1, 31)
+        ]
+
+        with mock.patch.dict(sys.modules, {"statsmodels": None}):
+            for trendline in TRENDLINES:
+                build_scatter_chart(rows, x="day", y="minutes", trendline=trendline)
+
+    def test_unknown_trendline(self):
+        with self.assertRaises(ValueError):
+            build_scatter_chart([], x="day", y="minutes", trendline="spline")
+
+    def test_benchmark_command(self):
+        output = StringIO()
+
+        call_command(
+            "benchmark_chart_builders",
+            sizes=[1],
+            repeat=1,
+            stdout=output,
+        )
+
+        self.assertIn("scatter with trendline", output.getvalue())
+
+
+class ChartTemplatesTest(SimpleTestCase):
+    def setUp(self):
+        self.get_options = mock.Mock(
+            side_effect=lambda: {
+                "title": _("Work hours by type"),
+                "labels": {"total_hours": _("Total hours")},
+                "layouts": [{"yaxis": {"tickformat": ",.0%"}}],
+            },
+        )
+        register_chart_template("test_chart")(self.get_options)
+        self.addCleanup(CHART_TEMPLATES.pop, "test_chart")
+
+    def test_template_is_built_once_per_language(self):
+        with translation.override("fi"):
+            finnish_template = get_chart_template("test_chart")
+            self.assertIs(get_chart_template("test_chart"), finnish_template)
+
+        with translation.override("en"):
+            english_template = get_chart_template("test_chart")
+
+        self.assertEqual(self.get_options.call_count, 2)
+        self.assertEqual(finnish_template.title, "Työajat tyypeittäin")
+        self.assertEqual(english_template.title, "Work hours by type")
+
+    def test_template_only_styles_chart_traces_and_axes(self):
+        template = get_chart_template("test_chart").template
+
+        self.assertEqual(list(template["data"]), ["bar"])
+        self.assertNotIn("geo", template["layout"])
+        self.assertEqual(template["layout"]["paper_bgcolor"], "rgba(0, 0, 0, 0)")
+        self.assertEqual(template["layout"]["yaxis"]["tickformat"], ",.0%")
+        # The base template styles are kept
+        self.assertEqual(template["layout"]["yaxis"]["gridcolor"], "#283442")
+
+    def test_charts_do_not_modify_template(self):
+        chart_template = get_chart_template("test_chart")
+        template = copy.deepcopy(chart_template.template)
+
+        chart = build_bar_chart(
+            [{"type": "Cooking", "total_hours": 1}],
+            x="type",
+            y="total_hours",
+            **chart_template._asdict(),
+        )
+        chart.update_layout(template_layout_font_color="red")
+
+        self.assertEqual(chart_template.template, template)
+        self.assertEqual(chart.layout.yaxis.title.text, "Total hours")
+
+    def test_unknown_chart_template(self):
+        with self.assertRaises(ValueError):
+            get_chart_template("unknown_chart")
+
+
+class PrepareChartsTest(SimpleTestCase):
+    def get_chart_thread_and_language(self):
+        return threading.current_thread().name, translation.get_language()
+
+    def prepare_charts(self):
+        with translation.override("fi"):
+            return prepare_charts(
+                {
+                    chart_name: self.get_chart_thread_and_language
+                    for chart_name in ["first", "second", "third"]
+                },
+            )
+
+    @mock.patch.object(connection, "vendor", "postgresql")
+    @override_settings(CHARTS_MAX_WORKERS=2)
+    def test_prepares_charts_in_worker_threads(self):
+        charts = self.prepare_charts()
+
+        self.assertEqual(list(charts), ["first", "second", "third"])
+        for thread_name, language in charts.values():
+            self.assertTrue(thread_name.startswith("charts"))
+            self.assertEqual(language, "fi")
+
+    @mock.patch.object(connection, "vendor", "postgresql")
+    @override_settings(CHARTS_MAX_WORKERS=1)
+    def test_single_worker_prepares_charts_serially(self):
+        charts = self.prepare_charts()
+
+        for thread_name, language in charts.values():
+            self.assertEqual(thread_name, threading.current_thread().name)
+            self.assertEqual(language, "fi")
+
+    @override_settings(CHARTS_MAX_WORKERS=2)
+    def test_sqlite_prepares_charts_serially(self):
+        charts = self.prepare_charts()
+
+        for thread_name, _language in charts.values():
+            self.assertEqual(thread_name, threading.current_thread().name)
+
+    @mock.patch.object(connection, "vendor", "postgresql")
+    @override_settings(CHARTS_MAX_WORKERS=2)
+    def test_worker_errors_are_raised(self):
+        def build_failing_chart():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            prepare_charts(
+                {"first": build_failing_chart, "second": build_failing_chart}
+            )
+
+
+class RenderPercentBarSvgTest(SimpleTestCase):
+    def test_renders_stacked_segments(self):
+        svg = render_percent_bar_svg(
+            [
+                {"label": "Inactive", "percent": 12.5, "fill_class": "fill-error"},
+                {"label": "Low", "percent": 0, "fill_class": "fill-warning"},
+                {"label": "<Nurse>", "percent": 87.5, "color": "#636efa"},
+            ],
+        )
+
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertIn('aria-label="Inactive: 12%, Low: 0%, &lt;Nurse&gt;: 88%"', svg)
+        self.assertIn('<rect x="0" width="12.5" height="1" class="fill-error"', svg)
+        self.assertIn(
+            '<rect x="12.5" width="87.5" height="1" class="" fill="#636efa"', svg
+        )
+        # Empty segments are not drawn
+        self.assertEqual(svg.count("<rect"), 2)
+        self.assertNotIn("plotly", svg.lower())
+        self.assertLess(len(svg), 500)
+
+
+class PlotlyJsFinderTest(TestCase):
+    def test_finds_versioned_bundle(self):
+        matched_path = finders.find(PLOTLY_JS_STATIC_PATH)
+
+        self.assertTrue(matched_path.endswith("plotly.min.js"))
+        self.assertEqual(PlotlyJsFinder().find("vendor/other.js"), [])
+
+    def test_lists_bundle_under_versioned_prefix(self):
+        files = [
+            f"{storage.prefix}/{path}" for path, storage in PlotlyJsFinder().list([])
+        ]
+
+        self.assertEqual(files, [PLOTLY_JS_STATIC_PATH])
+
+    def test_bundle_is_immutable(self):
+        self.assertRegex(
+            f"/{settings.STATIC_URL}{PLOTLY_JS_STATIC_PATH}",
+            re.compile(settings.WHITENOISE_IMMUTABLE_FILE_TEST),
+        )
+
+
+class PlotlyJsScriptTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="test")
+        self.client.force_login(self.user)
+
+    def test_base_template_loads_bundle(self):
+        response = self.client.get(reverse("home-list-view"))
+
+        self.assertContains(response, PLOTLY_JS_STATIC_PATH, count=1)
+
+    @override_settings(CHARTS_SHARED_PLOTLYJS=False, CHARTS_LAZY_LOAD=False)
+    def test_no_bundle_with_inline_plotlyjs(self):
+        response = self.client.get(reverse("home-list-view"))
+
+        self.assertNotContains(response, PLOTLY_JS_STATIC_PATH)
+
+
+class ChartCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches[CHART_METADATA_CACHE].clear()
+
+        self.home = HomeFactory()
+        self.resident = ResidentFactory()
+        self.rendered_charts = []
+
+    def get_chart(self, scope="home", object_id=None):
+        def render_chart():
+            self.rendered_charts.append(object_id)
+            return f"chart {len(self.rendered_charts)}"
+
+        return get_cached_chart(
+            "test_chart",
+            scope,
+            object_id or self.home.id,
+            "html",
+            render_chart,
+        )
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.get_chart(), "chart 1")
+        self.assertEqual(self.get_chart(), "chart 1")
+
+        self.assertEqual(len(self.rendered_charts), 1)
+        self.assertEqual(get_chart_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_language_is_part_of_the_key(self):
+        self.get_chart()
+
+        with translation.override("fi"):
+            self.assertEqual(self.get_chart(), "chart 2")
+
+    def test_writes_bump_the_data_version(self):
+        residency = ResidencyFactory(resident=self.resident, home=self.home)
+        home_user_relation = HomeUserRelationFactory(
+            home=self.home,
+            user=User.objects.create_user(username="caregiver", password="test"),
+        )
+
+        for write in [
+            lambda: WorkFactory(home=self.home),
+            lambda: ResidentActivityFactory(
+                resident=self.resident,
+                residency=residency,
+                home=self.home,
+            ),
+            lambda: ResidencyFactory(home=self.home),
+            home_user_relation.delete,
+        ]:
+            with self.subTest(write=write):
+                version = get_chart_data_version("home", self.home.id)
+                self.get_chart()
+
+                write()
+
+                self.assertNotEqual(
+                    get_chart_data_version("home", self.home.id),
+                    version,
+                )
+                rendered_count = len(self.rendered_charts)
+                self.get_chart()
+                self.assertEqual(len(self.rendered_charts), rendered_count + 1)
+
+    def test_activity_bumps_the_resident_data_version(self):
+        residency = ResidencyFactory(resident=self.resident, home=self.home)
+        version = get_chart_data_version("resident", self.resident.id)
+
+        ResidentActivityFactory(
+            resident=self.resident,
+            residency=residency,
+            home=self.home,
+        )
+
+        self.assertNotEqual(
+            get_chart_data_version("resident", self.resident.id),
+            version,
+        )
+
+    def test_other_homes_stay_cached(self):
+        other_home = HomeFactory()
+        self.get_chart(object_id=other_home.id)
+
+        WorkFactory(home=self.home)
+        self.get_chart(object_id=other_home.id)
+
+        self.assertEqual(len(self.rendered_charts), 1)
+
+    def test_stats_command(self):
+        self.get_chart()
+        self.get_chart()
+        out = StringIO()
+
+        call_command("chart_cache_stats", reset=True, stdout=out)
+
+        self.assertIn("Chart cache hits: 1", out.getvalue())
+        self.assertIn("Chart cache misses: 1", out.getvalue())
+        self.assertIn("Chart cache hit ratio: 50.0%", out.getvalue())
+        self.assertEqual(get_chart_cache_stats(), {"hits": 0, "misses": 0})
+
+    @override_settings(
+        CACHES={
+            **settings.CACHES,
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": settings.CACHES["default"]["LOCATION"],
+                "OPTIONS": {"MAX_ENTRIES": 10},
+            },
+        },
+    )
+    def test_culling_charts_keeps_versions_and_stats(self):
+        version = get_chart_data_version("home", self.home.id)
+
+        # Fill the chart cache past its size, so it culls charts
+        for object_id in range(self.home.id, self.home.id + 20):
+            for chart_format in ["html", "json"]:
+                get_cached_chart(
+                    "test_chart",
+                    "home",
+                    object_id,
+                    chart_format,
+                    lambda: "chart",
+                )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "select count(*) from "
+                + connection.ops.quote_name(settings.CACHES["default"]["LOCATION"]),
+            )
+            self.assertLessEqual(cursor.fetchone()[0], 10)
+        self.assertEqual(get_chart_data_version("home", self.home.id), version)
+        self.assertEqual(get_chart_cache_stats(), {"hits": 0, "misses": 40})
+
+    def test_default_cache_is_shared_between_processes(self):
+        self.assertEqual(check_shared_chart_cache(None), [])
+
+    @override_settings(
+        CACHES={
+            **settings.CACHES,
+            "default": {"BACKEND": LOCAL_MEMORY_CACHE_BACKEND},
+        },
+    )
+    def test_check_warns_about_local_memory_cache(self):
+        warnings = check_shared_chart_cache(None)
+
+        self.assertEqual([warning.id for warning in warnings], ["common.W001"])
+
+
+class ImportCsvCommandTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory(name="Sunny home")
+        # HomeFactory gets existing homes by name
+        Home.objects.create(name="Twin home")
+        Home.objects.create(name="Twin home")
+        CaregiverRoleFactory(name="Nurse")
+        WorkTypeFactory(name="Cooking")
+        self.resident = ResidentFactory(first_name="Anna", last_initial="K")
+        ResidencyFactory(
+            resident=self.resident,
+            home=self.home,
+            move_in=datetime.date(2024, 1, 1),
+        )
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.csv_path = Path(temp_dir.name) / "import.csv"
+
+    def _import(self, kind: str, csv_text: str) -> tuple[str, str]:
+        self.csv_path.write_text(csv_text, encoding="utf-8")
+        out = StringIO()
+        err = StringIO()
+
+        call_command(
+            "import_csv",
+            kind,
+            str(self.csv_path),
+            batch_size=2,
+            stdout=out,
+            stderr=err,
+        )
+
+        return out.getvalue(), err.getvalue()
+
+    def test_import_work(self):
+        out, err = self._import(
+            "work",
+            "home,date,type,caregiver_role,duration_minutes\n"
+            "Sunny home,2024-01-01,Cooking,Nurse,30\n"
+            f"{self.home.url_uuid},2024-01-01,cooking,nurse,45\n"
+            "Nowhere,2024-01-01,Cooking,Nurse,30\n"
+            "Twin home,2024-01-01,Cooking,Nurse,30\n"
+            "Sunny home,2024-13-01,Cooking,Nurse,30\n"
+            "Sunny home,2024-01-02,Cooking,Nurse,0\n"
+            "Sunny home,2024-01-02,,Nurse,30\n",
+        )
+
+        self.assertIn("Imported 2 rows and rejected 5 rows", out)
+        self.assertIn("rows/second", out)
+        self.assertEqual(
+            err.splitlines(),
+            [
+                "Rejected line 4: Unknown home: 'Nowhere'",
+                "Rejected line 5: Ambiguous home: 'Twin home'",
+                "Rejected line 6: Invalid date: '2024-13-01'",
+                "Rejected line 7: Minutes must be positive: '0'",
+                "Rejected line 8: Missing values: type",
+            ],
+        )
+        # The daily work totals are refreshed for the imported work
+        self.assertEqual(
+            list(
+                WorkDailyTotal.objects.values_list("home", "date", "duration_minutes"),
+            ),
+            [(self.home.id, datetime.date(2024, 1, 1), 75)],
+        )
+
+    def test_import_resident_activities(self):
+        out, err = self._import(
+            "resident_activity",
+            "resident,activity_date,activity_type,caregiver_role,activity_minutes\n"
+            "Anna K,2024-02-01,outdoor,nurse,30\n"
+            f"{self.resident.url_uuid},2024-02-01,Music,Volunteer,60\n"
+            "Anna K,2023-12-31,outdoor,nurse,30\n"
+            "Anna K,2024-02-01,juggling,nurse,30\n",
+        )
+
+        self.assertIn("Imported 2 rows and rejected 2 rows", out)
+        self.assertEqual(
+            err.splitlines(),
+            [
+                "Rejected line 4: No residency of the resident on 2023-12-31",
+                "Rejected line 5: Unknown activity type: 'juggling'",
+            ],
+        )
+        self.assertEqual(
+            list(
+                ResidentActivity.objects.order_by("activity_type").values_list(
+                    "home",
+                    "activity_type",
+                    "caregiver_role",
+                    "activity_minutes",
+                ),
+            ),
+            [
+                (self.home.id, "music", "volunteer", 60),
+                (self.home.id, "outdoor", "nurse", 30),
+            ],
+        )
+        self.assertEqual(
+            ResidentDailyActivity.objects.filter(resident=self.resident).count(),
+            2,
+        )
+
+    def test_copy_on_postgresql(self):
+        if connection.vendor != "postgresql":
+            self.skipTest(f"No COPY on {connection.vendor}")
+
+        with mock.patch.object(
+            CsvImporter,
+            "_copy",
+            autospec=True,
+            side_effect=CsvImporter._copy,
+        ) as copy:
+            self._import(
+                "work",
+                "home,date,type,caregiver_role,duration_minutes\n"
+                "Sunny home,2024-01-01,Cooking,Nurse,30\n"
+                "Sunny home,2024-01-01,Cooking,Nurse,45\n"
+                "Sunny home,2024-01-02,Cooking,Nurse,15\n",
+            )
+            self._import(
+                "resident_activity",
+                "resident,activity_date,activity_type,caregiver_role,"
+                "activity_minutes\n"
+                "Anna K,2024-02-01,outdoor,nurse,30\n"
+                "Anna K,2024-02-01,outdoor,nurse,20\n"
+                "Anna K,2024-02-02,music,volunteer,60\n",
+            )
+
+        # Each batch of two rows is copied once
+        self.assertEqual(copy.call_count, 4)
+        self.assertEqual(Work.objects.count(), 3)
+        self.assertEqual(
+            list(
+                WorkDailyTotal.objects.order_by("date").values_list(
+                    "home",
+                    "date",
+                    "duration_minutes",
+                ),
+            ),
+            [
+                (self.home.id, datetime.date(2024, 1, 1), 75),
+                (self.home.id, datetime.date(2024, 1, 2), 15),
+            ],
+        )
+        self.assertEqual(ResidentActivity.objects.count(), 3)
+        self.assertEqual(
+            list(
+                ResidentDailyActivity.objects.order_by("activity_date").values_list(
+                    "resident",
+                    "home",
+                    "activity_date",
+                    "activity_type",
+                    "activity_count",
+                    "activity_minutes",
+                ),
+            ),
+            [
+                (
+                    self.resident.id,
+                    self.home.id,
+                    datetime.date(2024, 2, 1),
+                    "outdoor",
+                    2,
+                    50,
+                ),
+                (
+                    self.resident.id,
+                    self.home.id,
+                    datetime.date(2024, 2, 2),
+                    "music",
+                    1,
+                    60,
+                ),
+            ],
+        )
+
+    def test_importers_implement_build_object_and_refresh_rollups(self):
+        class IncompleteImporter(CsvImporter):
+            model = Work
+            columns = ("home",)
+
+            def build_object(self, row):
+                return Work()
+
+        with self.assertRaises(TypeError):
+            IncompleteImporter()
+
+    def test_missing_columns(self):
+        with self.assertRaisesMessage(
+            CommandError,
+            "Missing columns: caregiver_role, duration_minutes",
+        ):
+            self._import("work", "home,date,type\nSunny home,2024-01-01,Cooking\n")
+
+        self.assertFalse(Work.objects.exists())
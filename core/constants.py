@@ -41,9 +41,33 @@ WEEKLY_ACTIVITY_RANGES = {
     },
 }
 
+# Keys of the resident counts for each WEEKLY_ACTIVITY_RANGES activity level
+ACTIVITY_LEVEL_COUNT_KEYS = {
+    "inactive": "inactive_count",
+    "low": "low_active_count",
+    "good": "good_active_count",
+    "high": "high_active_count",
+}
+
+# Keys of the resident percents for each WEEKLY_ACTIVITY_RANGES activity level
+ACTIVITY_LEVEL_PERCENT_KEYS = {
+    "inactive": "inactive_percent",
+    "low": "low_active_percent",
+    "good": "good_active_percent",
+    "high": "high_active_percent",
+}
+
 
 HOUR_MINUTES = 60
 YEAR_DAYS = 365
 MONTH_DAYS = 30
 WEEK_DAYS = 7
 DAY_MILLISECONDS = 86400000
+
+# Windows, in days, offered for the resident activity grid of a home
+RESIDENT_ACTIVITY_GRID_DAYS = [WEEK_DAYS, 14, MONTH_DAYS, 90]
+RESIDENT_ACTIVITY_GRID_PAGE_SIZE = 25
+
+# Time buckets to aim for on work charts over time, which group the work by
+# week or month when there are more days than this
+WORK_CHART_MAX_TIME_BUCKETS = 120
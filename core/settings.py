@@ -10,6 +10,7 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 import environ
@@ -107,6 +108,7 @@ TEMPLATES = [
                 "django.template.context_processors.i18n",
                 "django.contrib.messages.context_processors.messages",
                 "work.context_processors.get_work_form",
+                "common.context_processors.plotly_js",
             ],
         },
     },
@@ -128,6 +130,33 @@ else:
         "NAME": BASE_DIR / "db.sqlite3",
     }
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/ref/settings/#caches
+# The gunicorn workers share the cache, so a chart data version bumped by
+# one worker invalidates the charts cached by the others, and the chart
+# cache hit and miss counts cover all workers. The default database cache
+# needs the tables made by createcachetable, CACHE_URL can point to Redis or
+# Memcached instead.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="dbcache://django_cache"),
+}
+# The chart data versions and the chart cache hit and miss counts, which
+# must outlive the rendered charts they describe
+CACHES["chart_metadata"] = {**CACHES["default"]}
+
+if CACHES["default"]["BACKEND"] == "django.core.cache.backends.db.DatabaseCache":
+    # A full database cache deletes its lowest keys first. Keep room for the
+    # charts of about 150 homes and their residents, in every language and
+    # format, and keep the metadata in its own table, which is never culled.
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=50_000),
+    }
+    CACHES["chart_metadata"] = {
+        "BACKEND": CACHES["default"]["BACKEND"],
+        "LOCATION": f"{CACHES['default']['LOCATION']}_chart_metadata",
+        "OPTIONS": {"MAX_ENTRIES": sys.maxsize},
+    }
+
 
 # Custom user model
 AUTH_USER_MODEL = "accounts.User"
@@ -183,6 +212,35 @@ STORAGES = {
         "BACKEND": "whitenoise.storage.CompressedStaticFilesStorage",
     },
 }
+STATICFILES_FINDERS = [
+    "django.contrib.staticfiles.finders.FileSystemFinder",
+    "django.contrib.staticfiles.finders.AppDirectoriesFinder",
+    # Serves the plotly.js bundle of the installed plotly package
+    "common.finders.PlotlyJsFinder",
+]
+# The plotly.js bundle path is versioned, so browsers can cache it forever
+WHITENOISE_IMMUTABLE_FILE_TEST = r"/vendor/plotly-[0-9.]+/plotly\.min\.js$"
+
+# Render charts without plotly.js, which base.html loads once per page
+CHARTS_SHARED_PLOTLYJS = True
+# Fetch home and resident dashboard charts as JSON after the page loads,
+# instead of building them before the page is sent
+CHARTS_LAZY_LOAD = True
+# Seconds a rendered chart stays cached, changes to the underlying data
+# invalidate it sooner
+CHARTS_CACHE_TIMEOUT = 60 * 60 * 24
+# Trendline of the resident daily activity chart, one of "ols", "rolling"
+# (mean of the last 7 calendar days, days without activity count as 0) or
+# "lowess"
+CHARTS_DAILY_ACTIVITY_TRENDLINE = "ols"
+# Threads that build the charts of one page at the same time, 1 builds them
+# one after another
+CHARTS_MAX_WORKERS = env.int("CHARTS_MAX_WORKERS", default=4)
+# Read the home work totals from PostgreSQL materialized views instead of
+# the live queries, which other databases always run. The views are only as
+# fresh as the last refresh_materialized_views run, CSV import or daily
+# totals rebuild, so schedule the command when enabling this.
+HOMES_MATERIALIZED_VIEWS = env.bool("HOMES_MATERIALIZED_VIEWS", default=False)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.0/ref/settings/#default-auto-field
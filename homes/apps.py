@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class HomesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "homes"
+
+    def ready(self):
+        # Connect the signal handlers that invalidate cached home charts
+        from . import signals  # noqa: F401
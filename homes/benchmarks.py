@@ -0,0 +1,208 @@
+"""Reference implementations that the benchmark commands compare against.
+
+The pandas pipeline that built the home resident activity grid before it
+was computed from one grouped query is kept here as it was, so that the
+benchmark_resident_activity_grid command measures the original
+implementation. Only the benchmarks import this module, so pandas is not
+loaded by the application.
+"""
+
+import datetime
+
+import pandas as pd
+from django.db.models import Count, QuerySet
+
+from core.constants import WEEK_DAYS
+from homes.models import Home, _generate_date_range
+
+
+def _create_resident_date_combinations(
+    current_residents: QuerySet,
+    date_range: list[datetime.date],
+) -> pd.DataFrame:
+    """Creates a DataFrame containing combinations of resident IDs, full names,
+    and dates.
+
+    Args:
+    current_residents (QuerySet): QuerySet of current residents.
+    date_range (List[datetime.date]): List of dates for the range.
+
+    Returns:
+    pd.DataFrame: DataFrame with resident ID, full name, and activity date for each combination.
+        - resident_id: The resident's ID.
+        - resident_full_name: The resident's full name.
+        - activity_date: The date of the activity.
+    """
+    resident_date_combinations = [
+        {
+            "resident_id": resident.id,
+            "resident_full_name": resident.full_name,
+            "activity_date": activity_date,
+        }
+        for resident in current_residents
+        for activity_date in date_range
+    ]
+    return pd.DataFrame(resident_date_combinations)
+
+
+def _get_resident_activities(
+    current_residents: QuerySet,
+    date_range: list[datetime.date],
+) -> pd.DataFrame:
+    """Fetches the count of activities for each resident within the specified
+    date range.
+
+    Args:
+    current_residents (QuerySet): QuerySet of current residents.
+    date_range (List[datetime.date]): List of dates for the range.
+
+    Returns:
+    pd.DataFrame: DataFrame with resident activities including count.
+        - resident_id: The resident's ID.
+        - activity_date: The date of the activity.
+        - activity_count: The number of activities for the resident on the date.
+    """
+    from metrics.models import ResidentActivity
+
+    activities = (
+        ResidentActivity.objects.filter(
+            resident__in=current_residents,
+            activity_date__gte=date_range[-1],
+        )
+        .values("resident_id", "activity_date")
+        .annotate(activity_count=Count("id"))
+    )
+    return pd.DataFrame(list(activities))
+
+
+def _merge_and_annotate(
+    df_combinations: pd.DataFrame,
+    df_activities: pd.DataFrame,
+) -> pd.DataFrame:
+    """Merges two DataFrames and annotates the result with a boolean indicating
+    activity presence.
+
+    Args:
+    df_combinations (pd.DataFrame): DataFrame of resident-date combinations.
+    df_activities (pd.DataFrame): DataFrame of resident activities.
+
+    Returns:
+    pd.DataFrame: Merged DataFrame annotated with activity presence.
+        - resident_id: The resident's ID.
+        - resident_full_name: The resident's full name.
+        - activity_date: The date of the activity.
+        - activity_count: The number of activities for the resident on the date.
+        - had_activity: Boolean indicating whether the resident had activity on the date.
+    """
+    result = pd.merge(
+        df_combinations,
+        df_activities,
+        how="left",
+        on=["resident_id", "activity_date"],
+    )
+    result["had_activity"] = result["activity_count"] > 0
+    return result
+
+
+def _pivot_resident_data(result: pd.DataFrame) -> pd.DataFrame:
+    """Pivots a DataFrame to have residents as rows, dates as columns, and
+    activity presence as values.
+
+    Args:
+    result (pd.DataFrame): The DataFrame to pivot.
+
+    Returns:
+    pd.DataFrame: Pivoted DataFrame with residents and their activities across dates.
+        - resident_id: The resident's ID.
+        - resident_full_name: The resident's full name.
+        - total_activity_count: The total number of activities for the resident.
+        - one column for each date in the date range, with a boolean indicating whether the resident had activity on the date.
+    """
+    pivot_had_activity = result.pivot_table(
+        index=["resident_id", "resident_full_name"],
+        columns="activity_date",
+        values="had_activity",
+        fill_value=False,
+    )
+    total_activity_count = (
+        result.groupby(["resident_id", "resident_full_name"])["activity_count"]
+        .sum()
+        .reset_index()
+    )
+    total_activity_count.rename(
+        columns={"activity_count": "total_activity_count"},
+        inplace=True,
+    )
+    return pd.merge(
+        pivot_had_activity.reset_index(),
+        total_activity_count,
+        on=["resident_id", "resident_full_name"],
+        how="left",
+    )
+
+
+def _structure_resident_data(
+    pivot_result: pd.DataFrame,
+    current_residents: QuerySet,
+    date_range: list[datetime.date],
+) -> dict:
+    """Structures the resident data into a dictionary format for easy access.
+
+    Args:
+    pivot_result (pd.DataFrame): Pivoted DataFrame of residents' activities.
+    current_residents (QuerySet): QuerySet of current residents.
+    date_range (List[datetime.date]): Date range for the activities.
+
+    Returns:
+    dict: Dictionary containing structured data about residents' recent activities.
+        - start_date: The start date of the date range.
+        - end_date: The end date of the date range.
+        - residents: A list of dictionaries containing data about each resident.
+            - resident: The resident object.
+            - total_activity_count: The total number of activities for the resident.
+            - recent_activity_days: A list of dictionaries containing data about each day.
+    """
+    residents_data = []
+    for index, row in pivot_result.iterrows():
+        resident_data = {
+            "resident": current_residents.get(id=row["resident_id"]),
+            "total_activity_count": row["total_activity_count"],
+            "recent_activity_days": [
+                {"date": date, "was_active": row[date]}
+                for date in pivot_result.columns
+                if isinstance(date, datetime.date)
+            ],
+        }
+        resident_data["total_active_days"] = sum(
+            1 for day in resident_data["recent_activity_days"] if day["was_active"]
+        )
+        residents_data.append(resident_data)
+
+    return {
+        "start_date": date_range[-1],
+        "end_date": date_range[0],
+        "residents": residents_data,
+    }
+
+
+def current_residents_with_recent_activity_metadata_pandas(home: Home) -> dict:
+    """Build the recent activity metadata of a home with the pandas
+    pipeline."""
+    current_residents = home.current_residents.all()
+
+    date_range = _generate_date_range(WEEK_DAYS)
+    df_combinations = _create_resident_date_combinations(
+        current_residents,
+        date_range,
+    )
+    df_activities = _get_resident_activities(current_residents, date_range)
+
+    result = _merge_and_annotate(df_combinations, df_activities)
+    pivot_result = _pivot_resident_data(result)
+    structured_data = _structure_resident_data(
+        pivot_result,
+        current_residents,
+        date_range,
+    )
+
+    return structured_data
@@ -1,34 +1,42 @@
-from django.db.models import Sum, ExpressionWrapper, FloatField
+from collections.abc import Callable
+
 from django.utils.translation import gettext as _
 
-import pandas as pd
-import plotly.express as px
-from core.constants import DAY_MILLISECONDS, HOUR_MINUTES
+import plotly.graph_objects as go
+import plotly.io as pio
+from common.chart_builders import build_bar_chart
+from common.chart_templates import (
+    MONTHLY_LAYOUT,
+    PERCENT_LAYOUT,
+    get_chart_template,
+    register_chart_template,
+)
+from common.charts import render_percent_bar_svg
+from core.constants import DAY_MILLISECONDS
 from homes.models import Home
 
 from homes.queries import (
     home_activity_hours_by_resident_and_type,
-    get_daily_total_hours_by_role_and_work_type_with_percent,
-    get_home_total_hours_by_role_with_percent,
-    get_total_hours_by_role_and_work_type_with_percent,
     home_monthly_activity_hours_by_caregiver_role,
     home_monthly_activity_hours_by_type,
 )
 
 from metrics.models import ResidentActivity
+from work.queries import TIME_BUCKET_DAYS
 
 
-def _apply_activity_type_locale(df: pd.DataFrame) -> pd.DataFrame:
+def _apply_activity_type_locale(rows: list[dict]) -> None:
     """Apply the localized labels to the activity_type column."""
     activity_type_mapping = {
         choice.value: _(choice.label) for choice in ResidentActivity.ActivityTypeChoices
     }
 
     # Apply the mapping to localize the activity_type values
-    df["activity_type"] = df["activity_type"].map(activity_type_mapping)
+    for row in rows:
+        row["activity_type"] = activity_type_mapping.get(row["activity_type"])
 
 
-def _apply_caregiver_role_locale(df: pd.DataFrame) -> pd.DataFrame:
+def _apply_caregiver_role_locale(rows: list[dict]) -> None:
     """Apply the localized labels to the caregiver_role column."""
     caregiver_role_mapping = {
         choice.value: _(choice.label)
@@ -36,358 +44,344 @@ def _apply_caregiver_role_locale(df: pd.DataFrame) -> pd.DataFrame:
     }
 
     # Apply the mapping to localize the caregiver_role values
-    df["caregiver_role"] = df["caregiver_role"].map(caregiver_role_mapping)
+    for row in rows:
+        row["caregiver_role"] = caregiver_role_mapping.get(row["caregiver_role"])
+
+
+@register_chart_template("activity_counts_by_resident_and_activity_type")
+def _get_activity_counts_by_resident_and_activity_type_options() -> dict:
+    return {
+        "title": _("Resident activity count by type"),
+        "labels": {
+            "activity_hours": _("Activity hours"),
+            "full_name": _("Resident Name"),
+            "activity_type": _("Activity Type"),
+        },
+    }
 
 
-def prepare_activity_counts_by_resident_and_activity_type_chart(home: Home) -> str:
-    """Prepare the activity counts by resident and activity type chart."""
+def build_activity_counts_by_resident_and_activity_type_chart(home: Home) -> go.Figure:
+    """Build the activity counts by resident and activity type chart."""
     activity_counts_by_resident_and_activity_type = (
         home_activity_hours_by_resident_and_type(home)
     )
 
     _apply_activity_type_locale(activity_counts_by_resident_and_activity_type)
 
-    activity_counts_by_resident_and_activity_type_chart = px.bar(
+    return build_bar_chart(
         activity_counts_by_resident_and_activity_type,
         x="activity_hours",
         y="full_name",
         color="activity_type",
         orientation="h",
-        title=_("Resident activity count by type"),
-        labels={
-            "activity_hours": _("Activity hours"),
-            "full_name": _("Resident Name"),
-            "activity_type": _("Activity Type"),
-        },
-        template="plotly_dark",
+        **get_chart_template(
+            "activity_counts_by_resident_and_activity_type",
+        )._asdict(),
     )
 
-    # Set plot background/paper color to transparent
-    activity_counts_by_resident_and_activity_type_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-    )
 
-    return activity_counts_by_resident_and_activity_type_chart.to_html()
+@register_chart_template("work_by_type")
+def _get_work_by_type_options() -> dict:
+    return {
+        "title": _("Work hours by type"),
+        "labels": {
+            "work_type": _("Type of work"),
+            "total_hours": _("Total hours"),
+        },
+    }
 
 
-def prepare_work_by_type_chart(home: Home) -> str:
-    """Prepare the work hours by type chart."""
-    work_by_type = list(
-        home.work_performed.values("type__name")
-        .order_by("type__name")
-        .annotate(
-            total_hours=ExpressionWrapper(
-                Sum("duration_minutes") / HOUR_MINUTES,
-                output_field=FloatField(),
-            ),
-        ),
+def build_work_by_type_chart(home: Home) -> go.Figure:
+    """Build the work hours by type chart."""
+    return build_bar_chart(
+        home.work_totals.by_type,
+        x="work_type",
+        y="total_hours",
+        **get_chart_template("work_by_type")._asdict(),
     )
 
-    work_by_type_chart = px.bar(
-        work_by_type,
-        x="type__name",
-        y="total_hours",
-        title=_("Work hours by type"),
-        labels={
-            "type__name": _("Type of work"),
+
+@register_chart_template("work_by_caregiver_role")
+def _get_work_by_caregiver_role_options() -> dict:
+    return {
+        "title": _("Work hours by caregiver role"),
+        "labels": {
+            "role_name": _("Caregiver role"),
             "total_hours": _("Total hours"),
         },
-        template="plotly_dark",
-    )
+    }
+
 
-    # Set plot background/paper color to transparent
-    work_by_type_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
+def build_work_by_caregiver_role_chart(home: Home) -> go.Figure:
+    """Build the work hours by caregiver role chart."""
+    return build_bar_chart(
+        home.work_totals.by_caregiver_role,
+        x="role_name",
+        y="total_hours",
+        **get_chart_template("work_by_caregiver_role")._asdict(),
     )
 
-    return work_by_type_chart.to_html()
 
+def _get_work_percent_by_caregiver_role_and_type_over_time_options(
+    title: str,
+) -> dict:
+    return {
+        "title": title,
+        "labels": {
+            "role_name": _("Caregiver role"),
+            "percent_of_role_total_hours": _("Work percent"),
+            "work_type": _("Type of work"),
+        },
+        "layouts": [PERCENT_LAYOUT],
+    }
 
-def prepare_work_by_caregiver_role_chart(home: Home) -> str:
-    """Prepare the work hours by caregiver role chart."""
-    work_by_caregiver_role = list(
-        home.work_performed.values("caregiver_role__name")
-        .order_by("caregiver_role__name")
-        .annotate(
-            total_hours=ExpressionWrapper(
-                Sum("duration_minutes") / HOUR_MINUTES,
-                output_field=FloatField(),
-            ),
-        ),
+
+@register_chart_template("daily_work_percent_by_caregiver_role_and_type")
+def _get_daily_work_percent_by_caregiver_role_and_type_options() -> dict:
+    return _get_work_percent_by_caregiver_role_and_type_over_time_options(
+        _("Daily work percent by caregiver role and work type"),
     )
 
-    work_by_caregiver_role_chart = px.bar(
-        work_by_caregiver_role,
-        x="caregiver_role__name",
-        y="total_hours",
-        title=_("Work hours by caregiver role"),
-        labels={
-            "caregiver_role__name": _("Caregiver role"),
-            "total_hours": _("Total hours"),
-        },
-        template="plotly_dark",
+
+@register_chart_template("weekly_work_percent_by_caregiver_role_and_type")
+def _get_weekly_work_percent_by_caregiver_role_and_type_options() -> dict:
+    return _get_work_percent_by_caregiver_role_and_type_over_time_options(
+        _("Weekly work percent by caregiver role and work type"),
     )
 
-    # Set plot background/paper color to transparent
-    work_by_caregiver_role_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
+
+@register_chart_template("monthly_work_percent_by_caregiver_role_and_type")
+def _get_monthly_work_percent_by_caregiver_role_and_type_options() -> dict:
+    return _get_work_percent_by_caregiver_role_and_type_over_time_options(
+        _("Monthly work percent by caregiver role and work type"),
     )
 
-    return work_by_caregiver_role_chart.to_html()
+
+# Chart template kind of the work percent chart at each time bucket resolution
+WORK_PERCENT_OVER_TIME_CHART_TEMPLATES = {
+    "day": "daily_work_percent_by_caregiver_role_and_type",
+    "week": "weekly_work_percent_by_caregiver_role_and_type",
+    "month": "monthly_work_percent_by_caregiver_role_and_type",
+}
 
 
-def prepare_daily_work_percent_by_caregiver_role_and_type_chart(home: Home) -> str:
-    """Prepare the daily work percent by caregiver role and work type chart."""
-    daily_total_hours_by_role_and_work_type_with_percent = (
-        get_daily_total_hours_by_role_and_work_type_with_percent(home.id)
+def build_work_percent_by_caregiver_role_and_type_over_time_chart(
+    resolution: str,
+    work_by_time_bucket_role_and_type_with_percent: list[dict],
+) -> go.Figure:
+    """Build the work percent by caregiver role and work type chart, with
+    one bar per day, week or month."""
+    chart_template = get_chart_template(
+        WORK_PERCENT_OVER_TIME_CHART_TEMPLATES[resolution],
     )
 
-    daily_work_percent_by_caregiver_role_and_type_chart = px.bar(
-        daily_total_hours_by_role_and_work_type_with_percent,
+    work_percent_over_time_chart = build_bar_chart(
+        work_by_time_bucket_role_and_type_with_percent,
         x="date",
-        y="percent_of_daily_role_total_hours",
+        y="percent_of_role_total_hours",
         facet_row="role_name",
         color="work_type",
-        title=_("Daily work percent by caregiver role and work type"),
-        labels={
-            "role_name": _("Caregiver role"),
-            "percent_of_daily_role_total_hours": _("Work percent"),
-            "work_type": _("Type of work"),
-        },
         # Add numeric text on bars
         text_auto=True,
-        template="plotly_dark",
+        **chart_template._asdict(),
     )
 
-    # Format y-axis as percentages
-    daily_work_percent_by_caregiver_role_and_type_chart.update_yaxes(tickformat=",.0%")
-
     # Remove facet prefix from facet row labels
-    daily_work_percent_by_caregiver_role_and_type_chart.for_each_annotation(
+    work_percent_over_time_chart.for_each_annotation(
         lambda a: a.update(text=a.text.split("=")[-1]),
     )
 
-    # Ensure that all bar widths are one day (where units are in milliseconds)
-    daily_work_percent_by_caregiver_role_and_type_chart.update_traces(
-        width=DAY_MILLISECONDS,
-    )
-
-    # Set plot background/paper color to transparent
-    daily_work_percent_by_caregiver_role_and_type_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
+    # Make each bar span its day, week or month from the bucket start date
+    # (where units are in milliseconds)
+    work_percent_over_time_chart.update_traces(
+        width=TIME_BUCKET_DAYS[resolution] * DAY_MILLISECONDS,
+        offset=0,
     )
 
     # Remove individual y-axis labels and add a single global one
-    daily_work_percent_by_caregiver_role_and_type_chart.update_yaxes(title_text="")
-    daily_work_percent_by_caregiver_role_and_type_chart.update_layout(
-        yaxis_title=_("Work percent"),
+    work_percent_over_time_chart.update_yaxes(title_text="")
+    work_percent_over_time_chart.update_layout(
+        yaxis_title=chart_template.labels["percent_of_role_total_hours"],
     )
 
-    return daily_work_percent_by_caregiver_role_and_type_chart.to_html()
+    return work_percent_over_time_chart
 
 
-def prepare_home_work_percent_by_caregiver_role_chart(home: Home) -> str:
-    """Prepare the home work percent by caregiver role chart."""
-    home_work_percent_by_caregiver_role = get_home_total_hours_by_role_with_percent(
-        home.id,
+def build_daily_work_percent_by_caregiver_role_and_type_chart(home: Home) -> go.Figure:
+    """Build the work percent by caregiver role and work type chart over the
+    work history of a home."""
+    return build_work_percent_by_caregiver_role_and_type_over_time_chart(
+        home.work_totals.resolution,
+        home.work_totals.by_time_bucket_caregiver_role_and_type,
     )
 
-    home_work_percent_by_caregiver_role_chart = px.bar(
-        home_work_percent_by_caregiver_role,
-        color="role_name",
-        x="percent_of_role_total_hours",
-        y="home_name",
-        labels={
-            "role_name": _("Caregiver role"),
-            "percent_of_role_total_hours": "",
-            "home_name": "",
-        },
-        text_auto=True,
-        template="plotly_dark",
-    )
 
-    home_work_percent_by_caregiver_role_chart.update_layout(
-        height=100,
-        margin={
-            "b": 0,
-            "l": 0,
-            "r": 0,
-            "t": 0,
-            "pad": 0,
-        },
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        showlegend=False,
-        font_color="#FFFFFF",
-        xaxis={
-            "tickformat": ",.0%",
-        },
-        yaxis={
-            "visible": False,
-        },
+def render_home_work_percent_by_caregiver_role_bar(home: Home) -> str:
+    """Render the home work percent by caregiver role as a small stacked
+    bar. Roles of a home with no work minutes have no percent, and are drawn
+    as 0%."""
+    colorway = pio.templates["plotly_dark"].layout.colorway
+
+    return render_percent_bar_svg(
+        [
+            {
+                "label": role["role_name"],
+                "percent": (role["percent_of_role_total_hours"] or 0) * 100,
+                "color": colorway[index % len(colorway)],
+            }
+            for index, role in enumerate(home.work_percents_by_caregiver_role)
+        ],
     )
 
-    return home_work_percent_by_caregiver_role_chart.to_html(
-        config={
-            "displayModeBar": False,
+
+@register_chart_template("work_percent_by_caregiver_role_and_type")
+def _get_work_percent_by_caregiver_role_and_type_options() -> dict:
+    return {
+        "title": _("Work percent by caregiver role and work type"),
+        "labels": {
+            "role_name": _("Caregiver role"),
+            "percent_of_role_total_hours": _("Work percent"),
+            "work_type": _("Type of work"),
         },
-    )
+        "layouts": [PERCENT_LAYOUT],
+    }
 
 
-def prepare_work_percent_by_caregiver_role_and_type_chart(
+def build_work_percent_by_caregiver_role_and_type_chart(
     work_by_caregiver_role_and_type_with_percent: list[dict],
-) -> str:
-    """Prepare the work percent by caregiver role and work type chart."""
-    work_percent_by_caregiver_role_and_type_chart = px.bar(
+) -> go.Figure:
+    """Build the work percent by caregiver role and work type chart."""
+    return build_bar_chart(
         work_by_caregiver_role_and_type_with_percent,
         x="role_name",
         y="percent_of_role_total_hours",
         color="work_type",
-        title=_("Work percent by caregiver role and work type"),
-        labels={
-            "role_name": _("Caregiver role"),
-            "percent_of_role_total_hours": _("Work percent"),
-            "work_type": _("Type of work"),
-        },
         text_auto=True,
-        template="plotly_dark",
+        **get_chart_template("work_percent_by_caregiver_role_and_type")._asdict(),
     )
-    work_percent_by_caregiver_role_and_type_chart.layout.yaxis.tickformat = ",.0%"
 
-    # Set plot background/paper color to transparent
-    work_percent_by_caregiver_role_and_type_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
-    )
 
-    return work_percent_by_caregiver_role_and_type_chart.to_html()
+@register_chart_template("work_by_caregiver_role_and_type")
+def _get_work_by_caregiver_role_and_type_options() -> dict:
+    return {
+        "title": _("Work hours by caregiver role and work type"),
+        "labels": {
+            "role_name": _("Caregiver role"),
+            "total_hours": _("Total hours"),
+            "work_type": _("Type of work"),
+        },
+    }
 
 
-def prepare_work_by_caregiver_role_and_type_chart(
+def build_work_by_caregiver_role_and_type_chart(
     work_by_caregiver_role_and_type_with_percent: list[dict],
-) -> str:
-    """Prepare the work hours by caregiver role and work type chart."""
-    work_by_caregiver_role_and_type_chart = px.bar(
+) -> go.Figure:
+    """Build the work hours by caregiver role and work type chart."""
+    return build_bar_chart(
         work_by_caregiver_role_and_type_with_percent,
         x="role_name",
         y="total_hours",
         color="work_type",
-        title=_("Work hours by caregiver role and work type"),
-        labels={
-            "role_name": _("Caregiver role"),
-            "total_hours": _("Total hours"),
-            "work_type": _("Type of work"),
-        },
-        template="plotly_dark",
-    )
-
-    # Set plot background/paper color to transparent
-    work_by_caregiver_role_and_type_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
-    )
-
-    return work_by_caregiver_role_and_type_chart.to_html()
-
-
-def prepare_work_by_caregiver_role_and_type_charts(context: dict) -> dict:
-    home = context["home"]
-
-    work_by_caregiver_role_and_type_with_percent = (
-        get_total_hours_by_role_and_work_type_with_percent(home.id)
-    )
-
-    context["work_percent_by_caregiver_role_and_type_chart"] = (
-        prepare_work_percent_by_caregiver_role_and_type_chart(
-            work_by_caregiver_role_and_type_with_percent,
-        )
+        **get_chart_template("work_by_caregiver_role_and_type")._asdict(),
     )
 
-    context["work_by_caregiver_role_and_type_chart"] = (
-        prepare_work_by_caregiver_role_and_type_chart(
-            work_by_caregiver_role_and_type_with_percent,
-        )
-    )
 
-    return context
+@register_chart_template("monthly_activity_hours_by_type")
+def _get_monthly_activity_hours_by_type_options() -> dict:
+    return {
+        "title": _("Monthly activity hours by type"),
+        "labels": {
+            "month": _("Month"),
+            "activity_hours": _("Activity hours"),
+            "activity_type": _("Activity type"),
+        },
+        "layouts": [MONTHLY_LAYOUT],
+    }
 
 
-def prepare_monthly_activity_hours_by_type_chart(home: Home) -> str:
-    """Prepare the monthly activity hours by type chart."""
+def build_monthly_activity_hours_by_type_chart(home: Home) -> go.Figure:
+    """Build the monthly activity hours by type chart."""
     monthly_activity_hours_by_type = home_monthly_activity_hours_by_type(home)
 
     _apply_activity_type_locale(monthly_activity_hours_by_type)
 
-    monthly_activity_hours_by_type_chart = px.bar(
+    return build_bar_chart(
         monthly_activity_hours_by_type,
         x="month",
         y="activity_hours",
         color="activity_type",
-        title=_("Monthly activity hours by type"),
-        labels={
-            "month": _("Month"),
-            "activity_hours": _("Activity hours"),
-            "activity_type": _("Activity type"),
-        },
+        **get_chart_template("monthly_activity_hours_by_type")._asdict(),
     )
 
-    # Set plot background/paper color to transparent
-    monthly_activity_hours_by_type_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        # ensure text is visible on dark background
-        font_color="#FFFFFF",
-        # only display month on x-axis
-        xaxis={
-            "dtick": "M1",
-            "tickformat": "%b\n%Y",
-        },
-    )
 
-    return monthly_activity_hours_by_type_chart.to_html()
+@register_chart_template("monthly_activity_hours_by_caregiver_role")
+def _get_monthly_activity_hours_by_caregiver_role_options() -> dict:
+    return {
+        "title": _("Monthly activity hours by caregiver role"),
+        "labels": {
+            "month": _("Month"),
+            "caregiver_role": _("Caregiver role"),
+            "activity_hours": _("Activity hours"),
+        },
+        "layouts": [MONTHLY_LAYOUT],
+    }
 
 
-def prepare_monthly_activity_hours_by_caregiver_role_chart(home: Home) -> str:
-    """Prepare the monthly activity hours by caregiver role chart."""
+def build_monthly_activity_hours_by_caregiver_role_chart(home: Home) -> go.Figure:
+    """Build the monthly activity hours by caregiver role chart."""
     monthly_activity_hours_by_caregiver_role = (
         home_monthly_activity_hours_by_caregiver_role(home)
     )
 
     _apply_caregiver_role_locale(monthly_activity_hours_by_caregiver_role)
 
-    monthly_activity_hours_by_caregiver_role_chart = px.bar(
+    return build_bar_chart(
         monthly_activity_hours_by_caregiver_role,
         x="month",
         y="activity_hours",
         color="caregiver_role",
-        title=_("Monthly activity hours by caregiver role"),
-        labels={
-            "month": _("Month"),
-            "caregiver_role": _("Caregiver role"),
-            "activity_hours": _("Activity hours"),
-        },
+        **get_chart_template("monthly_activity_hours_by_caregiver_role")._asdict(),
     )
 
-    # Set plot background/paper color to transparent
-    monthly_activity_hours_by_caregiver_role_chart.update_layout(
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        # ensure text is visible on dark background
-        font_color="#FFFFFF",
-        # only display month on x-axis
-        xaxis={
-            "dtick": "M1",
-            "tickformat": "%b\n%Y",
-        },
+
+def build_work_percent_by_caregiver_role_and_type_chart_for_home(
+    home: Home,
+) -> go.Figure:
+    """Build the work percent by caregiver role and work type chart of a
+    home."""
+    return build_work_percent_by_caregiver_role_and_type_chart(
+        home.work_totals.by_caregiver_role_and_type,
+    )
+
+
+def build_work_by_caregiver_role_and_type_chart_for_home(home: Home) -> go.Figure:
+    """Build the work hours by caregiver role and work type chart of a home."""
+    return build_work_by_caregiver_role_and_type_chart(
+        home.work_totals.by_caregiver_role_and_type,
     )
 
-    return monthly_activity_hours_by_caregiver_role_chart.to_html()
+
+# Home detail charts by template context name, which is also the chart name
+# in the lazy loaded chart URLs
+HOME_ACTIVITY_CHARTS: dict[str, Callable[[Home], go.Figure]] = {
+    "activity_counts_by_resident_and_activity_type_chart": (
+        build_activity_counts_by_resident_and_activity_type_chart
+    ),
+    "monthly_activity_hours_by_type_chart": build_monthly_activity_hours_by_type_chart,
+    "monthly_activity_hours_by_caregiver_role_chart": (
+        build_monthly_activity_hours_by_caregiver_role_chart
+    ),
+}
+HOME_WORK_CHARTS: dict[str, Callable[[Home], go.Figure]] = {
+    "work_by_type_chart": build_work_by_type_chart,
+    "work_by_caregiver_role_chart": build_work_by_caregiver_role_chart,
+    "daily_work_percent_by_caregiver_role_and_type_chart": (
+        build_daily_work_percent_by_caregiver_role_and_type_chart
+    ),
+    "work_percent_by_caregiver_role_and_type_chart": (
+        build_work_percent_by_caregiver_role_and_type_chart_for_home
+    ),
+    "work_by_caregiver_role_and_type_chart": (
+        build_work_by_caregiver_role_and_type_chart_for_home
+    ),
+}
@@ -0,0 +1,124 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from homes.benchmarks import current_residents_with_recent_activity_metadata_pandas
+from homes.models import Home
+from metrics.models import ResidentActivity
+from residents.models import Residency, Resident
+
+DEFAULT_RESIDENT_COUNTS = [50, 200, 1000]
+ACTIVITIES_PER_RESIDENT = range(15)
+ACTIVITY_DAYS_AGO = range(14)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the SQL and pandas implementations of "
+        "Home.current_residents_with_recent_activity_metadata. "
+        "Benchmark data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--residents",
+            type=int,
+            nargs="+",
+            default=DEFAULT_RESIDENT_COUNTS,
+            help="Number of residents in the benchmark home",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed runs per implementation",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            self.stdout.write("Invalid repeat. Please try again.")
+            return
+
+        self.stdout.write(
+            f"{'residents':>10} {'implementation':>15} {'median ms':>10} {'queries':>8}",
+        )
+
+        for resident_count in options["residents"]:
+            with transaction.atomic():
+                home = self._create_benchmark_home(resident_count)
+
+                for name, compute in [
+                    (
+                        "sql",
+                        lambda home=home: (
+                            home.current_residents_with_recent_activity_metadata
+                        ),
+                    ),
+                    (
+                        "pandas",
+                        lambda home=home: (
+                            current_residents_with_recent_activity_metadata_pandas(
+                                home,
+                            )
+                        ),
+                    ),
+                ]:
+                    timings, query_count = self._time(compute, options["repeat"])
+                    self.stdout.write(
+                        f"{resident_count:>10} {name:>15} "
+                        f"{statistics.median(timings) * 1000:>10.1f} {query_count:>8}",
+                    )
+
+                transaction.set_rollback(True)
+
+    def _create_benchmark_home(self, resident_count: int) -> Home:
+        """Create a home with the given number of current residents and a
+        random amount of recent activity for each resident."""
+        home = Home.objects.create(name="Benchmark home")
+        residents = Resident.objects.bulk_create(
+            [
+                Resident(
+                    first_name=f"Resident {index}",
+                    last_initial="B",
+                    url_uuid=f"benchmark-{index}",
+                )
+                for index in range(resident_count)
+            ],
+        )
+        residencies = Residency.objects.bulk_create(
+            [Residency(resident=resident, home=home) for resident in residents],
+        )
+
+        today = datetime.date.today()
+        ResidentActivity.objects.bulk_create(
+            [
+                ResidentActivity(
+                    resident=residency.resident,
+                    residency=residency,
+                    home=home,
+                    activity_date=today
+                    - datetime.timedelta(days=random.choice(ACTIVITY_DAYS_AGO)),
+                )
+                for residency in residencies
+                for _ in range(random.choice(ACTIVITIES_PER_RESIDENT))
+            ],
+        )
+
+        return home
+
+    def _time(self, compute, repeat: int) -> tuple[list[float], int]:
+        """Return the run times in seconds and the query count of the last
+        run."""
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                compute()
+                timings.append(time.perf_counter() - start)
+
+        return timings, len(queries)
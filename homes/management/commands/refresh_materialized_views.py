@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from homes.materialized_views import refresh_materialized_views
+
+
+class Command(BaseCommand):
+    help = "Refreshes the home materialized views concurrently, on PostgreSQL."
+
+    def handle(self, *args, **options):
+        refreshed_views = refresh_materialized_views()
+
+        if not refreshed_views:
+            self.stdout.write(
+                "Materialized views are not enabled, the home queries run live.",
+            )
+            return
+
+        for view_name in refreshed_views:
+            self.stdout.write(f"Refreshed {view_name}.")
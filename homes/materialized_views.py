@@ -0,0 +1,43 @@
+"""PostgreSQL materialized views of the home list queries.
+
+The views are created by migrations on PostgreSQL only. When they are
+enabled with the HOMES_MATERIALIZED_VIEWS setting, which is off by
+default, the home queries read from them instead of aggregating the work
+on each request. Each refresh recomputes a whole view, so work saved
+by requests does not refresh them. The views are refreshed concurrently,
+so reads are not blocked, after a CSV import of work, after the daily work
+totals are rebuilt and by the refresh_materialized_views command, which is
+run on a schedule. In between, the home list work totals lag behind
+the work saved by requests. Other databases run the live queries.
+"""
+
+from django.conf import settings
+from django.db import connection
+
+# Work hours by home and caregiver role, with each role's percent of the
+# home's work hours
+WORK_HOURS_BY_CAREGIVER_ROLE_VIEW = "home_work_hours_by_caregiver_role"
+
+# Materialized views, in refresh order
+MATERIALIZED_VIEWS = [WORK_HOURS_BY_CAREGIVER_ROLE_VIEW]
+
+
+def materialized_views_enabled() -> bool:
+    """Return whether the home queries read from the materialized views."""
+    return settings.HOMES_MATERIALIZED_VIEWS and connection.vendor == "postgresql"
+
+
+def refresh_materialized_views() -> list[str]:
+    """Refresh the materialized views concurrently, when they are enabled.
+
+    Returns:
+        list[str]: The names of the refreshed views.
+    """
+    if not materialized_views_enabled():
+        return []
+
+    with connection.cursor() as cursor:
+        for view_name in MATERIALIZED_VIEWS:
+            cursor.execute(f"refresh materialized view concurrently {view_name};")
+
+    return MATERIALIZED_VIEWS
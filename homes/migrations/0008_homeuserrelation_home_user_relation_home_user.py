@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_homeuserrelation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='homeuserrelation',
+            index=models.Index(fields=['home', 'user'], name='home_user_relation_home_user'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:20
+
+from django.db import migrations
+
+
+def create_materialized_views(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    # The work hours by home and caregiver role, from the daily work totals.
+    # Concurrent refreshes need a unique index on the view.
+    schema_editor.execute(
+        """
+        create materialized view home_work_hours_by_caregiver_role as
+        with work_totals_by_caregiver_role as (
+            select
+                work_daily_total.home_id,
+                caregiver_role.name as role_name,
+                CAST(sum(duration_minutes) / 60.0 as FLOAT) as total_hours
+            from work_daily_total
+            left join caregiver_role on caregiver_role_id = caregiver_role.id
+            group by work_daily_total.home_id, role_name
+        )
+
+        select
+            *,
+            (
+                total_hours / SUM(total_hours) over (partition by home_id)
+            ) as percent_of_role_total_hours
+        from work_totals_by_caregiver_role;
+        """
+    )
+    schema_editor.execute(
+        """
+        create unique index home_work_hours_by_caregiver_role_home_role
+        on home_work_hours_by_caregiver_role (home_id, role_name);
+        """
+    )
+
+
+def drop_materialized_views(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        "drop materialized view if exists home_work_hours_by_caregiver_role;"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0002_alter_caregiverrole_options_and_more'),
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('work', '0011_work_daily_total_home_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_materialized_views, drop_materialized_views),
+    ]
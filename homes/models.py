@@ -1,25 +1,44 @@
 import datetime
+import threading
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q, QuerySet
+from django.core import signing
+from django.db.models import Count, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import timedelta
 from django.db import models
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 import numpy as np
-import pandas as pd
 from shortuuid.django_fields import ShortUUIDField
 
 
-from core.constants import WEEK_DAYS, WEEKLY_ACTIVITY_RANGES
+from common.chart_cache import get_cached_chart_data
+from core.constants import (
+    ACTIVITY_LEVEL_COUNT_KEYS,
+    ACTIVITY_LEVEL_PERCENT_KEYS,
+    WEEK_DAYS,
+    WEEKLY_ACTIVITY_RANGES,
+)
+from homes.queries import (
+    get_home_total_hours_by_role_with_percent,
+    get_resident_counts_by_activity_level_for_homes,
+    get_total_hours_by_role_with_percent_for_homes,
+)
+from metrics.helpers import normalize_percents
 
 if TYPE_CHECKING:
     from residents.models import Resident
+    from work.queries import WorkTotals
 
 
 user_model = get_user_model()
 
+RESIDENT_ACTIVITY_GRID_CURSOR_SALT = "homes.resident_activity_grid"
+
 
 def _generate_date_range(days_ago: int) -> list[datetime.date]:
     """Generates a list of dates starting from today and going back a specified
@@ -35,167 +54,117 @@ def _generate_date_range(days_ago: int) -> list[datetime.date]:
     return [today - datetime.timedelta(days=x) for x in range(days_ago)]
 
 
-def _create_resident_date_combinations(
-    current_residents: QuerySet,
-    date_range: list[datetime.date],
-) -> pd.DataFrame:
-    """Creates a DataFrame containing combinations of resident IDs, full names,
-    and dates.
-
-    Args:
-    current_residents (QuerySet): QuerySet of current residents.
-    date_range (List[datetime.date]): List of dates for the range.
-
-    Returns:
-    pd.DataFrame: DataFrame with resident ID, full name, and activity date for each combination.
-        - resident_id: The resident's ID.
-        - resident_full_name: The resident's full name.
-        - activity_date: The date of the activity.
-    """
-    resident_date_combinations = [
-        {
-            "resident_id": resident.id,
-            "resident_full_name": resident.full_name,
-            "activity_date": activity_date,
-        }
-        for resident in current_residents
-        for activity_date in date_range
-    ]
-    return pd.DataFrame(resident_date_combinations)
-
-
-def _get_resident_activities(
-    current_residents: QuerySet,
+def _get_resident_activity_counts_by_date(
+    current_residents: QuerySet | list["Resident"],
     date_range: list[datetime.date],
-) -> pd.DataFrame:
-    """Fetches the count of activities for each resident within the specified
-    date range.
+) -> dict[int, dict[datetime.date, int]]:
+    """Fetches the count of activities for each resident and day within the
+    specified date range in a single grouped query.
 
     Args:
-    current_residents (QuerySet): QuerySet of current residents.
+    current_residents (QuerySet | List[Resident]): The current residents.
     date_range (List[datetime.date]): List of dates for the range.
 
     Returns:
-    pd.DataFrame: DataFrame with resident activities including count.
-        - resident_id: The resident's ID.
-        - activity_date: The date of the activity.
-        - activity_count: The number of activities for the resident on the date.
+    dict: Mapping of resident ID to a mapping of activity date to activity count.
+        Days without activities are omitted.
     """
-    from metrics.models import ResidentActivity
+    from metrics.models import ResidentDailyActivity
 
     activities = (
-        ResidentActivity.objects.filter(
+        ResidentDailyActivity.objects.filter(
             resident__in=current_residents,
-            activity_date__gte=date_range[-1],
+            activity_date__range=(date_range[-1], date_range[0]),
         )
         .values("resident_id", "activity_date")
-        .annotate(activity_count=Count("id"))
+        .annotate(activity_count=Sum("activity_count"))
+        .values_list("resident_id", "activity_date", "activity_count")
     )
-    return pd.DataFrame(list(activities))
 
+    activity_counts = {}
+    for resident_id, activity_date, activity_count in activities:
+        activity_counts.setdefault(resident_id, {})[activity_date] = activity_count
+
+    return activity_counts
 
-def _merge_and_annotate(
-    df_combinations: pd.DataFrame,
-    df_activities: pd.DataFrame,
-) -> pd.DataFrame:
-    """Merges two DataFrames and annotates the result with a boolean indicating
-    activity presence.
+
+def _dump_resident_activity_grid_cursor(resident: "Resident") -> str:
+    """Encodes the position after a resident in the resident activity grid.
 
     Args:
-    df_combinations (pd.DataFrame): DataFrame of resident-date combinations.
-    df_activities (pd.DataFrame): DataFrame of resident activities.
+    resident (Resident): The last resident on a page of the grid.
 
     Returns:
-    pd.DataFrame: Merged DataFrame annotated with activity presence.
-        - resident_id: The resident's ID.
-        - resident_full_name: The resident's full name.
-        - activity_date: The date of the activity.
-        - activity_count: The number of activities for the resident on the date.
-        - had_activity: Boolean indicating whether the resident had activity on the date.
+    str: A signed, URL safe cursor for the next page.
     """
-    result = pd.merge(
-        df_combinations,
-        df_activities,
-        how="left",
-        on=["resident_id", "activity_date"],
+    return signing.dumps(
+        [resident.first_name, resident.id],
+        salt=RESIDENT_ACTIVITY_GRID_CURSOR_SALT,
+        compress=True,
     )
-    result["had_activity"] = result["activity_count"] > 0
-    return result
 
 
-def _pivot_resident_data(result: pd.DataFrame) -> pd.DataFrame:
-    """Pivots a DataFrame to have residents as rows, dates as columns, and
-    activity presence as values.
+def _load_resident_activity_grid_cursor(cursor: str | None) -> Q | None:
+    """Decodes a resident activity grid cursor into a filter for the
+    residents after it.
 
     Args:
-    result (pd.DataFrame): The DataFrame to pivot.
+    cursor (str | None): A cursor from `_dump_resident_activity_grid_cursor`.
 
     Returns:
-    pd.DataFrame: Pivoted DataFrame with residents and their activities across dates.
-        - resident_id: The resident's ID.
-        - resident_full_name: The resident's full name.
-        - total_activity_count: The total number of activities for the resident.
-        - one column for each date in the date range, with a boolean indicating whether the resident had activity on the date.
+    Q | None: Filter for the residents ordered after the cursor, or None if
+        the cursor is missing or invalid.
     """
-    pivot_had_activity = result.pivot_table(
-        index=["resident_id", "resident_full_name"],
-        columns="activity_date",
-        values="had_activity",
-        fill_value=False,
-    )
-    total_activity_count = (
-        result.groupby(["resident_id", "resident_full_name"])["activity_count"]
-        .sum()
-        .reset_index()
-    )
-    total_activity_count.rename(
-        columns={"activity_count": "total_activity_count"},
-        inplace=True,
-    )
-    return pd.merge(
-        pivot_had_activity.reset_index(),
-        total_activity_count,
-        on=["resident_id", "resident_full_name"],
-        how="left",
-    )
+    if not cursor:
+        return None
+
+    try:
+        first_name, resident_id = signing.loads(
+            cursor,
+            salt=RESIDENT_ACTIVITY_GRID_CURSOR_SALT,
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
 
+    return Q(first_name__gt=first_name) | Q(first_name=first_name, id__gt=resident_id)
 
-def _structure_resident_data(
-    pivot_result: pd.DataFrame,
-    current_residents: QuerySet,
+
+def _build_resident_activity_grid(
+    current_residents: list["Resident"],
+    activity_counts: dict[int, dict[datetime.date, int]],
     date_range: list[datetime.date],
 ) -> dict:
-    """Structures the resident data into a dictionary format for easy access.
+    """Structures the resident activity counts into a resident/day grid.
 
     Args:
-    pivot_result (pd.DataFrame): Pivoted DataFrame of residents' activities.
-    current_residents (QuerySet): QuerySet of current residents.
+    current_residents (List[Resident]): The current residents, in display order.
+    activity_counts (dict): Activity counts by resident ID and activity date.
     date_range (List[datetime.date]): Date range for the activities.
 
     Returns:
-    dict: Dictionary containing structured data about residents' recent activities.
-        - start_date: The start date of the date range.
-        - end_date: The end date of the date range.
-        - residents: A list of dictionaries containing data about each resident.
-            - resident: The resident object.
-            - total_activity_count: The total number of activities for the resident.
-            - recent_activity_days: A list of dictionaries containing data about each day.
+    dict: Dictionary containing structured data about residents' recent activities,
+        with the same structure as the pandas pipeline in homes.benchmarks.
     """
+    # Grid columns run from the oldest to the most recent date
+    grid_dates = sorted(date_range)
+
     residents_data = []
-    for index, row in pivot_result.iterrows():
-        resident_data = {
-            "resident": current_residents.get(id=row["resident_id"]),
-            "total_activity_count": row["total_activity_count"],
-            "recent_activity_days": [
-                {"date": date, "was_active": row[date]}
-                for date in pivot_result.columns
-                if isinstance(date, datetime.date)
-            ],
-        }
-        resident_data["total_active_days"] = sum(
-            1 for day in resident_data["recent_activity_days"] if day["was_active"]
+    for resident in current_residents:
+        resident_activity_counts = activity_counts.get(resident.id, {})
+
+        recent_activity_days = [
+            {"date": date, "was_active": date in resident_activity_counts}
+            for date in grid_dates
+        ]
+
+        residents_data.append(
+            {
+                "resident": resident,
+                "total_activity_count": sum(resident_activity_counts.values()),
+                "recent_activity_days": recent_activity_days,
+                "total_active_days": len(resident_activity_counts),
+            },
         )
-        residents_data.append(resident_data)
 
     return {
         "start_date": date_range[-1],
@@ -204,6 +173,139 @@ def _structure_resident_data(
     }
 
 
+def _get_activity_level_count_aggregates(activity_count_field: str) -> dict:
+    """Returns conditional aggregates counting residents in each activity
+    level.
+
+    Args:
+    activity_count_field (str): Name of the field or annotation holding each
+        resident's weekly activity count.
+
+    Returns:
+    dict: Count aggregates keyed by the ACTIVITY_LEVEL_COUNT_KEYS values, with
+        the level boundaries taken from WEEKLY_ACTIVITY_RANGES.
+    """
+    return {
+        count_key: Count(
+            "id",
+            filter=Q(
+                **{
+                    f"{activity_count_field}__range": (
+                        WEEKLY_ACTIVITY_RANGES[level]["min_inclusive"],
+                        WEEKLY_ACTIVITY_RANGES[level]["max_inclusive"],
+                    ),
+                },
+            ),
+        )
+        for level, count_key in ACTIVITY_LEVEL_COUNT_KEYS.items()
+    }
+
+
+def _get_resident_percents_by_activity_level(
+    resident_counts: list[dict[str, int]],
+) -> list[dict[str, int]]:
+    """Adds integer percents to the resident counts by activity level of
+    several homes.
+
+    Args:
+    resident_counts (List[dict]): Resident counts by activity level, one
+        dictionary per home.
+
+    Returns:
+    List[dict]: Copies of the resident counts, each with a percent for every
+        activity level. The percents of a home sum to 100, or are all zero if
+        the home has no current residents.
+    """
+    if not resident_counts:
+        return []
+
+    counts = np.array(
+        [
+            [counts[count_key] for count_key in ACTIVITY_LEVEL_COUNT_KEYS.values()]
+            for counts in resident_counts
+        ],
+    )
+    percents = normalize_percents(counts)
+
+    return [
+        {
+            **counts,
+            **dict(
+                zip(
+                    ACTIVITY_LEVEL_PERCENT_KEYS.values(),
+                    home_percents.tolist(),
+                ),
+            ),
+        }
+        for counts, home_percents in zip(resident_counts, percents)
+    ]
+
+
+def prefetch_resident_counts_by_activity_level(homes: Iterable["Home"]) -> list["Home"]:
+    """Computes the resident counts by activity level for several homes in one
+    grouped query.
+
+    The counts, and the percents normalized for all homes at once, are
+    memoized on each home, so that the activity level metrics of the
+    homes do not query the database per home.
+
+    Args:
+    homes (Iterable[Home]): The homes to compute the counts for.
+
+    Returns:
+    List[Home]: The homes, with the counts memoized.
+    """
+    homes = list(homes)
+
+    resident_counts_by_home = get_resident_counts_by_activity_level_for_homes(
+        [home.id for home in homes],
+    )
+    empty_resident_counts = {
+        "total_count": 0,
+        **{count_key: 0 for count_key in ACTIVITY_LEVEL_COUNT_KEYS.values()},
+    }
+
+    resident_counts = [
+        resident_counts_by_home.get(home.id, empty_resident_counts) for home in homes
+    ]
+    resident_percents = _get_resident_percents_by_activity_level(resident_counts)
+
+    for home, home_counts, home_percents in zip(
+        homes,
+        resident_counts,
+        resident_percents,
+    ):
+        home.resident_counts_by_activity_level = home_counts
+        home.resident_percents_by_activity_level = home_percents
+
+    return homes
+
+
+def prefetch_work_percents_by_caregiver_role(homes: Iterable["Home"]) -> list["Home"]:
+    """Computes the work percents by caregiver role for several homes in one
+    query.
+
+    The percents are memoized on each home, so that rendering the work
+    percent bar of each home does not query the database per home.
+
+    Args:
+    homes (Iterable[Home]): The homes to compute the percents for.
+
+    Returns:
+    List[Home]: The homes, with the percents memoized.
+    """
+    homes = list(homes)
+
+    work_percents_by_home = get_total_hours_by_role_with_percent_for_homes(
+        [home.id for home in homes],
+    )
+
+    for home in homes:
+        home.work_percents_by_caregiver_role = work_percents_by_home.get(home.id, [])
+
+    return homes
+
+
 class HomeUserRelation(models.Model):
     user = models.ForeignKey(
         to=user_model,
@@ -224,6 +326,11 @@ class HomeUserRelation(models.Model):
         verbose_name = _("home user relation")
         verbose_name_plural = _("home user relations")
         unique_together = ("user", "home")
+        indexes = [
+            # The unique constraint covers lookups by user, this covers
+            # lookups of the users of a home
+            models.Index(fields=["home", "user"], name="home_user_relation_home_user"),
+        ]
 
 
 class Home(models.Model):
@@ -242,6 +349,17 @@ class Home(models.Model):
         editable=False,  # type: ignore
     )
 
+    # Computed metrics that are memoized on the instance, so that each
+    # metric is computed at most once per request (e.g. page render).
+    CACHED_METRICS = (
+        "current_residents_with_recent_activity_metadata",
+        "resident_counts_by_activity_level",
+        "resident_percents_by_activity_level",
+        "resident_counts_by_activity_level_chart_data",
+        "work_percents_by_caregiver_role",
+        "work_totals",
+    )
+
     class Meta:
         db_table = "home"
         verbose_name = _("home")
@@ -253,6 +371,19 @@ class Home(models.Model):
     def get_absolute_url(self):
         return reverse("home-detail-view", kwargs={"url_uuid": self.url_uuid})
 
+    def clear_cached_metrics(self) -> None:
+        """Discards the memoized metrics so they are recomputed on next
+        access."""
+        for metric in self.CACHED_METRICS:
+            self.__dict__.pop(metric, None)
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        """Reloads the home from the database and discards the memoized
+        metrics."""
+        super().refresh_from_db(*args, **kwargs)
+
+        self.clear_cached_metrics()
+
     @property
     def members(self) -> QuerySet[user_model]:
         """Returns a QuerySet of all members of this home."""
@@ -284,26 +415,73 @@ class Home(models.Model):
             residencies__move_out__isnull=True,
         ).order_by("first_name")
 
-    @property
+    @cached_property
     def current_residents_with_recent_activity_metadata(self):
-        current_residents = self.current_residents.all()
-
-        date_range = _generate_date_range(WEEK_DAYS)
-        df_combinations = _create_resident_date_combinations(
-            current_residents,
-            date_range,
+        """Returns all current residents with their daily activity over the
+        past week."""
+        return self.get_resident_activity_grid()
+
+    def get_resident_activity_grid(
+        self,
+        days: int = WEEK_DAYS,
+        cursor: str | None = None,
+        page_size: int | None = None,
+    ) -> dict:
+        """Returns current residents with their daily activity over the past
+        days, optionally one page of residents at a time.
+
+        Uses one query for the residents on the page, annotated with their
+        activity level, and one grouped query for their activity counts, so
+        the work grows with residents on the page times days.
+
+        Args:
+        days (int): Number of days in the grid, ending today.
+        cursor (str | None): The `next_cursor` of the previous page. The
+            first page is returned if the cursor is missing or invalid.
+        page_size (int | None): Maximum number of residents on the page, or
+            None for all current residents.
+
+        Returns:
+        dict: The grid from `_build_resident_activity_grid`, with the number
+            of `days` and the `next_cursor`, which is None on the last page.
+        """
+        current_residents = self.current_residents.with_activity_level().order_by(
+            "first_name",
+            "id",
         )
-        df_activities = _get_resident_activities(current_residents, date_range)
 
-        result = _merge_and_annotate(df_combinations, df_activities)
-        pivot_result = _pivot_resident_data(result)
-        structured_data = _structure_resident_data(
-            pivot_result,
+        cursor_filter = _load_resident_activity_grid_cursor(cursor)
+        if cursor_filter is not None:
+            current_residents = current_residents.filter(cursor_filter)
+
+        next_cursor = None
+        if page_size is None:
+            current_residents = list(current_residents)
+        else:
+            # Fetch one extra resident to know whether there is a next page
+            current_residents = list(current_residents[: page_size + 1])
+
+            if len(current_residents) > page_size:
+                current_residents = current_residents[:page_size]
+                next_cursor = _dump_resident_activity_grid_cursor(
+                    current_residents[-1],
+                )
+
+        date_range = _generate_date_range(days)
+        activity_counts = _get_resident_activity_counts_by_date(
             current_residents,
             date_range,
         )
 
-        return structured_data
+        return {
+            **_build_resident_activity_grid(
+                current_residents,
+                activity_counts,
+                date_range,
+            ),
+            "days": days,
+            "next_cursor": next_cursor,
+        }
 
     @property
     def residents_with_recent_activity_counts(self) -> QuerySet["Resident"]:
@@ -318,122 +496,80 @@ class Home(models.Model):
 
         # Annotate each resident with a count of recent activities
         residents_with_activities = current_residents.annotate(
-            recent_activity_count=Count(
-                "resident_activities",
-                filter=Q(
-                    resident_activities__activity_date__gte=a_week_ago,
-                    resident_activities__activity_date__lte=today,
+            recent_activity_count=Coalesce(
+                Sum(
+                    "daily_activities__activity_count",
+                    filter=Q(
+                        daily_activities__activity_date__gte=a_week_ago,
+                        daily_activities__activity_date__lte=today,
+                    ),
                 ),
+                0,
             ),
         )
 
         return residents_with_activities
 
-    @property
+    @cached_property
     def resident_counts_by_activity_level(self) -> dict[str, int]:
         """Returns a dictionary of counts of residents by activity level."""
 
-        annotated_residents = self.residents_with_recent_activity_counts
+        return self.residents_with_recent_activity_counts.aggregate(
+            total_count=Count("id"),
+            **_get_activity_level_count_aggregates("recent_activity_count"),
+        )
 
-        # Initialize counts
-        activity_counts = {
-            "total_count": annotated_residents.count(),
-            "inactive_count": 0,
-            "low_active_count": 0,
-            "good_active_count": 0,
-            "high_active_count": 0,
-        }
+    @cached_property
+    def resident_percents_by_activity_level(self) -> dict[str, int]:
+        """Returns the resident counts by activity level annotated with a
+        percent."""
+        return _get_resident_percents_by_activity_level(
+            [self.resident_counts_by_activity_level],
+        )[0]
+
+    @property
+    def work_totals(self) -> "WorkTotals":
+        """Returns the work hours of the home by work type, caregiver role
+        and time bucket, computed in one pass over the work.
+
+        The totals are memoized like the cached metrics. Charts of the home
+        that are prepared concurrently wait for the first one to compute
+        them, instead of each computing them. The totals are also cached
+        until the work of the home changes, so the charts that are fetched
+        in separate requests share them too.
+        """
+        from work.queries import get_work_totals
 
-        # Categorize each resident into an activity level
-        # and increment the appropriate count
-        for resident in annotated_residents:
-            activity_count = resident.recent_activity_count
+        lock = self.__dict__.setdefault("_work_totals_lock", threading.Lock())
 
-            if activity_count in WEEKLY_ACTIVITY_RANGES["inactive"]["range"]:
-                activity_counts["inactive_count"] += 1
-            elif activity_count in WEEKLY_ACTIVITY_RANGES["low"]["range"]:
-                activity_counts["low_active_count"] += 1
-            elif activity_count in WEEKLY_ACTIVITY_RANGES["good"]["range"]:
-                activity_counts["good_active_count"] += 1
-            elif activity_count in WEEKLY_ACTIVITY_RANGES["high"]["range"]:
-                activity_counts["high_active_count"] += 1
+        with lock:
+            if "work_totals" not in self.__dict__:
+                self.__dict__["work_totals"] = get_cached_chart_data(
+                    "work_totals",
+                    "home",
+                    self.id,
+                    lambda: get_work_totals(self.work_performed.all()),
+                )
 
-        return activity_counts
+        return self.__dict__["work_totals"]
 
-    def get_resident_percents_by_activity_level_normalized(self) -> dict[str, float]:
+    @cached_property
+    def work_percents_by_caregiver_role(self) -> list[dict]:
+        """Returns the work hours by caregiver role, with each role's percent
+        of the home's work hours, ordered by role name."""
+        return get_home_total_hours_by_role_with_percent(self.id)
+
+    def get_resident_percents_by_activity_level_normalized(self) -> dict[str, int]:
         """Returns the resident counts by activity level annotated with a
         percent.
 
-        The percent values, when rounded to the nearest integer, should
-        sum to 100.
+        The percent values are integers that sum to 100, or are all zero
+        when the home has no current residents.
         """
+        # Copy the memoized percents, so callers can modify the result
+        return dict(self.resident_percents_by_activity_level)
 
-        activity_counts = self.resident_counts_by_activity_level
-
-        if activity_counts["total_count"] != 0:
-            # Calculate raw percentages
-            raw_percents = np.array(
-                [
-                    (activity_counts["inactive_count"] / activity_counts["total_count"])
-                    * 100,
-                    (
-                        activity_counts["low_active_count"]
-                        / activity_counts["total_count"]
-                    )
-                    * 100,
-                    (
-                        activity_counts["good_active_count"]
-                        / activity_counts["total_count"]
-                    )
-                    * 100,
-                    (
-                        activity_counts["high_active_count"]
-                        / activity_counts["total_count"]
-                    )
-                    * 100,
-                ],
-            )
-
-            # Round the percentages
-            rounded_percents = np.round(raw_percents).astype(int)
-
-            # Adjust the rounded percentages to sum up to 100
-            while rounded_percents.sum() != 100:
-                difference = 100 - rounded_percents.sum()
-                indices = np.argsort(
-                    raw_percents - rounded_percents,
-                )  # Get indices to adjust based on largest fractional parts
-                for index in indices:
-                    should_increment = (
-                        difference > 0 and rounded_percents[index] < raw_percents[index]
-                    )
-                    should_decrement = (
-                        difference < 0 and rounded_percents[index] > raw_percents[index]
-                    )
-
-                    if should_increment or should_decrement:
-                        rounded_percents[index] += np.sign(difference)
-                        if rounded_percents.sum() == 100:
-                            break
-
-            # Update the activity_counts dictionary with the adjusted percentages
-            keys = [
-                "inactive_percent",
-                "low_active_percent",
-                "good_active_percent",
-                "high_active_percent",
-            ]
-            for key, value in zip(keys, rounded_percents):
-                activity_counts[key] = value
-        else:
-            activity_counts["inactive_percent"] = 0
-            activity_counts["low_active_percent"] = 0
-            activity_counts["good_active_percent"] = 0
-            activity_counts["high_active_percent"] = 0
-
-        return activity_counts
-
-    @property
+    @cached_property
     def resident_counts_by_activity_level_chart_data(self) -> list[dict]:
         """Returns a list of dictionaries of counts of residents by activity
         level."""
@@ -1,11 +1,21 @@
+from collections import defaultdict
 from datetime import timedelta
 from django.db import connection
 from django.db.models import Sum, Value
 from django.db.models.functions import Concat, TruncMonth
 from django.utils import timezone
-import pandas as pd
 
-from core.constants import HOUR_MINUTES, YEAR_DAYS
+from core.constants import (
+    ACTIVITY_LEVEL_COUNT_KEYS,
+    HOUR_MINUTES,
+    WEEK_DAYS,
+    WEEKLY_ACTIVITY_RANGES,
+    YEAR_DAYS,
+)
+from homes.materialized_views import (
+    WORK_HOURS_BY_CAREGIVER_ROLE_VIEW,
+    materialized_views_enabled,
+)
 
 
 def dictfetchall(cursor):
@@ -15,114 +25,142 @@ def dictfetchall(cursor):
     return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
 
-def get_daily_total_hours_by_role_and_work_type_with_percent(home_id):
-    query = """
-    with daily_work_totals_by_type as (
-        select
-            date,
-            caregiver_role.name as role_name,
-            work_type.name as work_type,
-            sum(duration_minutes) / 60.0 as daily_total_hours
-        from work
-        left join work_type on type_id = work_type.id
-        left join caregiver_role on caregiver_role_id = caregiver_role.id
-        where home_id = %s
-        group by date, role_name, work_type
-    ),
-    daily_work_totals_by_type_with_role_total_hours as (
-        select
-            *,
-            sum(daily_total_hours) over (partition by date, role_name) as daily_role_total_hours
-        from daily_work_totals_by_type
-    )
-
-    select
-        *,
-        CAST(daily_total_hours as float) / CAST(daily_role_total_hours as float) as percent_of_daily_role_total_hours
-    from daily_work_totals_by_type_with_role_total_hours;
-    """
+def get_home_total_hours_by_role_with_percent(home_id):
+    return get_total_hours_by_role_with_percent_for_homes([home_id]).get(home_id, [])
 
-    with connection.cursor() as cursor:
-        cursor.execute(query, [home_id])
 
-        result = dictfetchall(cursor)
+def get_total_hours_by_role_with_percent_for_homes(home_ids) -> dict[int, list]:
+    """Returns the work hours by caregiver role, with each role's percent of
+    the home's work hours, for each of the given homes, computed in one
+    query.
 
-    return result
+    The roles of each home are ordered by name. Homes without work are
+    omitted. The totals are read from the home_work_hours_by_caregiver_role
+    materialized view when it is enabled.
+    """
+    if not home_ids:
+        return {}
 
+    home_id_placeholders = ", ".join(["%s"] * len(home_ids))
 
-def get_total_hours_by_role_and_work_type_with_percent(home_id):
-    query = """
-    with work_totals_by_type as (
+    if materialized_views_enabled():
+        query = f"""
         select
-            caregiver_role.name as role_name,
-            work_type.name as work_type,
-            sum(duration_minutes) / 60.0 as total_hours
-        from work
-        left join work_type on type_id = work_type.id
-        left join caregiver_role on caregiver_role_id = caregiver_role.id
-        where home_id = %s
-        group by role_name, work_type
-    ),
-    work_totals_by_type_with_role_total_hours as (
+            home_id,
+            role_name,
+            total_hours,
+            percent_of_role_total_hours
+        from {WORK_HOURS_BY_CAREGIVER_ROLE_VIEW}
+        where home_id in ({home_id_placeholders})
+        order by home_id, role_name;
+        """
+    else:
+        query = f"""
+        with work_totals_by_caregiver_role as (
+            select
+                work.home_id,
+                caregiver_role.name as role_name,
+                CAST(sum(duration_minutes) / 60.0 as FLOAT) as total_hours
+            from work
+            left join caregiver_role on caregiver_role_id = caregiver_role.id
+            where work.home_id in ({home_id_placeholders})
+            group by work.home_id, role_name
+        )
+
         select
             *,
-            sum(total_hours) over (partition by role_name) as role_total_hours
-        from work_totals_by_type
-    )
-
-    select
-        *,
-        CAST(total_hours as float) / CAST(role_total_hours as float) as percent_of_role_total_hours
-    from work_totals_by_type_with_role_total_hours;
-    """
+            (
+                total_hours / SUM(total_hours) over (partition by home_id)
+            ) as percent_of_role_total_hours
+        from work_totals_by_caregiver_role
+        order by home_id, role_name;
+        """
 
     with connection.cursor() as cursor:
-        cursor.execute(query, [home_id])
+        cursor.execute(query, list(home_ids))
 
         result = dictfetchall(cursor)
 
-    return result
+    total_hours_by_home = defaultdict(list)
+    for row in result:
+        total_hours_by_home[row.pop("home_id")].append(row)
 
+    return dict(total_hours_by_home)
 
-def get_home_total_hours_by_role_with_percent(home_id):
-    query = """
-    with work_totals_by_caregiver_role as (
+
+def get_resident_counts_by_activity_level_for_homes(home_ids) -> dict[int, dict]:
+    """Returns the counts of current residents by activity level for each of
+    the given homes, computed in one grouped query.
+
+    Homes without current residents are omitted.
+    """
+    if not home_ids:
+        return {}
+
+    today = timezone.localdate()
+    a_week_ago = today - timedelta(days=WEEK_DAYS)
+
+    activity_level_counts = ",\n".join(
+        f"""sum(
+            case when recent_activity_count between %s and %s then 1 else 0 end
+        ) as {count_key}"""
+        for count_key in ACTIVITY_LEVEL_COUNT_KEYS.values()
+    )
+    home_id_placeholders = ", ".join(["%s"] * len(home_ids))
+
+    query = f"""
+    with recent_activity_counts_by_resident as (
         select
-            home.name as home_name,
-            caregiver_role.name as role_name,
-            CAST(sum(duration_minutes) / 60.0 as FLOAT) as total_hours
-        from work
-        left join home on home_id = home.id
-        left join caregiver_role on caregiver_role_id = caregiver_role.id
-        where home_id = %s
-        group by home_name, role_name
+            residency.home_id,
+            coalesce(sum(resident_daily_activity.activity_count), 0) as recent_activity_count
+        from residency
+        left join resident_daily_activity
+            on resident_daily_activity.resident_id = residency.resident_id
+            and resident_daily_activity.activity_date between %s and %s
+        where residency.move_out is null
+            and residency.home_id in ({home_id_placeholders})
+        group by residency.id, residency.home_id
     )
 
     select
-        *,
-        (total_hours / SUM(total_hours) over ()) as percent_of_role_total_hours
-    from work_totals_by_caregiver_role;
+        home_id,
+        count(*) as total_count,
+        {activity_level_counts}
+    from recent_activity_counts_by_resident
+    group by home_id;
     """
 
+    activity_level_bounds = [
+        bound
+        for level in ACTIVITY_LEVEL_COUNT_KEYS
+        for bound in (
+            WEEKLY_ACTIVITY_RANGES[level]["min_inclusive"],
+            WEEKLY_ACTIVITY_RANGES[level]["max_inclusive"],
+        )
+    ]
+
     with connection.cursor() as cursor:
-        cursor.execute(query, [home_id])
+        cursor.execute(
+            query,
+            [a_week_ago, today, *home_ids, *activity_level_bounds],
+        )
 
         result = dictfetchall(cursor)
 
-    return result
+    return {row.pop("home_id"): row for row in result}
 
 
-def home_monthly_activity_hours_by_type(home) -> pd.DataFrame:
+def home_monthly_activity_hours_by_type(home) -> list[dict]:
     """Returns a list of dictionaries of hours of activities grouped by month
     and type."""
 
-    from metrics.models import ResidentActivity
+    from metrics.models import ResidentDailyActivity
 
     today = timezone.now()
     one_year_ago = today - timedelta(days=YEAR_DAYS)
 
     activities = (
-        ResidentActivity.objects.filter(
+        ResidentDailyActivity.objects.filter(
             activity_date__gte=one_year_ago,
             home=home,
         )
@@ -134,20 +172,20 @@ def home_monthly_activity_hours_by_type(home) -> pd.DataFrame:
         .annotate(activity_hours=Sum("activity_minutes") / HOUR_MINUTES)
     )
 
-    return pd.DataFrame(list(activities))
+    return list(activities)
 
 
-def home_monthly_activity_hours_by_caregiver_role(home) -> pd.DataFrame:
-    """Returns a DataFrame of hours of activities grouped by month and
+def home_monthly_activity_hours_by_caregiver_role(home) -> list[dict]:
+    """Returns a list of dictionaries of hours of activities grouped by month and
     caregiver role."""
 
-    from metrics.models import ResidentActivity
+    from metrics.models import ResidentDailyActivity
 
     today = timezone.now()
     one_year_ago = today - timedelta(days=YEAR_DAYS)
 
     activities = (
-        ResidentActivity.objects.filter(
+        ResidentDailyActivity.objects.filter(
             activity_date__gte=one_year_ago,
             home=home,
         )
@@ -159,20 +197,20 @@ def home_monthly_activity_hours_by_caregiver_role(home) -> pd.DataFrame:
         .annotate(activity_hours=Sum("activity_minutes") / HOUR_MINUTES)
     )
 
-    return pd.DataFrame(list(activities))
+    return list(activities)
 
 
-def home_activity_hours_by_resident_and_type(home) -> pd.DataFrame:
-    """Returns a DataFrame of hours of activities grouped by resident and
+def home_activity_hours_by_resident_and_type(home) -> list[dict]:
+    """Returns a list of dictionaries of hours of activities grouped by resident and
     activity type."""
 
-    from metrics.models import ResidentActivity
+    from metrics.models import ResidentDailyActivity
 
     today = timezone.now()
     one_year_ago = today - timedelta(days=YEAR_DAYS)
 
     activities = (
-        ResidentActivity.objects.filter(
+        ResidentDailyActivity.objects.filter(
             activity_date__gte=one_year_ago,
             home=home,
         )
@@ -188,4 +226,4 @@ def home_activity_hours_by_resident_and_type(home) -> pd.DataFrame:
         .annotate(activity_hours=Sum("activity_minutes") / HOUR_MINUTES)
     )
 
-    return pd.DataFrame(list(activities))
+    return list(activities)
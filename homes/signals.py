@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.chart_cache import bump_chart_data_version
+
+from .models import Home, HomeUserRelation
+
+
+@receiver(post_save, sender=Home)
+def bump_chart_data_version_on_home_save(sender, instance, **kwargs):
+    """Invalidate the cached charts of a home, which show its name."""
+    bump_chart_data_version("home", [instance.id])
+
+
+@receiver(post_save, sender=HomeUserRelation)
+@receiver(post_delete, sender=HomeUserRelation)
+def bump_chart_data_version_on_home_user_relation_change(sender, instance, **kwargs):
+    """Invalidate the cached charts of a home when its users change."""
+    bump_chart_data_version("home", [instance.home_id])
@@ -0,0 +1,31 @@
+from django import template
+
+from common.charts import render_percent_bar_svg
+
+register = template.Library()
+
+# Fill classes of the WEEKLY_ACTIVITY_RANGES color classes
+ACTIVITY_LEVEL_FILL_CLASSES = {
+    "success": "fill-success",
+    "warning": "fill-warning",
+    "danger": "fill-error",
+}
+
+
+@register.filter(name="activity_percent_bar")
+def activity_percent_bar(chart_data):
+    """Returns a bar showing the percent of residents at each activity
+    level, from Home.resident_counts_by_activity_level_chart_data."""
+    return render_percent_bar_svg(
+        [
+            {
+                "label": item["activity_level_label"],
+                "percent": item["value"],
+                "fill_class": ACTIVITY_LEVEL_FILL_CLASSES.get(
+                    item["activity_level_class"],
+                    "fill-info",
+                ),
+            }
+            for item in chart_data
+        ],
+    )
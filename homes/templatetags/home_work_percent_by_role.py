@@ -1,6 +1,6 @@
 from django import template
 
-from homes.charts import prepare_home_work_percent_by_caregiver_role_chart
+from homes.charts import render_home_work_percent_by_caregiver_role_bar
 
 register = template.Library()
 
@@ -8,7 +8,10 @@ register = template.Library()
 @register.filter(name="work_percent_by_role_chart")
 def work_percent_by_role_chart(home):
     """Returns a chart showing the proportion of work carried out by each role
-    for the given home."""
-    chart = prepare_home_work_percent_by_caregiver_role_chart(home)
+    for the given home.
 
-    return chart
+    Views listing several homes should prefetch the percents with
+    prefetch_work_percents_by_caregiver_role, so that the filter does not
+    query the database per home.
+    """
+    return render_home_work_percent_by_caregiver_role_bar(home)
@@ -1,24 +1,54 @@
 from datetime import date, timedelta
 from http import HTTPStatus
 from io import StringIO
+from unittest import mock
+from django.conf import settings
 from django.core.management import call_command
 
 from django.core.management.base import CommandError
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from core.constants import WEEKLY_ACTIVITY_RANGES
+from caregivers.factories import CaregiverRoleFactory
+from homes.benchmarks import current_residents_with_recent_activity_metadata_pandas
+from homes.charts import HOME_WORK_CHARTS
 from homes.forms import AddCaregiverForm
+from homes.materialized_views import (
+    MATERIALIZED_VIEWS,
+    WORK_HOURS_BY_CAREGIVER_ROLE_VIEW,
+    materialized_views_enabled,
+    refresh_materialized_views,
+)
+from homes.queries import (
+    get_home_total_hours_by_role_with_percent,
+    get_resident_counts_by_activity_level_for_homes,
+    get_total_hours_by_role_with_percent_for_homes,
+    home_monthly_activity_hours_by_caregiver_role,
+    home_monthly_activity_hours_by_type,
+)
+from homes.templatetags.home_work_percent_by_role import work_percent_by_role_chart
 from homes.views import HomeUserRelationListView
 from metrics.factories import ResidentActivityFactory
-from metrics.models import ResidentActivity
+from metrics.models import ResidentActivity, ResidentDailyActivity
 from residents.models import Residency, Resident
 
 from .factories import HomeFactory, HomeGroupFactory, HomeUserRelationFactory
-from .models import Home, HomeGroup, HomeUserRelation
+from .models import (
+    Home,
+    HomeGroup,
+    HomeUserRelation,
+    prefetch_resident_counts_by_activity_level,
+    prefetch_work_percents_by_caregiver_role,
+)
 from residents.factories import ResidentFactory, ResidencyFactory
+from work.csv_import import WorkCsvImporter
+from work.queries import get_work_totals
+from work.factories import WorkFactory, WorkTypeFactory
 
 User = get_user_model()
 
@@ -165,6 +195,30 @@ class HomeModelTests(TestCase):
             expected_resident_counts_by_activity_level,
         )
 
+    def test_home_resident_counts_by_activity_level_single_query(self):
+        with self.assertNumQueries(1):
+            self.home1.resident_counts_by_activity_level
+
+    def test_home_resident_counts_by_activity_level_high(self):
+        for _ in range(WEEKLY_ACTIVITY_RANGES["high"]["min_inclusive"]):
+            ResidentActivityFactory(
+                resident=self.home_1_current_resident_low_active,
+                activity_date=timezone.now(),
+                home=self.home1,
+                residency=self.home_1_current_resident_low_active_residency,
+            )
+
+        self.assertEqual(
+            self.home1.resident_counts_by_activity_level,
+            {
+                "total_count": 3,
+                "inactive_count": 1,
+                "low_active_count": 0,
+                "good_active_count": 1,
+                "high_active_count": 1,
+            },
+        )
+
     def test_get_resident_percents_by_activity_level_normalized(self):
         home1_resident_percents_by_activity_level_normalized = (
             self.home1.get_resident_percents_by_activity_level_normalized()
@@ -230,6 +284,302 @@ class HomeModelTests(TestCase):
         self.assertEqual(values_sum, expected_values_sum)
 
 
+class PrefetchResidentCountsByActivityLevelTest(TestCase):
+    def setUp(self):
+        self.homes = [HomeFactory() for _ in range(3)]
+
+        # Home 0: one inactive and one low active resident
+        # Home 1: one moderately active resident
+        # Home 2: no residents
+        for home, activity_counts in zip(self.homes, [[0, 2], [6]]):
+            for activity_count in activity_counts:
+                residency = ResidencyFactory(home=home, resident=ResidentFactory())
+                for _ in range(activity_count):
+                    ResidentActivityFactory(
+                        resident=residency.resident,
+                        residency=residency,
+                        home=home,
+                        activity_date=timezone.now(),
+                    )
+
+    def test_matches_per_home_counts(self):
+        expected_counts = [
+            Home.objects.get(id=home.id).resident_counts_by_activity_level
+            for home in self.homes
+        ]
+
+        homes = prefetch_resident_counts_by_activity_level(
+            Home.objects.filter(id__in=[home.id for home in self.homes]).order_by(
+                "id",
+            ),
+        )
+
+        self.assertEqual(
+            [home.resident_counts_by_activity_level for home in homes],
+            expected_counts,
+        )
+
+    def test_matches_per_home_percents(self):
+        expected_percents = [
+            Home.objects.get(
+                id=home.id,
+            ).get_resident_percents_by_activity_level_normalized()
+            for home in self.homes
+        ]
+
+        homes = prefetch_resident_counts_by_activity_level(
+            Home.objects.filter(id__in=[home.id for home in self.homes]).order_by(
+                "id",
+            ),
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [
+                    home.get_resident_percents_by_activity_level_normalized()
+                    for home in homes
+                ],
+                expected_percents,
+            )
+
+    def test_single_query(self):
+        homes = list(Home.objects.all())
+
+        with self.assertNumQueries(1):
+            prefetch_resident_counts_by_activity_level(homes)
+
+            for home in homes:
+                home.resident_counts_by_activity_level_chart_data
+
+    def test_no_homes(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(prefetch_resident_counts_by_activity_level([]), [])
+
+
+class PrefetchWorkPercentsByCaregiverRoleTest(TestCase):
+    def setUp(self):
+        self.homes = [HomeFactory() for _ in range(3)]
+        nurse = CaregiverRoleFactory(name="Nurse")
+        volunteer = CaregiverRoleFactory(name="Volunteer")
+
+        # Home 0: work by both roles
+        # Home 1: work by one role
+        # Home 2: no work
+        WorkFactory(home=self.homes[0], caregiver_role=volunteer, duration_minutes=30)
+        WorkFactory(home=self.homes[0], caregiver_role=nurse, duration_minutes=90)
+        WorkFactory(home=self.homes[1], caregiver_role=nurse, duration_minutes=60)
+
+    def test_matches_per_home_percents(self):
+        expected_percents = [
+            Home.objects.get(id=home.id).work_percents_by_caregiver_role
+            for home in self.homes
+        ]
+
+        homes = prefetch_work_percents_by_caregiver_role(
+            Home.objects.filter(id__in=[home.id for home in self.homes]).order_by(
+                "id",
+            ),
+        )
+
+        self.assertEqual(
+            [home.work_percents_by_caregiver_role for home in homes],
+            expected_percents,
+        )
+        self.assertEqual(
+            homes[0].work_percents_by_caregiver_role,
+            [
+                {
+                    "role_name": "Nurse",
+                    "total_hours": 1.5,
+                    "percent_of_role_total_hours": 0.75,
+                },
+                {
+                    "role_name": "Volunteer",
+                    "total_hours": 0.5,
+                    "percent_of_role_total_hours": 0.25,
+                },
+            ],
+        )
+        self.assertEqual(homes[2].work_percents_by_caregiver_role, [])
+
+    def test_single_query(self):
+        homes = list(Home.objects.all())
+
+        with self.assertNumQueries(1):
+            prefetch_work_percents_by_caregiver_role(homes)
+
+            for home in homes:
+                work_percent_by_role_chart(home)
+
+    def test_no_homes(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(prefetch_work_percents_by_caregiver_role([]), [])
+
+
+class MaterializedViewsTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory()
+        self.other_home = HomeFactory()
+        nurse = CaregiverRoleFactory(name="Nurse")
+        volunteer = CaregiverRoleFactory(name="Volunteer")
+
+        WorkFactory(home=self.home, caregiver_role=volunteer, duration_minutes=30)
+        WorkFactory(home=self.home, caregiver_role=nurse, duration_minutes=90)
+        WorkFactory(home=self.other_home, caregiver_role=nurse, duration_minutes=45)
+
+    def test_migration_creates_view(self):
+        if connection.vendor != "postgresql":
+            self.skipTest(f"No materialized views on {connection.vendor}")
+
+        with connection.cursor() as cursor:
+            cursor.execute("select matviewname from pg_matviews;")
+            view_names = {row[0] for row in cursor.fetchall()}
+            cursor.execute(
+                "select indexdef from pg_indexes where tablename = %s;",
+                [WORK_HOURS_BY_CAREGIVER_ROLE_VIEW],
+            )
+            index_definitions = [row[0] for row in cursor.fetchall()]
+
+        self.assertLessEqual(set(MATERIALIZED_VIEWS), view_names)
+        # Concurrent refreshes need a unique index
+        self.assertEqual(len(index_definitions), 1)
+        self.assertIn("UNIQUE INDEX", index_definitions[0])
+
+    @override_settings(HOMES_MATERIALIZED_VIEWS=True)
+    def test_view_matches_live_query(self):
+        if connection.vendor != "postgresql":
+            self.skipTest(f"No materialized views on {connection.vendor}")
+
+        self.assertTrue(materialized_views_enabled())
+        self.assertEqual(refresh_materialized_views(), MATERIALIZED_VIEWS)
+        home_ids = [self.home.id, self.other_home.id]
+
+        with override_settings(HOMES_MATERIALIZED_VIEWS=False):
+            live_totals = get_total_hours_by_role_with_percent_for_homes(home_ids)
+
+        view_totals = get_total_hours_by_role_with_percent_for_homes(home_ids)
+
+        self.assertEqual(view_totals, live_totals)
+        self.assertEqual(
+            view_totals[self.other_home.id],
+            [
+                {
+                    "role_name": "Nurse",
+                    "total_hours": 0.75,
+                    "percent_of_role_total_hours": 1.0,
+                },
+            ],
+        )
+
+    def test_refreshed_by_bulk_paths_only(self):
+        with mock.patch("work.models.refresh_materialized_views") as refresh:
+            WorkFactory(home=self.home)
+            refresh.assert_not_called()
+
+            call_command("rebuild_work_daily_total", stdout=StringIO())
+            refresh.assert_called_once_with()
+
+        WorkTypeFactory(name="Cooking")
+        with mock.patch("work.csv_import.refresh_materialized_views") as refresh:
+            WorkCsvImporter().run(
+                StringIO(
+                    "home,date,type,caregiver_role,duration_minutes\n"
+                    f"{self.home.url_uuid},2024-01-01,Cooking,Nurse,30\n",
+                ),
+            )
+            refresh.assert_called_once_with()
+
+    def test_disabled_by_default(self):
+        self.assertFalse(settings.HOMES_MATERIALIZED_VIEWS)
+        self.assertFalse(materialized_views_enabled())
+
+    @override_settings(HOMES_MATERIALIZED_VIEWS=False)
+    def test_disabled_falls_back_to_live_query(self):
+        self.assertFalse(materialized_views_enabled())
+        self.assertEqual(refresh_materialized_views(), [])
+        self.assertEqual(
+            get_home_total_hours_by_role_with_percent(self.home.id),
+            [
+                {
+                    "role_name": "Nurse",
+                    "total_hours": 1.5,
+                    "percent_of_role_total_hours": 0.75,
+                },
+                {
+                    "role_name": "Volunteer",
+                    "total_hours": 0.5,
+                    "percent_of_role_total_hours": 0.25,
+                },
+            ],
+        )
+
+        out = StringIO()
+        call_command("refresh_materialized_views", stdout=out)
+
+        self.assertIn("Materialized views are not enabled", out.getvalue())
+
+
+class HomeCachedMetricsTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory()
+        self.resident = ResidentFactory()
+        self.residency = ResidencyFactory(home=self.home, resident=self.resident)
+
+    def test_metrics_are_computed_once(self):
+        for metric in Home.CACHED_METRICS:
+            with self.subTest(metric=metric):
+                getattr(self.home, metric)
+
+                with self.assertNumQueries(0):
+                    getattr(self.home, metric)
+
+    def test_clear_cached_metrics(self):
+        self.assertEqual(
+            self.home.resident_counts_by_activity_level["inactive_count"],
+            1,
+        )
+
+        ResidentActivityFactory(
+            resident=self.resident,
+            residency=self.residency,
+            home=self.home,
+            activity_date=timezone.now(),
+        )
+
+        # The memoized value is unchanged until it is invalidated
+        self.assertEqual(
+            self.home.resident_counts_by_activity_level["inactive_count"],
+            1,
+        )
+
+        self.home.clear_cached_metrics()
+
+        self.assertEqual(
+            self.home.resident_counts_by_activity_level["inactive_count"],
+            0,
+        )
+        self.assertEqual(
+            self.home.resident_counts_by_activity_level["low_active_count"],
+            1,
+        )
+
+    def test_refresh_from_db_clears_cached_metrics(self):
+        self.home.current_residents_with_recent_activity_metadata
+
+        self.home.refresh_from_db()
+
+        for metric in Home.CACHED_METRICS:
+            self.assertNotIn(metric, self.home.__dict__)
+
+    def test_percents_do_not_modify_cached_counts(self):
+        self.home.get_resident_percents_by_activity_level_normalized()
+
+        self.assertNotIn(
+            "inactive_percent",
+            self.home.resident_counts_by_activity_level,
+        )
+
+
 class MakeHomeTest(TestCase):
     def test_home_count(self):
         out = StringIO()
@@ -330,6 +680,199 @@ class CurrentResidentsWithRecentActivityMetadataTest(TestCase):
             )
             self.assertTrue(day_data["was_active"])  # Assuming activity every day
 
+    def test_current_residents_with_recent_activity_metadata_queries(self):
+        """The resident grid is built from one residents query and one
+        grouped activity query, regardless of the number of residents."""
+        ResidencyFactory.create(home=self.home, resident=ResidentFactory.create())
+        ResidencyFactory.create(home=self.home, resident=ResidentFactory.create())
+
+        with self.assertNumQueries(2):
+            data = self.home.current_residents_with_recent_activity_metadata
+
+        self.assertEqual(len(data["residents"]), 3)
+
+    def test_current_residents_with_recent_activity_metadata_inactive_resident(
+        self,
+    ):
+        inactive_resident = ResidentFactory.create()
+        ResidencyFactory.create(home=self.home, resident=inactive_resident)
+
+        data = self.home.current_residents_with_recent_activity_metadata
+
+        inactive_resident_data = next(
+            resident_data
+            for resident_data in data["residents"]
+            if resident_data["resident"] == inactive_resident
+        )
+        self.assertEqual(inactive_resident_data["total_activity_count"], 0)
+        self.assertEqual(inactive_resident_data["total_active_days"], 0)
+        self.assertEqual(len(inactive_resident_data["recent_activity_days"]), 7)
+        self.assertFalse(
+            any(
+                day_data["was_active"]
+                for day_data in inactive_resident_data["recent_activity_days"]
+            ),
+        )
+
+    def test_matches_pandas_implementation(self):
+        ResidencyFactory.create(home=self.home, resident=ResidentFactory.create())
+
+        data = self.home.current_residents_with_recent_activity_metadata
+        pandas_data = current_residents_with_recent_activity_metadata_pandas(
+            self.home,
+        )
+
+        self.assertEqual(data["start_date"], pandas_data["start_date"])
+        self.assertEqual(data["end_date"], pandas_data["end_date"])
+
+        pandas_residents = {
+            resident_data["resident"]: resident_data
+            for resident_data in pandas_data["residents"]
+        }
+        for resident_data in data["residents"]:
+            pandas_resident_data = pandas_residents[resident_data["resident"]]
+
+            self.assertEqual(
+                resident_data["total_activity_count"],
+                pandas_resident_data["total_activity_count"],
+            )
+            self.assertEqual(
+                resident_data["total_active_days"],
+                pandas_resident_data["total_active_days"],
+            )
+            self.assertEqual(
+                [
+                    (day["date"], bool(day["was_active"]))
+                    for day in resident_data["recent_activity_days"]
+                ],
+                [
+                    (day["date"], bool(day["was_active"]))
+                    for day in pandas_resident_data["recent_activity_days"]
+                ],
+            )
+
+
+class ResidentActivityGridTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory()
+        self.residents = [
+            ResidentFactory(first_name=first_name, last_initial=last_initial)
+            for first_name, last_initial in [
+                ("Anna", "A"),
+                ("Bert", "B"),
+                ("Bert", "C"),
+                ("Cleo", "D"),
+                ("Dora", "E"),
+            ]
+        ]
+        for resident in self.residents:
+            ResidencyFactory(home=self.home, resident=resident)
+
+        # An activity 20 days ago, outside of the default one week window
+        ResidentActivityFactory(
+            resident=self.residents[0],
+            activity_date=date.today() - timedelta(days=20),
+        )
+
+    def test_window_days(self):
+        for days in [7, 14, 30, 90]:
+            with self.subTest(days=days):
+                grid = self.home.get_resident_activity_grid(days=days)
+
+                self.assertEqual(grid["days"], days)
+                self.assertEqual(
+                    grid["start_date"],
+                    date.today() - timedelta(days=days - 1),
+                )
+                self.assertEqual(
+                    len(grid["residents"][0]["recent_activity_days"]),
+                    days,
+                )
+                self.assertEqual(
+                    grid["residents"][0]["total_activity_count"],
+                    1 if days > 20 else 0,
+                )
+
+    def test_cursor_pagination(self):
+        pages = []
+        cursor = None
+        with self.assertNumQueries(6):
+            while True:
+                grid = self.home.get_resident_activity_grid(
+                    days=30,
+                    cursor=cursor,
+                    page_size=2,
+                )
+                pages.append([data["resident"] for data in grid["residents"]])
+
+                cursor = grid["next_cursor"]
+                if cursor is None:
+                    break
+
+        # Residents sharing a first name are ordered by ID
+        self.assertEqual(
+            pages,
+            [self.residents[:2], self.residents[2:4], self.residents[4:]],
+        )
+
+    def test_invalid_cursor_returns_first_page(self):
+        grid = self.home.get_resident_activity_grid(cursor="invalid", page_size=2)
+
+        self.assertEqual(
+            [data["resident"] for data in grid["residents"]],
+            self.residents[:2],
+        )
+
+    def test_detail_view_window_and_cursor(self):
+        user = User.objects.create_superuser(username="super", password="test")
+        self.client.force_login(user)
+        url = reverse("home-detail-view", kwargs={"url_uuid": self.home.url_uuid})
+
+        response = self.client.get(url, {"days": 30})
+        grid = response.context["resident_activity_grid"]
+        self.assertEqual(grid["days"], 30)
+        self.assertIsNone(grid["next_cursor"])
+        self.assertFalse(response.context["resident_activity_grid_shows_weekdays"])
+
+        # Unsupported windows fall back to one week, labeled with day names
+        response = self.client.get(url, {"days": 12})
+        self.assertEqual(response.context["resident_activity_grid"]["days"], 7)
+        self.assertTrue(response.context["resident_activity_grid_shows_weekdays"])
+
+        cursor = self.home.get_resident_activity_grid(page_size=4)["next_cursor"]
+        response = self.client.get(url, {"days": 14, "cursor": cursor})
+        self.assertEqual(
+            [
+                data["resident"]
+                for data in response.context["resident_activity_grid"]["residents"]
+            ],
+            self.residents[4:],
+        )
+
+
+class BenchmarkResidentActivityGridTest(TestCase):
+    def test_benchmark_output(self):
+        out = StringIO()
+        call_command(
+            "benchmark_resident_activity_grid",
+            residents=[5],
+            repeat=1,
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("sql", output)
+        self.assertIn("pandas", output)
+
+        # Benchmark data is rolled back
+        self.assertEqual(Home.objects.count(), 0)
+        self.assertEqual(Resident.objects.count(), 0)
+
+    def test_benchmark_invalid_repeat(self):
+        out = StringIO()
+        call_command("benchmark_resident_activity_grid", repeat=0, stdout=out)
+        self.assertIn("Invalid repeat. Please try again.", out.getvalue())
+
 
 class HomeGroupListViewTest(TestCase):
     def setUp(self):
@@ -564,6 +1107,53 @@ class HomeGroupListViewTest(TestCase):
         response = self.client.get(self.url)
         self.assertTemplateUsed(response, "homes/home_group_list.html")
 
+    def test_activity_percent_bars_are_inline_svg(self):
+        residency = ResidencyFactory(
+            home=self.home_without_group,
+            resident=ResidentFactory(),
+        )
+        ResidentActivityFactory(
+            resident=residency.resident,
+            residency=residency,
+            home=self.home_without_group,
+            activity_date=date.today(),
+        )
+        self.client.login(username="testuser", password="password")
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'class="fill-warning"', count=1)
+        self.assertContains(response, "Inactive: 0%, Low: 100%")
+        self.assertNotContains(response, "Plotly.newPlot")
+
+
+class WorkPercentByRoleChartFilterTest(TestCase):
+    def test_renders_role_percents_as_inline_svg(self):
+        home = HomeFactory()
+        nurse = CaregiverRoleFactory(name="Nurse")
+        volunteer = CaregiverRoleFactory(name="Volunteer")
+        WorkFactory(home=home, caregiver_role=volunteer, duration_minutes=30)
+        WorkFactory(home=home, caregiver_role=nurse, duration_minutes=90)
+
+        chart = work_percent_by_role_chart(home)
+
+        self.assertTrue(chart.startswith("<svg"))
+        self.assertIn('aria-label="Nurse: 75%, Volunteer: 25%"', chart)
+        self.assertIn('<rect x="75" width="25" height="1"', chart)
+        self.assertNotIn("plotly", chart.lower())
+
+    def test_renders_zero_minute_work_as_zero_percent(self):
+        home = HomeFactory()
+        WorkFactory(
+            home=home,
+            caregiver_role=CaregiverRoleFactory(name="Nurse"),
+            duration_minutes=0,
+        )
+
+        chart = work_percent_by_role_chart(home)
+
+        self.assertIn('aria-label="Nurse: 0%"', chart)
+
 
 class HomeDetailViewTests(TestCase):
     def setUp(self):
@@ -614,6 +1204,118 @@ class HomeDetailViewTests(TestCase):
         )
 
 
+class HomeChartViewTest(TestCase):
+    def setUp(self):
+        self.member_user = User.objects.create_user(username="member", password="test")
+        self.regular_user = User.objects.create_user(
+            username="regular",
+            password="test",
+        )
+
+        self.home = HomeFactory()
+        HomeUserRelationFactory(home=self.home, user=self.member_user)
+
+        residency = ResidencyFactory(home=self.home, resident=ResidentFactory())
+        ResidentActivityFactory(
+            resident=residency.resident,
+            residency=residency,
+            home=self.home,
+            activity_date=date.today(),
+        )
+        WorkFactory(home=self.home)
+
+        self.detail_url = reverse(
+            "home-detail-view",
+            kwargs={"url_uuid": self.home.url_uuid},
+        )
+
+    def get_chart_url(self, chart_name):
+        return reverse(
+            "home-chart-view",
+            kwargs={"url_uuid": self.home.url_uuid, "chart_name": chart_name},
+        )
+
+    def test_detail_view_renders_lazy_chart_placeholders(self):
+        self.client.force_login(self.member_user)
+
+        response = self.client.get(self.detail_url)
+
+        self.assertContains(response, 'class="lazy-chart"', count=8)
+        self.assertContains(response, self.get_chart_url("work_by_type_chart"))
+        self.assertNotContains(response, "Plotly.newPlot")
+
+    @override_settings(CHARTS_LAZY_LOAD=False)
+    def test_detail_view_renders_charts_eagerly(self):
+        self.client.force_login(self.member_user)
+
+        response = self.client.get(self.detail_url)
+
+        self.assertNotContains(response, 'class="lazy-chart"')
+        self.assertContains(response, "Plotly.newPlot", count=8)
+
+    def test_chart_json(self):
+        self.client.force_login(self.member_user)
+
+        for chart_name in [
+            "work_by_type_chart",
+            "work_by_caregiver_role_and_type_chart",
+            "monthly_activity_hours_by_type_chart",
+        ]:
+            with self.subTest(chart_name=chart_name):
+                response = self.client.get(self.get_chart_url(chart_name))
+
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertIn("data", response.json())
+                self.assertIn("layout", response.json())
+
+    def test_work_chart_requests_share_one_aggregation(self):
+        self.client.force_login(self.member_user)
+
+        with mock.patch(
+            "work.queries.get_work_totals",
+            wraps=get_work_totals,
+        ) as get_work_totals_mock:
+            for chart_name in HOME_WORK_CHARTS:
+                response = self.client.get(self.get_chart_url(chart_name))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        get_work_totals_mock.assert_called_once()
+
+    def test_chart_json_with_zero_minute_work(self):
+        self.client.force_login(self.member_user)
+        self.home.work_performed.all().delete()
+        WorkFactory(home=self.home, duration_minutes=0)
+
+        for chart_name in HOME_WORK_CHARTS:
+            with self.subTest(chart_name=chart_name):
+                response = self.client.get(self.get_chart_url(chart_name))
+
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_unknown_chart(self):
+        self.client.force_login(self.member_user)
+
+        response = self.client.get(self.get_chart_url("unknown_chart"))
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_chart_without_data(self):
+        self.client.force_login(self.member_user)
+        self.home.work_performed.all().delete()
+
+        response = self.client.get(self.get_chart_url("work_by_type_chart"))
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_access_denied_non_member(self):
+        self.client.force_login(self.regular_user)
+
+        response = self.client.get(self.get_chart_url("work_by_type_chart"))
+
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+
 class HomeUserRelationListViewTest(TestCase):
     def setUp(self):
         """Create a home and some users.
@@ -904,3 +1606,114 @@ class HomeUserRelationListViewTest(TestCase):
             response.url,
             self.url,
         )
+
+
+class DashboardQueryIndexTest(TestCase):
+    """Check with EXPLAIN that the dashboard queries use their indexes.
+
+    Each test runs a dashboard query, captures the SQL it executes and
+    checks the query plan of that SQL.
+    """
+
+    def setUp(self):
+        if connection.vendor not in ["sqlite", "postgresql"]:
+            self.skipTest(f"No query plan checks for {connection.vendor}")
+
+        if connection.vendor == "postgresql":
+            # The test tables are tiny, so sequential scans would win
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.home = HomeFactory()
+        self.resident = ResidentFactory()
+        ResidencyFactory(home=self.home, resident=self.resident)
+
+    def _get_query_plans(self, run_queries) -> str:
+        """Run the dashboard queries and return the query plans of the SQL
+        they executed."""
+        with CaptureQueriesContext(connection) as queries:
+            run_queries()
+
+        explain = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+        query_plans = []
+        for query in queries.captured_queries:
+            # Skip transaction and savepoint statements
+            if (
+                not query["sql"]
+                .lstrip()
+                .lower()
+                .startswith(
+                    ("select", "with", "update", "delete"),
+                )
+            ):
+                continue
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"{explain} {query['sql']}")
+                query_plans.extend(str(row) for row in cursor.fetchall())
+
+        return "\n".join(query_plans)
+
+    def assertUsesIndexes(self, run_queries, index_names):
+        query_plans = self._get_query_plans(run_queries)
+
+        for index_name in index_names:
+            with self.subTest(index_name=index_name):
+                self.assertIn(index_name, query_plans)
+
+    def test_resident_activity_grid(self):
+        self.assertUsesIndexes(
+            lambda: (
+                Home.objects.get(
+                    id=self.home.id,
+                ).current_residents_with_recent_activity_metadata
+            ),
+            ["residency_current_home", "resident_daily_act_resdnt_date"],
+        )
+
+    def test_resident_counts_by_activity_level(self):
+        self.assertUsesIndexes(
+            lambda: get_resident_counts_by_activity_level_for_homes([self.home.id]),
+            ["resident_daily_act_resdnt_date"],
+        )
+
+    def test_monthly_activity_hours(self):
+        self.assertUsesIndexes(
+            lambda: (
+                home_monthly_activity_hours_by_type(self.home),
+                home_monthly_activity_hours_by_caregiver_role(self.home),
+            ),
+            ["resident_daily_act_home_date"],
+        )
+
+    def test_home_work_totals(self):
+        self.assertUsesIndexes(
+            lambda: Home.objects.get(id=self.home.id).work_totals,
+            ["work_home_date"],
+        )
+
+    def test_home_members(self):
+        self.assertUsesIndexes(
+            lambda: list(self.home.members),
+            ["home_user_relation_home_user"],
+        )
+
+    def test_resident_recent_activity(self):
+        self.assertUsesIndexes(
+            self.resident.get_recent_activity_count,
+            ["resident_activity_resdnt_date"],
+        )
+
+    def test_daily_activity_rollup_refresh(self):
+        self.assertUsesIndexes(
+            lambda: ResidentDailyActivity.objects.refresh(
+                [(self.resident.id, self.home.id, timezone.localdate())],
+            ),
+            ["resident_activity_resdnt_date", "resident_daily_act_resdnt_date"],
+        )
+
+    def test_current_residency_refresh(self):
+        self.assertUsesIndexes(
+            Resident.objects.filter(id=self.resident.id).refresh_current_residency,
+            ["residency_current_resident"],
+        )
@@ -1,6 +1,11 @@
 from django.urls import path
 
-from .views import HomeDetailView, HomeGroupListView, HomeUserRelationListView
+from .views import (
+    HomeChartView,
+    HomeDetailView,
+    HomeGroupListView,
+    HomeUserRelationListView,
+)
 
 urlpatterns = [
     path(
@@ -8,6 +13,11 @@ urlpatterns = [
         HomeDetailView.as_view(),
         name="home-detail-view",
     ),
+    path(
+        "<str:url_uuid>/charts/<slug:chart_name>/",
+        HomeChartView.as_view(),
+        name="home-chart-view",
+    ),
     path(
         "<str:url_uuid>/caregivers/",
         HomeUserRelationListView.as_view(),
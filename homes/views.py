@@ -1,29 +1,35 @@
+from functools import partial
 from typing import Any
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views.generic.edit import FormView
 from django.views.generic.detail import DetailView
-from django.views.generic.base import TemplateView
+from django.views.generic.base import TemplateView, View
 
+from core.constants import (
+    RESIDENT_ACTIVITY_GRID_DAYS,
+    RESIDENT_ACTIVITY_GRID_PAGE_SIZE,
+    WEEK_DAYS,
+)
+from common.chart_cache import get_cached_chart
+from common.charts import prepare_charts, render_chart_html, render_lazy_chart_html
 from homes.forms import AddCaregiverForm
 
 from .charts import (
-    prepare_activity_counts_by_resident_and_activity_type_chart,
-    prepare_daily_work_percent_by_caregiver_role_and_type_chart,
-    prepare_monthly_activity_hours_by_caregiver_role_chart,
-    prepare_monthly_activity_hours_by_type_chart,
-    prepare_work_by_caregiver_role_and_type_charts,
-    prepare_work_by_caregiver_role_chart,
-    prepare_work_by_type_chart,
+    HOME_ACTIVITY_CHARTS,
+    HOME_WORK_CHARTS,
 )
-from .models import Home, HomeUserRelation
+from .models import Home, HomeUserRelation, prefetch_resident_counts_by_activity_level
 
 user_model = get_user_model()
 
@@ -59,22 +65,21 @@ class HomeGroupListView(LoginRequiredMixin, TemplateView):
         if not user.is_authenticated:
             return context
 
-        if user.is_superuser:
-            context["homes_without_group"] = Home.objects.filter(
-                home_group__isnull=True,
-            )
+        homes = Home.objects.all() if user.is_superuser else user.homes
 
-            context["homes_with_group"] = Home.objects.filter(
-                home_group__isnull=False,
-            )
-        else:
-            context["homes_without_group"] = self.request.user.homes.filter(
-                home_group__isnull=True,
-            )
+        # Compute the activity level distribution of all listed homes
+        # in one query, instead of several queries per home
+        homes = prefetch_resident_counts_by_activity_level(
+            homes.select_related("home_group"),
+        )
 
-            context["homes_with_group"] = self.request.user.homes.filter(
-                home_group__isnull=False,
-            )
+        context["homes_without_group"] = [
+            home for home in homes if home.home_group is None
+        ]
+
+        context["homes_with_group"] = [
+            home for home in homes if home.home_group is not None
+        ]
 
         home_groups_with_homes = regroup_homes_by_home_group(
             context["homes_with_group"],
@@ -113,39 +118,83 @@ class HomeDetailView(LoginRequiredMixin, DetailView):
 
         return home
 
-    def prepare_activity_charts(self, context):
-        """Prepare activity charts and add them to the template context."""
+    def get_resident_activity_grid_days(self) -> int:
+        """Return the resident activity grid window requested in the URL,
+        defaulting to one week."""
+        try:
+            days = int(self.request.GET.get("days", WEEK_DAYS))
+        except ValueError:
+            return WEEK_DAYS
+
+        return days if days in RESIDENT_ACTIVITY_GRID_DAYS else WEEK_DAYS
+
+    def prepare_resident_activity_grid(self, context):
+        """Prepare one page of the resident activity grid and add it to the
+        template context."""
         home = context["home"]
 
-        context["activity_counts_by_resident_and_activity_type_chart"] = (
-            prepare_activity_counts_by_resident_and_activity_type_chart(home)
+        context["resident_activity_grid"] = home.get_resident_activity_grid(
+            days=self.get_resident_activity_grid_days(),
+            cursor=self.request.GET.get("cursor"),
+            page_size=RESIDENT_ACTIVITY_GRID_PAGE_SIZE,
         )
-
-        context["monthly_activity_hours_by_type_chart"] = (
-            prepare_monthly_activity_hours_by_type_chart(home)
+        context["resident_activity_grid_days_options"] = RESIDENT_ACTIVITY_GRID_DAYS
+        # A week of days is labeled with day names instead of dates
+        context["resident_activity_grid_shows_weekdays"] = (
+            context["resident_activity_grid"]["days"] == WEEK_DAYS
         )
-
-        context["monthly_activity_hours_by_caregiver_role_chart"] = (
-            prepare_monthly_activity_hours_by_caregiver_role_chart(home)
+        context["resident_activity_grid_is_first_page"] = not self.request.GET.get(
+            "cursor",
         )
 
         return context
 
-    def prepare_work_charts(self, context):
-        """Prepare work charts and add them to the template context."""
-        home = context["home"]
+    def get_chart_html(self, home, chart_name, build_chart):
+        """Render a chart, or take it from the chart cache."""
+        return get_cached_chart(
+            chart_name,
+            "home",
+            home.id,
+            "html",
+            lambda: render_chart_html(build_chart(home)),
+        )
 
-        context["work_by_type_chart"] = prepare_work_by_type_chart(home)
+    def prepare_charts(self, context, charts):
+        """Prepare charts and add them to the template context.
 
-        context["work_by_caregiver_role_chart"] = prepare_work_by_caregiver_role_chart(
-            home,
-        )
+        The charts are independent of each other, so they are prepared
+        concurrently when possible.
+        """
+        home = context["home"]
 
-        context["daily_work_percent_by_caregiver_role_and_type_chart"] = (
-            prepare_daily_work_percent_by_caregiver_role_and_type_chart(home)
+        context.update(
+            prepare_charts(
+                {
+                    chart_name: partial(
+                        self.get_chart_html,
+                        home,
+                        chart_name,
+                        build_chart,
+                    )
+                    for chart_name, build_chart in charts.items()
+                },
+            ),
         )
 
-        context = prepare_work_by_caregiver_role_and_type_charts(context)
+        return context
+
+    def prepare_lazy_charts(self, context, chart_names):
+        """Add placeholders for charts that the page loads from their JSON
+        endpoints."""
+        home = context["home"]
+
+        for chart_name in chart_names:
+            context[chart_name] = render_lazy_chart_html(
+                reverse(
+                    "home-chart-view",
+                    kwargs={"url_uuid": home.url_uuid, "chart_name": chart_name},
+                ),
+            )
 
         return context
 
@@ -163,14 +212,54 @@ class HomeDetailView(LoginRequiredMixin, DetailView):
         context["work_has_been_recorded"] = home.work_performed.exists()
         context["activity_has_been_recorded"] = home.activity_performed.exists()
 
-        # Only prepare charts if work has been recorded
+        context = self.prepare_resident_activity_grid(context)
+
+        # Only prepare charts if work or activity has been recorded
+        charts = {}
         if context["work_has_been_recorded"]:
-            context = self.prepare_work_charts(context)
+            charts.update(HOME_WORK_CHARTS)
         if context["activity_has_been_recorded"]:
-            context = self.prepare_activity_charts(context)
+            charts.update(HOME_ACTIVITY_CHARTS)
+
+        if settings.CHARTS_LAZY_LOAD:
+            context = self.prepare_lazy_charts(context, charts)
+        else:
+            context = self.prepare_charts(context, charts)
+
         return context
 
 
+# The chart only reads data, so its cache writes are committed right away
+# instead of locking the shared cache rows until the response is sent
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class HomeChartView(LoginRequiredMixin, View):
+    """Return the figure JSON of one home detail chart."""
+
+    def get(self, request, url_uuid, chart_name):
+        home = get_object_or_404(Home, url_uuid=url_uuid)
+
+        # ensure the user has access to the home
+        if not home.has_access(user=request.user):
+            raise PermissionDenied
+
+        if chart_name in HOME_WORK_CHARTS and home.work_performed.exists():
+            build_chart = HOME_WORK_CHARTS[chart_name]
+        elif chart_name in HOME_ACTIVITY_CHARTS and home.activity_performed.exists():
+            build_chart = HOME_ACTIVITY_CHARTS[chart_name]
+        else:
+            raise Http404
+
+        chart_json = get_cached_chart(
+            chart_name,
+            "home",
+            home.id,
+            "json",
+            lambda: build_chart(home).to_json(),
+        )
+
+        return HttpResponse(chart_json, content_type="application/json")
+
+
 class HomeUserRelationListView(LoginRequiredMixin, FormView):
     form_class = AddCaregiverForm  # Use form_class instead of form
     template_name = "homes/home_user_relation_list.html"
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MetricsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "metrics"
+
+    def ready(self):
+        # Connect the signal handlers that maintain the daily activity rollup
+        from . import signals  # noqa: F401
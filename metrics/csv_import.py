@@ -0,0 +1,106 @@
+import datetime
+from collections import defaultdict
+
+from common.csv_import import (
+    CsvImporter,
+    CsvRowError,
+    Lookup,
+    parse_date,
+    parse_minutes,
+)
+from residents.models import Residency, Resident
+
+from .models import ResidentActivity, ResidentDailyActivity
+
+
+def _get_choice_lookup(label: str, choices) -> Lookup:
+    """Return a lookup of the values of model choices by value and label."""
+    return Lookup(
+        label,
+        [(value, value) for value in choices.values]
+        + [(choice_label, value) for value, choice_label in choices.choices],
+    )
+
+
+class ResidentActivityCsvImporter(CsvImporter):
+    """Import resident activities from CSV rows with the resident's full name
+    or URL UUID, the activity date, type and caregiver role, and the
+    duration in minutes.
+
+    The residency and home of each activity are those the resident lived in
+    on the activity date.
+    """
+
+    model = ResidentActivity
+    columns = (
+        "resident",
+        "activity_date",
+        "activity_type",
+        "caregiver_role",
+        "activity_minutes",
+    )
+
+    def load_lookups(self) -> None:
+        residents = list(
+            Resident.objects.values_list(
+                "id", "first_name", "last_initial", "url_uuid"
+            ),
+        )
+
+        self.residents = Lookup(
+            "resident",
+            [
+                (f"{first_name} {last_initial}", resident_id)
+                for resident_id, first_name, last_initial, _url_uuid in residents
+            ]
+            + [
+                (url_uuid, resident_id)
+                for resident_id, _first_name, _last_initial, url_uuid in residents
+            ],
+        )
+        self.activity_types = _get_choice_lookup(
+            "activity type",
+            ResidentActivity.ActivityTypeChoices,
+        )
+        self.caregiver_roles = _get_choice_lookup(
+            "caregiver role",
+            ResidentActivity.CaregiverRoleChoices,
+        )
+
+        self.residencies_by_resident = defaultdict(list)
+        for residency in Residency.objects.values(
+            "id",
+            "resident_id",
+            "home_id",
+            "move_in",
+            "move_out",
+        ):
+            self.residencies_by_resident[residency["resident_id"]].append(residency)
+
+    def _get_residency(self, resident_id: int, activity_date: datetime.date) -> dict:
+        """Return the residency of a resident on a date."""
+        for residency in self.residencies_by_resident[resident_id]:
+            if residency["move_in"] <= activity_date and (
+                residency["move_out"] is None or activity_date <= residency["move_out"]
+            ):
+                return residency
+
+        raise CsvRowError(f"No residency of the resident on {activity_date}")
+
+    def build_object(self, row: dict[str, str]) -> ResidentActivity:
+        resident_id = self.residents.resolve(row["resident"])
+        activity_date = parse_date(row["activity_date"])
+        residency = self._get_residency(resident_id, activity_date)
+
+        return ResidentActivity(
+            resident_id=resident_id,
+            residency_id=residency["id"],
+            home_id=residency["home_id"],
+            activity_date=activity_date,
+            activity_type=self.activity_types.resolve(row["activity_type"]),
+            caregiver_role=self.caregiver_roles.resolve(row["caregiver_role"]),
+            activity_minutes=parse_minutes(row["activity_minutes"]),
+        )
+
+    def refresh_rollups(self, objs: list[ResidentActivity]) -> None:
+        ResidentDailyActivity.objects.refresh(activity.rollup_key for activity in objs)
@@ -78,7 +78,7 @@ def get_resident_choices(user=None):
             move_out__isnull=True,
         )
 
-    residencies.select_related(
+    residencies = residencies.select_related(
         "home",
         "resident",
     )
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+def normalize_percents(counts: np.ndarray) -> np.ndarray:
+    """Convert rows of counts into integer percents that sum to 100.
+
+    Uses the largest remainder method: each percent is rounded down and
+    the points still missing from 100 go to the largest fractional
+    parts, ties going to the leftmost column. All rows are normalized in
+    one vectorized pass.
+
+    Args:
+        counts (np.ndarray): A (rows x columns) array of non-negative counts,
+            e.g. residents per activity level for each home.
+
+    Returns:
+        np.ndarray: An integer array of the same shape. Each row sums to 100,
+            or is all zeros when the row total is zero.
+    """
+    counts = np.asarray(counts, dtype=float)
+    totals = counts.sum(axis=1, keepdims=True)
+
+    # Rows without any counts stay at zero percent
+    raw_percents = np.divide(
+        counts * 100,
+        totals,
+        out=np.zeros_like(counts),
+        where=totals > 0,
+    )
+    percents = np.floor(raw_percents)
+    remainders = raw_percents - percents
+
+    missing_points = np.where(totals[:, 0] > 0, 100 - percents.sum(axis=1), 0)
+
+    # Rank each column by its fractional part within the row (0 = largest)
+    columns_by_remainder = np.argsort(-remainders, axis=1, kind="stable")
+    remainder_ranks = np.empty_like(columns_by_remainder)
+    np.put_along_axis(
+        remainder_ranks,
+        columns_by_remainder,
+        np.arange(counts.shape[1]),
+        axis=1,
+    )
+
+    percents += remainder_ranks < missing_points[:, np.newaxis]
+
+    return percents.astype(int)
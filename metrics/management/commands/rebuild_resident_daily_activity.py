@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from metrics.models import ResidentDailyActivity
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the resident daily activity rollup from resident activities."
+
+    def handle(self, *args, **options):
+        rollup_count = ResidentDailyActivity.objects.rebuild()
+
+        self.stdout.write(f"Rebuilt {rollup_count} resident daily activity rows.")
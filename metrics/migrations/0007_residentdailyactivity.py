@@ -0,0 +1,54 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_resident_daily_activity(apps, schema_editor):
+    ResidentActivity = apps.get_model('metrics', 'ResidentActivity')
+    ResidentDailyActivity = apps.get_model('metrics', 'ResidentDailyActivity')
+
+    daily_activities = (
+        ResidentActivity.objects.filter(activity_date__isnull=False)
+        .values('resident_id', 'home_id', 'activity_date', 'activity_type', 'caregiver_role')
+        .order_by()
+        .annotate(activity_count=Count('id'), activity_minutes=Sum('activity_minutes'))
+    )
+
+    ResidentDailyActivity.objects.bulk_create(
+        (ResidentDailyActivity(**daily_activity) for daily_activity in daily_activities.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_homeuserrelation'),
+        ('metrics', '0001_squashed_0006_residentactivity_group_activity_id'),
+        ('residents', '0004_alter_residency_resident'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResidentDailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('activity_date', models.DateField(verbose_name='Activity date')),
+                ('activity_type', models.CharField(choices=[('outdoor', 'Outdoor'), ('casual_social', 'Casual Social'), ('culture', 'Culture'), ('discussion', 'Discussion'), ('guided', 'Guided'), ('music', 'Music'), ('self_guided', 'Self-guided'), ('trip', 'Trip')], max_length=20, verbose_name='Activity type')),
+                ('caregiver_role', models.CharField(choices=[('family', 'Family'), ('friend', 'Friend'), ('hobby_instructor', 'Hobby Instructor'), ('nurse', 'Nurse'), ('physio_therapist', 'Physio therapist'), ('practical_nurse', 'Practical nurse'), ('volunteer', 'Volunteer')], max_length=20, verbose_name='Caregiver role')),
+                ('activity_count', models.PositiveIntegerField(verbose_name='Activity count')),
+                ('activity_minutes', models.PositiveIntegerField(verbose_name='Duration in minutes')),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activities', to='homes.home')),
+                ('resident', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activities', to='residents.resident')),
+            ],
+            options={
+                'verbose_name': 'resident daily activity',
+                'verbose_name_plural': 'resident daily activities',
+                'db_table': 'resident_daily_activity',
+                'constraints': [models.UniqueConstraint(fields=('resident', 'home', 'activity_date', 'activity_type', 'caregiver_role'), name='resident_daily_activity_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_resident_daily_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('metrics', '0007_residentdailyactivity'),
+        ('residents', '0005_residency_residency_current_home_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='residentactivity',
+            index=models.Index(fields=['home', 'activity_date'], name='resident_activity_home_date'),
+        ),
+        migrations.AddIndex(
+            model_name='residentactivity',
+            index=models.Index(fields=['resident', 'activity_date'], name='resident_activity_resdnt_date'),
+        ),
+        migrations.AddIndex(
+            model_name='residentdailyactivity',
+            index=models.Index(fields=['home', 'activity_date'], name='resident_daily_act_home_date'),
+        ),
+        migrations.AddIndex(
+            model_name='residentdailyactivity',
+            index=models.Index(fields=['resident', 'activity_date'], name='resident_daily_act_resdnt_date'),
+        ),
+    ]
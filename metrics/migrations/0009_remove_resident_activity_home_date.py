@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metrics', '0008_residentactivity_resident_activity_home_date_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='residentactivity',
+            name='resident_activity_home_date',
+        ),
+    ]
@@ -1,9 +1,76 @@
-from django.db import models
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Count, Q, Sum
 from django.utils.translation import gettext_lazy as _
+
+from common.chart_cache import bump_chart_data_version
+from common.locks import lock_rows
 from homes.models import Home
 from residents.models import Resident
 from residents.models import Residency
 
+# Resident activity fields that determine which daily rollup rows an
+# activity contributes to
+ROLLUP_FIELDS = {
+    "resident",
+    "resident_id",
+    "home",
+    "home_id",
+    "activity_date",
+    "activity_type",
+    "caregiver_role",
+    "activity_minutes",
+}
+
+# Number of distinct dates refreshed per rollup query
+ROLLUP_REFRESH_BATCH_SIZE = 100
+
+
+class ResidentActivityQuerySet(models.QuerySet):
+    """QuerySet that keeps the daily activity rollup up to date for bulk
+    writes, which do not send model signals."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+
+        ResidentDailyActivity.objects.refresh(activity.rollup_key for activity in objs)
+
+        return objs
+
+    def update(self, **kwargs):
+        if not ROLLUP_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic():
+            activity_ids = list(self.values_list("id", flat=True))
+            rollup_keys_before = set(
+                ResidentActivity.objects.filter(id__in=activity_ids).values_list(
+                    "resident_id",
+                    "home_id",
+                    "activity_date",
+                ),
+            )
+
+            rows = super().update(**kwargs)
+
+            rollup_keys_after = set(
+                ResidentActivity.objects.filter(id__in=activity_ids).values_list(
+                    "resident_id",
+                    "home_id",
+                    "activity_date",
+                ),
+            )
+            ResidentDailyActivity.objects.refresh(
+                rollup_keys_before | rollup_keys_after,
+            )
+
+        return rows
+
 
 class ResidentActivity(models.Model):
     class ActivityTypeChoices(models.TextChoices):
@@ -72,7 +139,190 @@ class ResidentActivity(models.Model):
         null=True,
     )
 
+    objects = ResidentActivityQuerySet.as_manager()
+
     class Meta:
         db_table = "resident_activity"
         verbose_name = _("resident_activity")
         verbose_name_plural = _("resident_activities")
+        indexes = [
+            models.Index(
+                fields=["resident", "activity_date"],
+                name="resident_activity_resdnt_date",
+            ),
+        ]
+
+    @property
+    def rollup_key(self) -> tuple[int, int, datetime.date | None]:
+        """Return the (resident ID, home ID, activity date) of the daily
+        rollup this activity contributes to."""
+        return (self.resident_id, self.home_id, self.activity_date)
+
+
+class ResidentDailyActivityManager(models.Manager):
+    def _aggregate_activities(self, activity_filter: Q) -> models.QuerySet:
+        """Aggregate the resident activities matching the filter into daily
+        rollup rows."""
+        return (
+            ResidentActivity.objects.filter(activity_filter)
+            .filter(activity_date__isnull=False)
+            .values(
+                "resident_id",
+                "home_id",
+                "activity_date",
+                "activity_type",
+                "caregiver_role",
+            )
+            .order_by()
+            .annotate(
+                activity_count=Count("id"),
+                activity_minutes=Sum("activity_minutes"),
+            )
+        )
+
+    @transaction.atomic
+    def refresh(
+        self,
+        rollup_keys: Iterable[tuple[int, int, datetime.date | None]],
+    ) -> None:
+        """Recompute the daily rollup rows for the given (resident ID, home ID,
+        activity date) keys from the resident activities.
+
+        Keys are grouped by date, so each batch is refreshed with one
+        delete and one insert. Every activity write passes through here, so
+        this also invalidates the cached charts of the homes and residents.
+
+        The residents are locked until the transaction commits, so
+        concurrent refreshes of a resident run one after another, and each
+        one aggregates the activities committed by the others instead of
+        overwriting their rollups with a stale aggregate.
+        """
+        rollup_keys = list(rollup_keys)
+        bump_chart_data_version("home", (rollup_key[1] for rollup_key in rollup_keys))
+        bump_chart_data_version(
+            "resident",
+            (rollup_key[0] for rollup_key in rollup_keys),
+        )
+        lock_rows(Resident, (rollup_key[0] for rollup_key in rollup_keys))
+
+        resident_ids_by_date = defaultdict(set)
+        for resident_id, _home_id, activity_date in rollup_keys:
+            if activity_date is not None:
+                resident_ids_by_date[activity_date].add(resident_id)
+
+        dates = sorted(resident_ids_by_date)
+        for start in range(0, len(dates), ROLLUP_REFRESH_BATCH_SIZE):
+            # Dates of the same residents, as in bulk imports, share one
+            # condition
+            dates_by_resident_ids = defaultdict(list)
+            for activity_date in dates[start : start + ROLLUP_REFRESH_BATCH_SIZE]:
+                dates_by_resident_ids[
+                    frozenset(resident_ids_by_date[activity_date])
+                ].append(activity_date)
+
+            rollup_filter = reduce(
+                or_,
+                (
+                    Q(activity_date__in=batch_dates, resident_id__in=resident_ids)
+                    for resident_ids, batch_dates in dates_by_resident_ids.items()
+                ),
+            )
+
+            self.filter(rollup_filter).delete()
+            self._insert(self._aggregate_activities(rollup_filter))
+
+    def rebuild(self) -> int:
+        """Rebuild the whole daily rollup from the resident activities and
+        return the number of rollup rows."""
+        with transaction.atomic():
+            self.all().delete()
+
+            return self._insert(self._aggregate_activities(Q()))
+
+    def _insert(self, rows: Iterable[dict]) -> int:
+        """Insert the aggregated rollup rows, updating rows that were
+        concurrently inserted."""
+        rollups = [self.model(**row) for row in rows]
+
+        self.bulk_create(
+            rollups,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=[
+                "resident",
+                "home",
+                "activity_date",
+                "activity_type",
+                "caregiver_role",
+            ],
+            update_fields=["activity_count", "activity_minutes"],
+        )
+
+        return len(rollups)
+
+
+class ResidentDailyActivity(models.Model):
+    """Daily rollup of resident activities.
+
+    Holds one row per resident, home, day, activity type and caregiver
+    role, so dashboards aggregate days rather than individual
+    activities. The rollup is kept up to date when resident activities
+    are written and can be rebuilt with the
+    rebuild_resident_daily_activity command.
+    """
+
+    resident = models.ForeignKey(
+        to=Resident,
+        on_delete=models.CASCADE,
+        related_name="daily_activities",
+    )
+    home = models.ForeignKey(
+        Home,
+        on_delete=models.CASCADE,
+        related_name="daily_activities",
+    )
+    activity_date = models.DateField(_("Activity date"))
+    activity_type = models.CharField(
+        _("Activity type"),
+        max_length=20,
+        choices=ResidentActivity.ActivityTypeChoices.choices,
+    )
+    caregiver_role = models.CharField(
+        _("Caregiver role"),
+        max_length=20,
+        choices=ResidentActivity.CaregiverRoleChoices.choices,
+    )
+    activity_count = models.PositiveIntegerField(_("Activity count"))
+    activity_minutes = models.PositiveIntegerField(_("Duration in minutes"))
+
+    objects = ResidentDailyActivityManager()
+
+    class Meta:
+        db_table = "resident_daily_activity"
+        verbose_name = _("resident daily activity")
+        verbose_name_plural = _("resident daily activities")
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "resident",
+                    "home",
+                    "activity_date",
+                    "activity_type",
+                    "caregiver_role",
+                ],
+                name="resident_daily_activity_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["home", "activity_date"],
+                name="resident_daily_act_home_date",
+            ),
+            models.Index(
+                fields=["resident", "activity_date"],
+                name="resident_daily_act_resdnt_date",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.resident} - {self.home} - {self.activity_date}"
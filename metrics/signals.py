@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import ResidentActivity, ResidentDailyActivity
+
+
+@receiver(pre_save, sender=ResidentActivity)
+def remember_previous_rollup_key(sender, instance, **kwargs):
+    """Remember the rollup key an existing activity contributed to before it
+    is changed."""
+    previous = (
+        ResidentActivity.objects.filter(pk=instance.pk)
+        .values_list("resident_id", "home_id", "activity_date")
+        .first()
+        if instance.pk
+        else None
+    )
+
+    instance._previous_rollup_key = previous
+
+
+@receiver(post_save, sender=ResidentActivity)
+def refresh_rollup_on_save(sender, instance, **kwargs):
+    """Refresh the daily rollup for a created or updated activity."""
+    rollup_keys = {instance.rollup_key}
+
+    previous_rollup_key = getattr(instance, "_previous_rollup_key", None)
+    if previous_rollup_key is not None:
+        rollup_keys.add(previous_rollup_key)
+
+    ResidentDailyActivity.objects.refresh(rollup_keys)
+
+
+@receiver(post_delete, sender=ResidentActivity)
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    """Refresh the daily rollup for a deleted activity."""
+    ResidentDailyActivity.objects.refresh([instance.rollup_key])
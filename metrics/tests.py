@@ -1,13 +1,21 @@
+import threading
+import time
 from http import HTTPStatus
-from django.test import TestCase
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+import numpy as np
 
 from metrics.forms import group_residents_by_home, prepare_resident_choices
+from metrics.helpers import normalize_percents
 from residents.models import Residency
 
-from .models import ResidentActivity
+from .models import ResidentActivity, ResidentDailyActivity
 from homes.factories import HomeFactory, HomeUserRelationFactory
 from residents.factories import ResidentFactory, ResidencyFactory
-from datetime import date
+from datetime import date, timedelta
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
@@ -282,3 +290,223 @@ class ResidentDataPreparationTest(TestCase):
         # Assuming homes are sorted alphabetically in the choices list
         self.assertEqual(choices[0][0], "Home A")
         self.assertEqual(choices[1][0], "Home B")
+
+
+class ResidentDailyActivityTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory(name="Home A")
+        self.resident = ResidentFactory()
+        self.residency = ResidencyFactory(home=self.home, resident=self.resident)
+        self.today = date.today()
+
+    def _create_activity(self, **kwargs):
+        activity_kwargs = {
+            "resident": self.resident,
+            "residency": self.residency,
+            "home": self.home,
+            "activity_date": self.today,
+            "activity_type": ResidentActivity.ActivityTypeChoices.OUTDOOR,
+            "caregiver_role": ResidentActivity.CaregiverRoleChoices.NURSE,
+            "activity_minutes": 30,
+        }
+        activity_kwargs.update(kwargs)
+
+        return ResidentActivity.objects.create(**activity_kwargs)
+
+    def _rollup(self, **kwargs):
+        return list(
+            ResidentDailyActivity.objects.filter(**kwargs)
+            .order_by("activity_date", "activity_type", "caregiver_role")
+            .values_list(
+                "activity_date",
+                "activity_type",
+                "caregiver_role",
+                "activity_count",
+                "activity_minutes",
+            ),
+        )
+
+    def test_create(self):
+        self._create_activity()
+        self._create_activity(activity_minutes=45)
+        self._create_activity(activity_type=ResidentActivity.ActivityTypeChoices.MUSIC)
+
+        self.assertEqual(
+            self._rollup(),
+            [
+                (self.today, "music", "nurse", 1, 30),
+                (self.today, "outdoor", "nurse", 2, 75),
+            ],
+        )
+
+    def test_update(self):
+        activity = self._create_activity()
+        yesterday = self.today - timedelta(days=1)
+
+        activity.activity_date = yesterday
+        activity.activity_minutes = 60
+        activity.save()
+
+        self.assertEqual(
+            self._rollup(),
+            [(yesterday, "outdoor", "nurse", 1, 60)],
+        )
+
+    def test_delete(self):
+        activity = self._create_activity()
+        self._create_activity()
+
+        activity.delete()
+
+        self.assertEqual(self._rollup(), [(self.today, "outdoor", "nurse", 1, 30)])
+
+        ResidentActivity.objects.all().delete()
+
+        self.assertEqual(self._rollup(), [])
+
+    def test_bulk_create(self):
+        ResidentActivity.objects.bulk_create(
+            [
+                ResidentActivity(
+                    resident=self.resident,
+                    residency=self.residency,
+                    home=self.home,
+                    activity_date=self.today - timedelta(days=days_ago),
+                    activity_type=ResidentActivity.ActivityTypeChoices.TRIP,
+                    caregiver_role=ResidentActivity.CaregiverRoleChoices.FAMILY,
+                    activity_minutes=20,
+                )
+                for days_ago in [0, 0, 1]
+            ],
+        )
+
+        self.assertEqual(
+            self._rollup(),
+            [
+                (self.today - timedelta(days=1), "trip", "family", 1, 20),
+                (self.today, "trip", "family", 2, 40),
+            ],
+        )
+
+    def test_queryset_update(self):
+        self._create_activity()
+        self._create_activity()
+
+        ResidentActivity.objects.update(
+            caregiver_role=ResidentActivity.CaregiverRoleChoices.VOLUNTEER,
+        )
+
+        self.assertEqual(
+            self._rollup(),
+            [(self.today, "outdoor", "volunteer", 2, 60)],
+        )
+
+    def test_activities_without_date_are_not_rolled_up(self):
+        self._create_activity(activity_date=None)
+
+        self.assertEqual(self._rollup(), [])
+
+    def test_rebuild_command(self):
+        self._create_activity()
+        self._create_activity(activity_minutes=15)
+        ResidentDailyActivity.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_resident_daily_activity", stdout=out)
+
+        self.assertIn("Rebuilt 1 resident daily activity rows.", out.getvalue())
+        self.assertEqual(self._rollup(), [(self.today, "outdoor", "nurse", 2, 45)])
+
+
+class ResidentDailyActivityConcurrencyTest(TransactionTestCase):
+    def test_concurrent_refreshes_keep_all_activities(self):
+        if connection.vendor != "postgresql":
+            self.skipTest(f"No concurrent transactions on {connection.vendor}")
+
+        home = HomeFactory()
+        resident = ResidentFactory()
+        activity_kwargs = {
+            "resident": resident,
+            "residency": ResidencyFactory(home=home, resident=resident),
+            "home": home,
+            "activity_date": date.today(),
+            "activity_type": ResidentActivity.ActivityTypeChoices.OUTDOOR,
+            "caregiver_role": ResidentActivity.CaregiverRoleChoices.NURSE,
+        }
+        first_activity_saved = threading.Event()
+
+        def save_first_activity():
+            try:
+                with transaction.atomic():
+                    ResidentActivity.objects.create(
+                        activity_minutes=30,
+                        **activity_kwargs,
+                    )
+                    first_activity_saved.set()
+                    # Commit after the other transaction has saved its activity
+                    time.sleep(0.5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=save_first_activity)
+        thread.start()
+        self.assertTrue(first_activity_saved.wait(timeout=10))
+
+        # Refreshing waits for the first transaction, then aggregates its
+        # activity
+        with transaction.atomic():
+            ResidentActivity.objects.create(activity_minutes=45, **activity_kwargs)
+
+        thread.join()
+
+        self.assertEqual(
+            list(
+                ResidentDailyActivity.objects.values_list(
+                    "activity_count",
+                    "activity_minutes",
+                ),
+            ),
+            [(2, 75)],
+        )
+
+
+class NormalizePercentsTest(TestCase):
+    def test_ties_go_to_leftmost_column(self):
+        np.testing.assert_array_equal(
+            normalize_percents(np.array([[1, 1, 1, 0]])),
+            [[34, 33, 33, 0]],
+        )
+
+    def test_rows_without_counts_stay_zero(self):
+        np.testing.assert_array_equal(
+            normalize_percents(np.array([[0, 0, 0, 0], [2, 1, 0, 0]])),
+            [[0, 0, 0, 0], [67, 33, 0, 0]],
+        )
+
+    def test_random_counts_are_normalized(self):
+        rng = np.random.default_rng(seed=7)
+
+        for _ in range(50):
+            counts = rng.integers(0, 40, size=(20, 4))
+            counts[rng.random(20) < 0.1] = 0
+            percents = normalize_percents(counts)
+
+            totals = counts.sum(axis=1)
+            raw_percents = np.divide(
+                counts * 100,
+                totals[:, np.newaxis],
+                out=np.zeros(counts.shape),
+                where=totals[:, np.newaxis] > 0,
+            )
+
+            np.testing.assert_array_equal(
+                percents.sum(axis=1),
+                np.where(totals > 0, 100, 0),
+            )
+            # Each percent is its raw percent rounded either down or up
+            self.assertTrue(np.all(percents >= np.floor(raw_percents)))
+            self.assertTrue(np.all(percents <= np.ceil(raw_percents)))
+            # A larger count never gets a smaller percent
+            larger_counts = counts[:, :, np.newaxis] > counts[:, np.newaxis, :]
+            smaller_percents = percents[:, :, np.newaxis] < percents[:, np.newaxis, :]
+            self.assertFalse(np.any(larger_counts & smaller_percents))
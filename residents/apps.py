@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResidentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "residents"
+
+    def ready(self):
+        # Connect the signal handlers that maintain Resident.current_residency
+        from . import signals  # noqa: F401
@@ -1,65 +1,81 @@
-import pandas as pd
-import plotly.express as px
+from collections.abc import Callable
+
+import plotly.graph_objects as go
+from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext as _
 
+from common.chart_builders import build_bar_chart, build_scatter_chart
+from common.chart_templates import (
+    CENTERED_TITLE_LAYOUT,
+    get_chart_template,
+    register_chart_template,
+)
 from core.constants import HOUR_MINUTES
-from metrics.models import ResidentActivity
+from metrics.models import ResidentActivity, ResidentDailyActivity
+
+
+@register_chart_template("daily_activity_minutes")
+def _get_daily_activity_minutes_options() -> dict:
+    return {
+        "title": _("Daily activity minutes"),
+        "labels": {
+            "activity_date": _("Date"),
+            "total_activity_minutes": _("Total activity minutes"),
+        },
+        "layouts": [CENTERED_TITLE_LAYOUT],
+        "trace_types": ["scatter"],
+    }
+
+
+@register_chart_template("activity_hours_by_type")
+def _get_activity_hours_by_type_options() -> dict:
+    return {
+        "title": _("Activity hours by type"),
+        "labels": {
+            "activity_type_label": _("Type of activity"),
+            "total_hours": _("Duration in hours"),
+        },
+        "layouts": [CENTERED_TITLE_LAYOUT],
+    }
 
 
-def prepare_daily_activity_minutes_scatter_chart(
-    activities: models.QuerySet[ResidentActivity],
-) -> str:
-    """Prepare a scatter chart of daily activity minutes for a resident."""
+@register_chart_template("activity_hours_by_caregiver_role")
+def _get_activity_hours_by_caregiver_role_options() -> dict:
+    return {
+        "title": _("Activity hours by caregiver role"),
+        "labels": {
+            "caregiver_role_label": _("Caregiver role"),
+            "total_hours": _("Duration in hours"),
+        },
+        "layouts": [CENTERED_TITLE_LAYOUT],
+    }
+
+
+def build_daily_activity_minutes_scatter_chart(
+    activities: models.QuerySet[ResidentDailyActivity],
+) -> go.Figure:
+    """Build a scatter chart of daily activity minutes for a resident."""
     activities_agg = (
         activities.values("activity_date")
         .annotate(total_activity_minutes=models.Sum("activity_minutes"))
         .order_by("activity_date")
     )
 
-    df_activities = pd.DataFrame(activities_agg)
-
-    # Ensure 'date' column is in datetime format
-    df_activities["activity_date"] = pd.to_datetime(df_activities["activity_date"])
-
-    fig = px.scatter(
-        df_activities,
+    return build_scatter_chart(
+        activities_agg,
         x="activity_date",
         y="total_activity_minutes",
-        title=_("Daily activity minutes"),
-        labels={
-            "date": _("Date"),
-            "total_activity_minutes": _("Total activity minutes"),
-        },
-        trendline="ols",
-        trendline_color_override="burlywood",
-        hover_data=["total_activity_minutes"],
+        trendline=settings.CHARTS_DAILY_ACTIVITY_TRENDLINE,
+        trendline_color="burlywood",
+        **get_chart_template("daily_activity_minutes")._asdict(),
     )
 
-    fig.update_layout(
-        title={
-            "y": 0.9,
-            "x": 0.5,
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        xaxis_title=_("Date"),
-        yaxis_title=_("Total activity minutes"),
-        legend_title="",
-        template="plotly_dark",
-        # Set plot background/paper color to transparent
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
-    )
-
-    return fig.to_html()
 
-
-def prepare_activity_hours_by_type_chart(
-    activities: models.QuerySet[ResidentActivity],
-) -> str:
-    """Prepare a bar chart of activity counts by type for a resident."""
+def build_activity_hours_by_type_chart(
+    activities: models.QuerySet[ResidentDailyActivity],
+) -> go.Figure:
+    """Build a bar chart of activity counts by type for a resident."""
 
     activities_agg = (
         activities.values("activity_type")
@@ -80,43 +96,18 @@ def prepare_activity_hours_by_type_chart(
         for activity in activities_agg
     ]
 
-    df_activities = pd.DataFrame(activities_agg)
-
-    fig = px.bar(
-        df_activities,
+    return build_bar_chart(
+        activities_agg,
         x="activity_type_label",  # Use activity_type_label instead of activity_type
         y="total_hours",
-        title=_("Activity hours by type"),
-        labels={
-            "activity_type_label": _("Type of activity"),  # Update the label for x-axis
-            "total_hours": _("Duration in hours"),
-        },
+        **get_chart_template("activity_hours_by_type")._asdict(),
     )
 
-    fig.update_layout(
-        title={
-            "y": 0.9,
-            "x": 0.5,
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        xaxis_title=_("Type of activity"),
-        yaxis_title=_("Duration in hours"),
-        legend_title="",
-        template="plotly_dark",
-        # Set plot background/paper color to transparent
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
-    )
 
-    return fig.to_html()
-
-
-def prepare_activity_hours_by_caregiver_role_chart(
-    activities: models.QuerySet[ResidentActivity],
-) -> str:
-    """Prepare a bar chart of activity counts by type for a resident."""
+def build_activity_hours_by_caregiver_role_chart(
+    activities: models.QuerySet[ResidentDailyActivity],
+) -> go.Figure:
+    """Build a bar chart of activity counts by type for a resident."""
 
     activities_agg = (
         activities.values("caregiver_role")
@@ -137,34 +128,23 @@ def prepare_activity_hours_by_caregiver_role_chart(
         for activity in activities_agg
     ]
 
-    df_activities = pd.DataFrame(activities_agg)
-
-    fig = px.bar(
-        df_activities,
+    return build_bar_chart(
+        activities_agg,
         x="caregiver_role_label",
         y="total_hours",
-        title=_("Activity hours by caregiver role"),
-        labels={
-            "caregiver_role_label": _("Caregiver role"),
-            "total_hours": _("Duration in hours"),
-        },
+        **get_chart_template("activity_hours_by_caregiver_role")._asdict(),
     )
 
-    fig.update_layout(
-        title={
-            "y": 0.9,
-            "x": 0.5,
-            "xanchor": "center",
-            "yanchor": "top",
-        },
-        xaxis_title=_("Caregiver role"),
-        yaxis_title=_("Duration in hours"),
-        legend_title="",
-        template="plotly_dark",
-        # Set plot background/paper color to transparent
-        plot_bgcolor="rgba(0, 0, 0, 0)",
-        paper_bgcolor="rgba(0, 0, 0, 0)",
-        font_color="#FFFFFF",
-    )
 
-    return fig.to_html()
+# Resident detail charts by template context name, which is also the chart
+# name in the lazy loaded chart URLs
+RESIDENT_CHARTS: dict[
+    str,
+    Callable[[models.QuerySet[ResidentDailyActivity]], go.Figure],
+] = {
+    "resident_activities_by_date_chart": build_daily_activity_minutes_scatter_chart,
+    "activity_hours_by_type_chart": build_activity_hours_by_type_chart,
+    "activity_hours_by_caregiver_role_chart": (
+        build_activity_hours_by_caregiver_role_chart
+    ),
+}
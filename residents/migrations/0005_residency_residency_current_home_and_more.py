@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('residents', '0004_alter_residency_resident'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='residency',
+            index=models.Index(condition=models.Q(('move_out__isnull', True)), fields=['home', 'resident'], name='residency_current_home'),
+        ),
+        migrations.AddIndex(
+            model_name='residency',
+            index=models.Index(condition=models.Q(('move_out__isnull', True)), fields=['resident'], name='residency_current_resident'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def close_duplicate_open_residencies(apps, schema_editor):
+    """Keep the latest open residency of each resident open and close the
+    others on its move in date, so the unique constraint can be added."""
+    Residency = apps.get_model('residents', 'Residency')
+
+    kept_move_in_by_resident = {}
+    open_residencies = (
+        Residency.objects.filter(move_out__isnull=True)
+        .order_by('resident_id', '-move_in', '-pk')
+        .values_list('pk', 'resident_id', 'move_in')
+    )
+
+    for residency_id, resident_id, move_in in open_residencies.iterator():
+        if resident_id not in kept_move_in_by_resident:
+            kept_move_in_by_resident[resident_id] = move_in
+            continue
+
+        Residency.objects.filter(pk=residency_id).update(
+            move_out=kept_move_in_by_resident[resident_id],
+        )
+
+
+def backfill_current_residency(apps, schema_editor):
+    Resident = apps.get_model('residents', 'Resident')
+    Residency = apps.get_model('residents', 'Residency')
+
+    open_residencies = Residency.objects.filter(
+        resident=OuterRef('pk'),
+        move_out__isnull=True,
+    ).order_by('-move_in', '-pk').values('pk')[:1]
+
+    Resident.objects.update(current_residency=Subquery(open_residencies))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('residents', '0005_residency_residency_current_home_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='residency',
+            name='residency_current_resident',
+        ),
+        migrations.AddField(
+            model_name='resident',
+            name='current_residency',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='residents.residency'),
+        ),
+        migrations.RunPython(
+            close_duplicate_open_residencies,
+            migrations.RunPython.noop,
+        ),
+        migrations.RunPython(backfill_current_residency, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='residency',
+            constraint=models.UniqueConstraint(condition=models.Q(('move_out__isnull', True)), fields=('resident',), name='residency_current_resident'),
+        ),
+    ]
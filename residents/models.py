@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -12,6 +14,61 @@ if TYPE_CHECKING:
     from metrics.models import ResidentActivity
 
 
+class ResidentQuerySet(models.QuerySet):
+    def with_activity_level(self) -> "ResidentQuerySet":
+        """Annotate each resident with their activity count for the past seven
+        days and the matching WEEKLY_ACTIVITY_RANGES key.
+
+        Residents on hiatus get the "on_hiatus" key.
+        """
+        # avoid circular import
+        from metrics.models import ResidentDailyActivity
+
+        one_week_ago = timezone.now() - timezone.timedelta(days=7)
+
+        weekly_activity_counts = (
+            ResidentDailyActivity.objects.filter(
+                resident=OuterRef("pk"),
+                activity_date__gte=one_week_ago,
+            )
+            .values("resident")
+            .annotate(activity_count=Sum("activity_count"))
+            .values("activity_count")
+        )
+
+        return self.annotate(
+            weekly_activity_count=Coalesce(Subquery(weekly_activity_counts), 0),
+            activity_level_key=Case(
+                When(on_hiatus=True, then=Value("on_hiatus")),
+                *[
+                    When(
+                        weekly_activity_count__range=(
+                            activity_range["min_inclusive"],
+                            activity_range["max_inclusive"],
+                        ),
+                        then=Value(key),
+                    )
+                    for key, activity_range in WEEKLY_ACTIVITY_RANGES.items()
+                ],
+                # Counts above the highest range are still high
+                default=Value("high"),
+                output_field=models.CharField(),
+            ),
+        )
+
+    def refresh_current_residency(self) -> int:
+        """Point each resident at their open residency, if any.
+
+        Returns the number of residents updated.
+        """
+        open_residencies = Residency.objects.filter(
+            resident=OuterRef("pk"),
+            move_out__isnull=True,
+        ).values("pk")[:1]
+
+        return self.update(current_residency=Subquery(open_residencies))
+
+
 class Resident(models.Model):
     first_name = models.CharField(max_length=255)
     last_initial = models.CharField(max_length=1)
@@ -21,6 +78,17 @@ class Resident(models.Model):
         _("UUID used in URLs"),
         editable=False,  # type: ignore
     )
+    # Denormalized open residency, maintained when residencies are saved
+    current_residency = models.OneToOneField(
+        to="residents.Residency",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    objects = ResidentQuerySet.as_manager()
 
     @property
     def full_name(self):
@@ -56,47 +124,90 @@ class Resident(models.Model):
         - danger: 0-1
         - warning: 2-4
         - success: 5+
+
+        Uses the activity level annotated by
+        Resident.objects.with_activity_level(), when available, to avoid
+        a count query per resident.
         """
+        activity_level_key = getattr(self, "activity_level_key", None)
+
+        if activity_level_key is None:
+            activity_level_key = self._get_activity_level_key()
+
+        if activity_level_key == "on_hiatus":
+            return {
+                "color_class": "info",
+                "text": _("On hiatus"),
+            }
+
+        return {
+            "color_class": WEEKLY_ACTIVITY_RANGES[activity_level_key]["color_class"],
+            "text": WEEKLY_ACTIVITY_RANGES[activity_level_key]["label"],
+        }
+
+    def _get_activity_level_key(self) -> str:
+        """Return the activity level key for a resident that was not loaded
+        with Resident.objects.with_activity_level()."""
+        if self.on_hiatus:
+            return "on_hiatus"
+
         one_week_ago = timezone.now() - timezone.timedelta(days=7)
         activity_count: int = self.resident_activities.filter(  # type: ignore
             activity_date__gte=one_week_ago,
         ).count()
 
-        color_class = None
-        text = None
+        for key in ["inactive", "low", "good"]:
+            if activity_count in WEEKLY_ACTIVITY_RANGES[key]["range"]:
+                return key
 
-        if self.on_hiatus:
-            color_class = "info"
-            text = _("On hiatus")
-        elif activity_count in WEEKLY_ACTIVITY_RANGES["inactive"]["range"]:
-            color_class = WEEKLY_ACTIVITY_RANGES["inactive"]["color_class"]
-            text = WEEKLY_ACTIVITY_RANGES["inactive"]["label"]
-        elif activity_count in WEEKLY_ACTIVITY_RANGES["low"]["range"]:
-            color_class = WEEKLY_ACTIVITY_RANGES["low"]["color_class"]
-            text = WEEKLY_ACTIVITY_RANGES["low"]["label"]
-        elif activity_count in WEEKLY_ACTIVITY_RANGES["good"]["range"]:
-            color_class = WEEKLY_ACTIVITY_RANGES["good"]["color_class"]
-            text = WEEKLY_ACTIVITY_RANGES["good"]["label"]
-        else:
-            color_class = WEEKLY_ACTIVITY_RANGES["high"]["color_class"]
-            text = WEEKLY_ACTIVITY_RANGES["high"]["label"]
-
-        return {
-            "color_class": color_class,
-            "text": text,
-        }
+        return "high"
 
     @property
-    def current_residency(self):
-        """Return the resident's current residency."""
-        return self.residencies.get(move_out__isnull=True)
+    def current_home(self) -> Home | None:
+        """Return the resident's current home, if any.
+
+        Use select_related("current_residency__home") to avoid queries.
+        """
+        if self.current_residency is None:
+            return None
 
-    @property
-    def current_home(self):
-        """Return the resident's current home."""
         return self.current_residency.home
 
 
+class ResidencyQuerySet(models.QuerySet):
+    """QuerySet that keeps Resident.current_residency up to date for bulk
+    writes, which do not send model signals."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+
+        Resident.objects.filter(
+            pk__in={residency.resident_id for residency in objs},
+        ).refresh_current_residency()
+
+        return objs
+
+    def update(self, **kwargs):
+        if not {"resident", "resident_id", "move_out"}.intersection(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic():
+            residency_ids = list(self.values_list("id", flat=True))
+            resident_ids = set(self.values_list("resident_id", flat=True))
+
+            rows = super().update(**kwargs)
+
+            resident_ids.update(
+                Residency.objects.filter(id__in=residency_ids).values_list(
+                    "resident_id",
+                    flat=True,
+                ),
+            )
+            Resident.objects.filter(pk__in=resident_ids).refresh_current_residency()
+
+        return rows
+
+
 class Residency(models.Model):
     resident = models.ForeignKey(
         to=Resident,
@@ -115,10 +226,29 @@ class Residency(models.Model):
         blank=True,
     )
 
+    objects = ResidencyQuerySet.as_manager()
+
     class Meta:
         db_table = "residency"
         verbose_name = _("residency")
         verbose_name_plural = _("residencies")
+        indexes = [
+            # Current residents of a home
+            models.Index(
+                fields=["home", "resident"],
+                condition=models.Q(move_out__isnull=True),
+                name="residency_current_home",
+            ),
+        ]
+        constraints = [
+            # A resident has at most one open residency, which is also the
+            # index behind Resident.current_residency
+            models.UniqueConstraint(
+                fields=["resident"],
+                condition=models.Q(move_out__isnull=True),
+                name="residency_current_resident",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.resident.full_name} - {self.home.name}"
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from common.chart_cache import bump_chart_data_version
+
+from .models import Residency, Resident
+
+
+@receiver(pre_save, sender=Residency)
+def remember_previous_resident(sender, instance, **kwargs):
+    """Remember the resident of an existing residency before it is
+    changed."""
+    instance._previous_resident_id = (
+        Residency.objects.filter(pk=instance.pk)
+        .values_list("resident_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Residency)
+def refresh_current_residency_on_save(sender, instance, **kwargs):
+    """Refresh the current residency of the residents of a created or
+    updated residency."""
+    resident_ids = {instance.resident_id}
+
+    previous_resident_id = getattr(instance, "_previous_resident_id", None)
+    if previous_resident_id is not None:
+        resident_ids.add(previous_resident_id)
+
+    Resident.objects.filter(pk__in=resident_ids).refresh_current_residency()
+
+    # Keep a loaded resident consistent with the database
+    if Residency.resident.is_cached(instance):
+        resident = instance.resident
+
+        if instance.move_out is None:
+            resident.current_residency = instance
+        elif resident.current_residency_id == instance.pk:
+            resident.current_residency = None
+
+
+@receiver(post_save, sender=Residency)
+@receiver(post_delete, sender=Residency)
+def bump_chart_data_version_on_residency_change(sender, instance, **kwargs):
+    """Invalidate the cached charts of the home and resident of a
+    residency."""
+    bump_chart_data_version("home", [instance.home_id])
+    bump_chart_data_version("resident", [instance.resident_id])
+
+
+@receiver(post_save, sender=Resident)
+def bump_chart_data_version_on_resident_save(sender, instance, **kwargs):
+    """Invalidate the cached charts of a resident and of their current home,
+    which show the resident's name."""
+    bump_chart_data_version("resident", [instance.id])
+
+    if instance.current_residency is not None:
+        bump_chart_data_version("home", [instance.current_residency.home_id])
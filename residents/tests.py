@@ -1,13 +1,21 @@
+import datetime
+from http import HTTPStatus
 from io import StringIO
 from django.utils import timezone
 from django.core.management import call_command
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
 from django.core.management.base import CommandError
 
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
 from unittest.mock import MagicMock, patch
+from homes.factories import HomeFactory, HomeUserRelationFactory
 from metrics.factories import ResidentActivityFactory
 
+from .factories import ResidencyFactory, ResidentFactory
 from .models import Residency, Resident
 from homes.models import Home
 
@@ -162,6 +170,202 @@ class ResidencyTestCase(TestCase):
             overlapping_residency.clean()
 
 
+class ResidentCurrentResidencyTest(TestCase):
+    def setUp(self):
+        self.resident = ResidentFactory()
+        self.home = HomeFactory()
+
+    def test_open_residency_becomes_current(self):
+        residency = ResidencyFactory(resident=self.resident, home=self.home)
+
+        self.assertEqual(self.resident.current_residency, residency)
+        self.resident.refresh_from_db()
+        self.assertEqual(self.resident.current_residency, residency)
+
+    def test_closed_residency_is_not_current(self):
+        residency = ResidencyFactory(resident=self.resident, home=self.home)
+
+        residency.move_out = timezone.now().date()
+        residency.save()
+
+        self.assertIsNone(self.resident.current_residency)
+        self.resident.refresh_from_db()
+        self.assertIsNone(self.resident.current_residency)
+        self.assertIsNone(self.resident.current_home)
+
+    def test_current_home_is_an_attribute_read(self):
+        ResidencyFactory(resident=self.resident, home=self.home)
+
+        resident = Resident.objects.select_related("current_residency__home").get(
+            pk=self.resident.pk,
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(resident.current_home, self.home)
+
+    def test_bulk_writes_refresh_current_residency(self):
+        residency = Residency.objects.bulk_create(
+            [Residency(resident=self.resident, home=self.home)],
+        )[0]
+        self.resident.refresh_from_db()
+        self.assertEqual(self.resident.current_residency, residency)
+
+        Residency.objects.filter(pk=residency.pk).update(
+            move_out=timezone.now().date(),
+        )
+        self.resident.refresh_from_db()
+        self.assertIsNone(self.resident.current_residency)
+
+    def test_deleted_residency_is_not_current(self):
+        residency = ResidencyFactory(resident=self.resident, home=self.home)
+
+        residency.delete()
+
+        self.resident.refresh_from_db()
+        self.assertIsNone(self.resident.current_residency)
+
+    def test_one_open_residency_per_resident(self):
+        ResidencyFactory(resident=self.resident, home=self.home)
+
+        with self.assertRaises(IntegrityError):
+            Residency.objects.create(resident=self.resident, home=HomeFactory())
+
+
+class CurrentResidencyMigrationTest(TransactionTestCase):
+    migrate_from = [("residents", "0005_residency_residency_current_home_and_more")]
+    migrate_to = [("residents", "0006_resident_current_residency")]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+
+        Home = apps.get_model("homes", "Home")
+        Resident = apps.get_model("residents", "Resident")
+        Residency = apps.get_model("residents", "Residency")
+
+        home = Home.objects.create(name="Home")
+        self.resident_id = Resident.objects.create(
+            first_name="Anna",
+            last_initial="K",
+            url_uuid="anna",
+        ).id
+        # Residency.clean did not prevent several open residencies
+        self.residency_ids = [
+            Residency.objects.create(
+                resident_id=self.resident_id,
+                home=home,
+                move_in=move_in,
+            ).id
+            for move_in in [
+                datetime.date(2023, 1, 1),
+                datetime.date(2024, 1, 1),
+                datetime.date(2022, 1, 1),
+            ]
+        ]
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_keeps_latest_residency_open(self):
+        executor = MigrationExecutor(connection)
+        apps = executor.loader.project_state(self.migrate_to).apps
+        Resident = apps.get_model("residents", "Resident")
+        Residency = apps.get_model("residents", "Residency")
+
+        self.assertEqual(
+            list(
+                Residency.objects.order_by("move_in").values_list(
+                    "id",
+                    "move_out",
+                ),
+            ),
+            [
+                (self.residency_ids[2], datetime.date(2024, 1, 1)),
+                (self.residency_ids[0], datetime.date(2024, 1, 1)),
+                (self.residency_ids[1], None),
+            ],
+        )
+        self.assertEqual(
+            Resident.objects.get(id=self.resident_id).current_residency_id,
+            self.residency_ids[1],
+        )
+
+
+class ResidentChartViewTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="user",
+            password="test",
+        )
+        self.client.force_login(self.user)
+
+        self.resident = ResidentFactory()
+        residency = ResidencyFactory(resident=self.resident, home=HomeFactory())
+        ResidentActivityFactory(
+            resident=self.resident,
+            residency=residency,
+            home=residency.home,
+            activity_date=timezone.now().date(),
+        )
+
+        self.detail_url = reverse(
+            "resident-detail-view",
+            kwargs={"url_uuid": self.resident.url_uuid},
+        )
+
+    def get_chart_url(self, chart_name, resident=None):
+        return reverse(
+            "resident-chart-view",
+            kwargs={
+                "url_uuid": (resident or self.resident).url_uuid,
+                "chart_name": chart_name,
+            },
+        )
+
+    def test_detail_view_renders_lazy_chart_placeholders(self):
+        response = self.client.get(self.detail_url)
+
+        self.assertContains(response, 'class="lazy-chart"', count=3)
+        self.assertContains(
+            response,
+            self.get_chart_url("activity_hours_by_type_chart"),
+        )
+
+    @override_settings(CHARTS_LAZY_LOAD=False)
+    def test_detail_view_renders_charts_eagerly(self):
+        response = self.client.get(self.detail_url)
+
+        self.assertNotContains(response, 'class="lazy-chart"')
+        self.assertContains(response, "Plotly.newPlot", count=3)
+
+    def test_chart_json(self):
+        response = self.client.get(
+            self.get_chart_url("activity_hours_by_caregiver_role_chart"),
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("data", response.json())
+        self.assertIn("layout", response.json())
+
+    def test_unknown_chart_or_no_activities(self):
+        for chart_url in [
+            self.get_chart_url("unknown_chart"),
+            self.get_chart_url(
+                "activity_hours_by_type_chart",
+                resident=ResidentFactory(),
+            ),
+        ]:
+            with self.subTest(chart_url=chart_url):
+                response = self.client.get(chart_url)
+
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
 class TestResidentActivityLevel(TestCase):
     def setUp(self):
         self.resident = Resident.objects.create(first_name="John", last_initial="W")
@@ -204,6 +408,109 @@ class TestResidentActivityLevel(TestCase):
         self.assertEqual(self.resident.activity_level, expected)
 
 
+class ResidentWithActivityLevelTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory()
+
+    def _create_resident_with_activities(self, activity_count, on_hiatus=False):
+        resident = ResidentFactory(on_hiatus=on_hiatus)
+        residency = ResidencyFactory(resident=resident, home=self.home)
+
+        for _ in range(activity_count):
+            ResidentActivityFactory(
+                resident=resident,
+                residency=residency,
+                home=self.home,
+                activity_date=timezone.now(),
+            )
+
+        return resident
+
+    def test_activity_level_annotation(self):
+        expected_keys = {
+            0: "inactive",
+            1: "low",
+            4: "low",
+            5: "good",
+            9: "good",
+            10: "high",
+        }
+        residents = {
+            self._create_resident_with_activities(activity_count).id: activity_count
+            for activity_count in expected_keys
+        }
+
+        annotated_residents = Resident.objects.filter(
+            id__in=residents,
+        ).with_activity_level()
+
+        for resident in annotated_residents:
+            activity_count = residents[resident.id]
+
+            with self.subTest(activity_count=activity_count):
+                self.assertEqual(resident.weekly_activity_count, activity_count)
+                self.assertEqual(
+                    resident.activity_level_key,
+                    expected_keys[activity_count],
+                )
+
+                # The annotation matches the per-resident fallback
+                self.assertEqual(
+                    resident.activity_level,
+                    Resident.objects.get(id=resident.id).activity_level,
+                )
+
+    def test_on_hiatus_annotation(self):
+        resident = self._create_resident_with_activities(3, on_hiatus=True)
+
+        annotated_resident = Resident.objects.with_activity_level().get(
+            id=resident.id,
+        )
+
+        self.assertEqual(annotated_resident.activity_level_key, "on_hiatus")
+        self.assertEqual(
+            annotated_resident.activity_level,
+            {"color_class": "info", "text": "On hiatus"},
+        )
+
+    def test_annotated_activity_level_uses_no_queries(self):
+        self._create_resident_with_activities(2)
+        self._create_resident_with_activities(6)
+
+        with self.assertNumQueries(1):
+            activity_levels = [
+                resident.activity_level
+                for resident in Resident.objects.with_activity_level()
+            ]
+
+        self.assertEqual(len(activity_levels), 2)
+
+    def test_resident_list_view_shows_activity_level(self):
+        user = get_user_model().objects.create_user(
+            username="member",
+            password="password",
+        )
+        HomeUserRelationFactory(home=self.home, user=user)
+        resident = self._create_resident_with_activities(6)
+        other_resident = ResidentFactory(first_name="Other", last_initial="R")
+        ResidencyFactory(resident=other_resident, home=HomeFactory())
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("resident-list-view"))
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, "Moderate")
+        # Only the residents of the user's homes are listed
+        self.assertQuerySetEqual(response.context["residents"], [resident])
+
+    def test_resident_list_view_requires_login(self):
+        self._create_resident_with_activities(6)
+
+        response = self.client.get(reverse("resident-list-view"))
+
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
 class MakeResidencyTest(TestCase):
     def test_residency_count(self):
         out = StringIO()
@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    ResidentChartView,
     ResidentCreateView,
     ResidentDetailView,
     ResidentListView,
@@ -18,6 +19,11 @@ urlpatterns = [
         ResidentDetailView.as_view(),
         name="resident-detail-view",
     ),
+    path(
+        "<str:url_uuid>/charts/<slug:chart_name>/",
+        ResidentChartView.as_view(),
+        name="resident-chart-view",
+    ),
     path(
         "",
         ResidentListView.as_view(),
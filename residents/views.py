@@ -1,15 +1,19 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views.generic.base import View
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView
 from django.views.generic.edit import UpdateView
 from django.views.generic.list import ListView
 
-from residents.charts import (
-    prepare_activity_hours_by_caregiver_role_chart,
-    prepare_activity_hours_by_type_chart,
-    prepare_daily_activity_minutes_scatter_chart,
-)
+from common.chart_cache import get_cached_chart
+from common.charts import render_chart_html, render_lazy_chart_html
+from residents.charts import RESIDENT_CHARTS
 from .models import Resident
 
 
@@ -20,6 +24,7 @@ class ResidentCreateView(CreateView):
 
 class ResidentDetailView(LoginRequiredMixin, DetailView):
     model = Resident
+    queryset = Resident.objects.with_activity_level()
     context_object_name = "resident"
     template_name = "residents/resident_detail.html"
 
@@ -42,28 +47,58 @@ class ResidentDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        activities = self.object.resident_activities.all()
-
-        if activities:
-            context["resident_activities_by_date_chart"] = (
-                prepare_daily_activity_minutes_scatter_chart(activities)
-            )
-
-            context["activity_hours_by_type_chart"] = (
-                prepare_activity_hours_by_type_chart(
-                    activities,
+        activities = self.object.daily_activities.all()
+
+        if activities.exists() and settings.CHARTS_LAZY_LOAD:
+            for chart_name in RESIDENT_CHARTS:
+                context[chart_name] = render_lazy_chart_html(
+                    reverse(
+                        "resident-chart-view",
+                        kwargs={
+                            "url_uuid": self.object.url_uuid,
+                            "chart_name": chart_name,
+                        },
+                    ),
                 )
-            )
-
-            context["activity_hours_by_caregiver_role_chart"] = (
-                prepare_activity_hours_by_caregiver_role_chart(
-                    activities,
+        elif activities.exists():
+            for chart_name, build_chart in RESIDENT_CHARTS.items():
+                context[chart_name] = get_cached_chart(
+                    chart_name,
+                    "resident",
+                    self.object.id,
+                    "html",
+                    lambda build_chart=build_chart: render_chart_html(
+                        build_chart(activities),
+                    ),
                 )
-            )
 
         return context
 
 
+# The chart only reads data, so its cache writes are committed right away
+# instead of locking the shared cache rows until the response is sent
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ResidentChartView(LoginRequiredMixin, View):
+    """Return the figure JSON of one resident detail chart."""
+
+    def get(self, request, url_uuid, chart_name):
+        resident = get_object_or_404(Resident, url_uuid=url_uuid)
+        activities = resident.daily_activities.all()
+
+        if chart_name not in RESIDENT_CHARTS or not activities.exists():
+            raise Http404
+
+        chart_json = get_cached_chart(
+            chart_name,
+            "resident",
+            resident.id,
+            "json",
+            lambda: RESIDENT_CHARTS[chart_name](activities).to_json(),
+        )
+
+        return HttpResponse(chart_json, content_type="application/json")
+
+
 class ResidentUpdateView(LoginRequiredMixin, UpdateView):
     model = Resident
     fields = ["first_name", "last_initial", "on_hiatus"]
@@ -86,6 +121,22 @@ class ResidentUpdateView(LoginRequiredMixin, UpdateView):
         return obj
 
 
-class ResidentListView(ListView):
+class ResidentListView(LoginRequiredMixin, ListView):
     model = Resident
     context_object_name = "residents"
+
+    def get_queryset(self):
+        """Return the residents the user can see, with their activity
+        levels.
+
+        Superusers see all residents, other users the current residents of
+        their homes.
+        """
+        residents = Resident.objects.with_activity_level().order_by("first_name")
+
+        if self.request.user.is_superuser:
+            return residents
+
+        return residents.filter(
+            current_residency__home__home_user_relations__user=self.request.user,
+        )
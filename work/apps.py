@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WorkConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "work"
+
+    def ready(self):
+        # Connect the signal handlers that maintain the daily work totals
+        from . import signals  # noqa: F401
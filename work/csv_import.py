@@ -0,0 +1,66 @@
+from typing import TextIO
+
+from caregivers.models import CaregiverRole
+from common.csv_import import (
+    CSV_IMPORT_BATCH_SIZE,
+    CsvImporter,
+    CsvImportResult,
+    Lookup,
+    parse_date,
+    parse_minutes,
+)
+from homes.materialized_views import refresh_materialized_views
+from homes.models import Home
+
+from .models import Work, WorkDailyTotal, WorkType
+
+
+class WorkCsvImporter(CsvImporter):
+    """Import work from CSV rows with the home name or URL UUID, the date,
+    the work type and caregiver role names and the duration in minutes."""
+
+    model = Work
+    columns = ("home", "date", "type", "caregiver_role", "duration_minutes")
+
+    def run(
+        self,
+        csv_file: TextIO,
+        batch_size: int = CSV_IMPORT_BATCH_SIZE,
+    ) -> CsvImportResult:
+        """Import the work, then refresh the home materialized views once
+        for the whole file."""
+        result = super().run(csv_file, batch_size=batch_size)
+
+        if result.imported_count:
+            refresh_materialized_views()
+
+        return result
+
+    def load_lookups(self) -> None:
+        homes = list(Home.objects.values_list("id", "name", "url_uuid"))
+
+        self.homes = Lookup(
+            "home",
+            [(name, home_id) for home_id, name, _url_uuid in homes]
+            + [(url_uuid, home_id) for home_id, _name, url_uuid in homes],
+        )
+        self.work_types = Lookup(
+            "work type",
+            WorkType.objects.values_list("name", "id"),
+        )
+        self.caregiver_roles = Lookup(
+            "caregiver role",
+            CaregiverRole.objects.values_list("name", "id"),
+        )
+
+    def build_object(self, row: dict[str, str]) -> Work:
+        return Work(
+            home_id=self.homes.resolve(row["home"]),
+            date=parse_date(row["date"]),
+            type_id=self.work_types.resolve(row["type"]),
+            caregiver_role_id=self.caregiver_roles.resolve(row["caregiver_role"]),
+            duration_minutes=parse_minutes(row["duration_minutes"]),
+        )
+
+    def refresh_rollups(self, objs: list[Work]) -> None:
+        WorkDailyTotal.objects.refresh(work.rollup_key for work in objs)
@@ -1,4 +1,8 @@
 from django import forms
+from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+
+from homes.models import Home, HomeGroup
 
 from .models import Work
 
@@ -10,3 +14,82 @@ class WorkForm(forms.ModelForm):
         widgets = {
             "date": forms.DateInput(attrs={"type": "date"}),
         }
+
+
+class WorkReportFilterForm(forms.Form):
+    """Filters the work report by date range and by home or home group."""
+
+    start_date = forms.DateField(
+        label=_("Start date"),
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    end_date = forms.DateField(
+        label=_("End date"),
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+    )
+    home_group = forms.ModelChoiceField(
+        label=_("Home group"),
+        queryset=HomeGroup.objects.none(),
+        required=False,
+        empty_label=_("All home groups"),
+    )
+    home = forms.ModelChoiceField(
+        label=_("Home"),
+        queryset=Home.objects.none(),
+        required=False,
+        empty_label=_("All homes"),
+    )
+
+    def __init__(self, *args, homes: QuerySet[Home], **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.fields["home"].queryset = homes.order_by("name")
+        self.fields["home_group"].queryset = (
+            HomeGroup.objects.filter(homes__in=homes).distinct().order_by("name")
+        )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get("start_date")
+        end_date = cleaned_data.get("end_date")
+
+        if start_date and end_date and start_date > end_date:
+            raise forms.ValidationError(
+                _("The start date must be on or before the end date."),
+            )
+
+        return cleaned_data
+
+    def get_work_filters(self) -> dict:
+        """Return the start_date, end_date and home_ids arguments of
+        work.queries.filter_work for the cleaned filters.
+
+        Without a home or home group selection, the report includes all
+        homes.
+        """
+        home = self.cleaned_data["home"]
+        home_group = self.cleaned_data["home_group"]
+        home_ids = None
+
+        if home is not None:
+            home_ids = [home.id]
+
+        if home_group is not None:
+            group_home_ids = list(
+                self.fields["home"]
+                .queryset.filter(home_group=home_group)
+                .values_list("id", flat=True),
+            )
+            home_ids = (
+                group_home_ids
+                if home_ids is None
+                else [home_id for home_id in home_ids if home_id in group_home_ids]
+            )
+
+        return {
+            "start_date": self.cleaned_data["start_date"],
+            "end_date": self.cleaned_data["end_date"],
+            "home_ids": home_ids,
+        }
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from work.models import WorkDailyTotal
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily work totals from work."
+
+    def handle(self, *args, **options):
+        daily_total_count = WorkDailyTotal.objects.rebuild()
+
+        self.stdout.write(f"Rebuilt {daily_total_count} work daily total rows.")
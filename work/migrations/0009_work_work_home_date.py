@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0002_alter_caregiverrole_options_and_more'),
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('work', '0008_remove_work_work_duration_hours_gte_zero_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='work',
+            index=models.Index(fields=['home', 'date'], name='work_home_date'),
+        ),
+    ]
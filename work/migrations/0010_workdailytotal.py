@@ -0,0 +1,52 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_work_daily_total(apps, schema_editor):
+    Work = apps.get_model('work', 'Work')
+    WorkDailyTotal = apps.get_model('work', 'WorkDailyTotal')
+
+    daily_totals = (
+        Work.objects.values('home_id', 'date', 'caregiver_role_id', 'type_id')
+        .order_by()
+        .annotate(duration_minutes=Sum('duration_minutes'))
+    )
+
+    WorkDailyTotal.objects.bulk_create(
+        (WorkDailyTotal(**daily_total) for daily_total in daily_totals.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0002_alter_caregiverrole_options_and_more'),
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('work', '0009_work_work_home_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkDailyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('duration_minutes', models.PositiveIntegerField(verbose_name='Duration in minutes')),
+                ('caregiver_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='caregivers.caregiverrole')),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_work_totals', to='homes.home')),
+                ('type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='work.worktype')),
+            ],
+            options={
+                'verbose_name': 'work daily total',
+                'verbose_name_plural': 'work daily totals',
+                'db_table': 'work_daily_total',
+                'indexes': [models.Index(fields=['date'], name='work_daily_total_date')],
+                'constraints': [models.UniqueConstraint(fields=('home', 'date', 'caregiver_role', 'type'), name='work_daily_total_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_work_daily_total, migrations.RunPython.noop),
+    ]
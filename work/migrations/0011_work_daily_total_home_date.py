@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caregivers', '0002_alter_caregiverrole_options_and_more'),
+        ('homes', '0008_homeuserrelation_home_user_relation_home_user'),
+        ('work', '0010_workdailytotal'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workdailytotal',
+            index=models.Index(fields=['home', 'date'], name='work_daily_total_home_date'),
+        ),
+    ]
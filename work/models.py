@@ -1,10 +1,36 @@
-from django.db import models
+import datetime
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Q, Sum
 from django.utils.translation import gettext_lazy as _
 
 from caregivers.models import CaregiverRole
+from common.chart_cache import bump_chart_data_version
+from common.locks import lock_rows
 from core.constants import HOUR_MINUTES
+from homes.materialized_views import refresh_materialized_views
 from homes.models import Home
 
+# Work fields that determine which daily total rows a work entry
+# contributes to
+ROLLUP_FIELDS = {
+    "home",
+    "home_id",
+    "date",
+    "type",
+    "type_id",
+    "caregiver_role",
+    "caregiver_role_id",
+    "duration_minutes",
+}
+
+# Number of distinct dates refreshed per daily total query
+ROLLUP_REFRESH_BATCH_SIZE = 100
+
 
 class WorkType(models.Model):
     name = models.CharField(max_length=25)
@@ -18,6 +44,37 @@ class WorkType(models.Model):
         return self.name
 
 
+class WorkQuerySet(models.QuerySet):
+    """QuerySet that keeps the daily work totals up to date for bulk writes,
+    which do not send model signals."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+
+        WorkDailyTotal.objects.refresh(work.rollup_key for work in objs)
+
+        return objs
+
+    def update(self, **kwargs):
+        if not ROLLUP_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic():
+            work_ids = list(self.values_list("id", flat=True))
+            rollup_keys_before = set(
+                Work.objects.filter(id__in=work_ids).values_list("home_id", "date"),
+            )
+
+            rows = super().update(**kwargs)
+
+            rollup_keys_after = set(
+                Work.objects.filter(id__in=work_ids).values_list("home_id", "date"),
+            )
+            WorkDailyTotal.objects.refresh(rollup_keys_before | rollup_keys_after)
+
+        return rows
+
+
 class Work(models.Model):
     home = models.ForeignKey(
         Home,
@@ -42,13 +99,153 @@ class Work(models.Model):
         help_text=_("The number of minutes used performing this work"),
     )
 
+    objects = WorkQuerySet.as_manager()
+
     class Meta:
         db_table = "work"
         verbose_name = _("work")
         verbose_name_plural = _("work")
+        indexes = [
+            models.Index(fields=["home", "date"], name="work_home_date"),
+        ]
 
     def get_duration_hours(self):
         return self.duration_minutes / HOUR_MINUTES
 
+    @property
+    def rollup_key(self) -> tuple[int, datetime.date]:
+        """Return the (home ID, date) of the daily work totals this work
+        contributes to."""
+        return (self.home_id, self.date)
+
     def __str__(self):
         return f"{self.home} - {self.caregiver_role} - {self.type} - {self.date} - {self.duration_minutes} minutes"
+
+
+class WorkDailyTotalManager(models.Manager):
+    def _aggregate_work(self, work_filter: Q) -> models.QuerySet:
+        """Aggregate the work matching the filter into daily total rows."""
+        return (
+            Work.objects.filter(work_filter)
+            .values("home_id", "date", "caregiver_role_id", "type_id")
+            .order_by()
+            .annotate(duration_minutes=Sum("duration_minutes"))
+        )
+
+    @transaction.atomic
+    def refresh(self, rollup_keys: Iterable[tuple[int, datetime.date]]) -> None:
+        """Recompute the daily total rows for the given (home ID, date) keys
+        from the work.
+
+        Keys are grouped by date, so each batch is refreshed with one
+        delete and one insert. Every work write passes through here, so
+        this also invalidates the cached charts of the homes. The home
+        materialized views are left to the bulk paths and the scheduled
+        refresh, since each refresh recomputes them for all homes.
+
+        The homes are locked until the transaction commits, so concurrent
+        refreshes of a home run one after another, and each one aggregates
+        the work committed by the others instead of overwriting their
+        totals with a stale aggregate.
+        """
+        rollup_keys = list(rollup_keys)
+        bump_chart_data_version("home", (rollup_key[0] for rollup_key in rollup_keys))
+        lock_rows(Home, (rollup_key[0] for rollup_key in rollup_keys))
+
+        home_ids_by_date = defaultdict(set)
+        for home_id, date in rollup_keys:
+            home_ids_by_date[date].add(home_id)
+
+        dates = sorted(home_ids_by_date)
+        for start in range(0, len(dates), ROLLUP_REFRESH_BATCH_SIZE):
+            # Dates of the same homes, as in bulk imports, share one condition
+            dates_by_home_ids = defaultdict(list)
+            for date in dates[start : start + ROLLUP_REFRESH_BATCH_SIZE]:
+                dates_by_home_ids[frozenset(home_ids_by_date[date])].append(date)
+
+            rollup_filter = reduce(
+                or_,
+                (
+                    Q(date__in=batch_dates, home_id__in=home_ids)
+                    for home_ids, batch_dates in dates_by_home_ids.items()
+                ),
+            )
+
+            self.filter(rollup_filter).delete()
+            self._insert(self._aggregate_work(rollup_filter))
+
+    def rebuild(self) -> int:
+        """Rebuild all daily work totals from the work, and the home
+        materialized views from them, and return the number of daily total
+        rows."""
+        with transaction.atomic():
+            self.all().delete()
+            daily_total_count = self._insert(self._aggregate_work(Q()))
+
+        refresh_materialized_views()
+
+        return daily_total_count
+
+    def _insert(self, rows: Iterable[dict]) -> int:
+        """Insert the aggregated daily total rows, updating rows that were
+        concurrently inserted."""
+        daily_totals = [self.model(**row) for row in rows]
+
+        self.bulk_create(
+            daily_totals,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["home", "date", "caregiver_role", "type"],
+            update_fields=["duration_minutes"],
+        )
+
+        return len(daily_totals)
+
+
+class WorkDailyTotal(models.Model):
+    """Daily totals of work.
+
+    Holds one row per home, day, caregiver role and work type, so reports
+    aggregate days rather than individual work entries. The fields have
+    the same names as the Work fields, so work queries can run on either.
+    The totals are kept up to date when work is written and can be rebuilt
+    with the rebuild_work_daily_total command.
+    """
+
+    home = models.ForeignKey(
+        Home,
+        related_name="daily_work_totals",
+        on_delete=models.CASCADE,
+    )
+    date = models.DateField(_("Date"))
+    caregiver_role = models.ForeignKey(
+        CaregiverRole,
+        related_name="+",
+        on_delete=models.CASCADE,
+    )
+    type = models.ForeignKey(
+        WorkType,
+        related_name="+",
+        on_delete=models.CASCADE,
+    )
+    duration_minutes = models.PositiveIntegerField(_("Duration in minutes"))
+
+    objects = WorkDailyTotalManager()
+
+    class Meta:
+        db_table = "work_daily_total"
+        verbose_name = _("work daily total")
+        verbose_name_plural = _("work daily totals")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["home", "date", "caregiver_role", "type"],
+                name="work_daily_total_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="work_daily_total_date"),
+            models.Index(fields=["home", "date"], name="work_daily_total_home_date"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.home} - {self.date} - {self.caregiver_role} - {self.type}"
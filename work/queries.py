@@ -0,0 +1,267 @@
+import datetime
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.db import connection
+from django.db.models import DateField, F, Max, Min, QuerySet, Sum
+from django.db.models.functions import Trunc
+
+from core.constants import (
+    HOUR_MINUTES,
+    MONTH_DAYS,
+    WEEK_DAYS,
+    WORK_CHART_MAX_TIME_BUCKETS,
+)
+from homes.queries import dictfetchall
+
+# Approximate length in days of each time bucket resolution, shortest first
+TIME_BUCKET_DAYS = {
+    "day": 1,
+    "week": WEEK_DAYS,
+    "month": MONTH_DAYS,
+}
+
+
+def filter_work(
+    work: QuerySet,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    home_ids: list[int] | None = None,
+) -> QuerySet:
+    """Filter work, or daily work totals, to a date range and homes.
+
+    Args:
+        work (QuerySet): The Work records or WorkDailyTotal rows to filter.
+        start_date (date, optional): The first date to include.
+        end_date (date, optional): The last date to include.
+        home_ids (list[int], optional): The homes to include, or all homes
+            when None.
+
+    Returns:
+        QuerySet: The filtered work.
+    """
+    if start_date is not None:
+        work = work.filter(date__gte=start_date)
+
+    if end_date is not None:
+        work = work.filter(date__lte=end_date)
+
+    if home_ids is not None:
+        work = work.filter(home_id__in=home_ids)
+
+    return work
+
+
+def get_time_bucket_resolution(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    max_buckets: int = WORK_CHART_MAX_TIME_BUCKETS,
+) -> str:
+    """Return the shortest time bucket resolution that covers the date range
+    with at most max_buckets buckets, or months for longer ranges."""
+    range_days = (end_date - start_date).days + 1
+
+    for resolution, bucket_days in TIME_BUCKET_DAYS.items():
+        if range_days <= max_buckets * bucket_days:
+            return resolution
+
+    return "month"
+
+
+class WorkTotals(NamedTuple):
+    resolution: str
+    by_type: list[dict]
+    by_caregiver_role: list[dict]
+    by_caregiver_role_and_type: list[dict]
+    by_time_bucket_caregiver_role_and_type: list[dict]
+
+
+# Columns of the work totals groupings, by grouping
+WORK_TOTALS_GROUPINGS = {
+    "by_time_bucket_caregiver_role_and_type": ("bucket_date", "role_name", "work_type"),
+    "by_caregiver_role_and_type": ("role_name", "work_type"),
+    "by_caregiver_role": ("role_name",),
+    "by_type": ("work_type",),
+}
+WORK_TOTALS_COLUMNS = WORK_TOTALS_GROUPINGS["by_time_bucket_caregiver_role_and_type"]
+
+
+def _get_grouping_id(columns: tuple[str, ...]) -> int:
+    """Return the value of the SQL GROUPING() of all work totals columns for
+    the rows of a grouping, which has a bit set for each column that is not
+    grouped by."""
+    return sum(
+        1 << (len(WORK_TOTALS_COLUMNS) - 1 - index)
+        for index, column in enumerate(WORK_TOTALS_COLUMNS)
+        if column not in columns
+    )
+
+
+def _roll_up_work_minutes(rows: QuerySet) -> dict[str, dict[tuple, int]]:
+    """Fetch the work minutes of the finest grouping and add them up into
+    the coarser groupings in memory."""
+    minutes_by_grouping = {
+        grouping: defaultdict(int) for grouping in WORK_TOTALS_GROUPINGS
+    }
+
+    for row in rows.annotate(total_minutes=Sum("duration_minutes")):
+        for grouping, columns in WORK_TOTALS_GROUPINGS.items():
+            key = tuple(row[column] for column in columns)
+            minutes_by_grouping[grouping][key] += row["total_minutes"]
+
+    return minutes_by_grouping
+
+
+def _get_work_minutes_with_grouping_sets(
+    rows: QuerySet,
+) -> dict[str, dict[tuple, int]]:
+    """Compute the work minutes of all groupings in one GROUPING SETS query,
+    on databases that support it."""
+    rows_sql, params = rows.values(
+        *WORK_TOTALS_COLUMNS, "duration_minutes"
+    ).query.sql_with_params()
+    columns = ", ".join(WORK_TOTALS_COLUMNS)
+    grouping_sets = ", ".join(
+        f"({', '.join(grouping_columns)})"
+        for grouping_columns in WORK_TOTALS_GROUPINGS.values()
+    )
+
+    query = f"""
+    select
+        {columns},
+        sum(duration_minutes) as total_minutes,
+        grouping({columns}) as grouping_id
+    from ({rows_sql}) as work_rows
+    group by grouping sets ({grouping_sets});
+    """
+
+    groupings_by_id = {
+        _get_grouping_id(grouping_columns): (grouping, grouping_columns)
+        for grouping, grouping_columns in WORK_TOTALS_GROUPINGS.items()
+    }
+    minutes_by_grouping = {grouping: {} for grouping in WORK_TOTALS_GROUPINGS}
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+
+        for row in dictfetchall(cursor):
+            grouping, grouping_columns = groupings_by_id[row["grouping_id"]]
+            key = tuple(row[column] for column in grouping_columns)
+            minutes_by_grouping[grouping][key] = row["total_minutes"]
+
+    return minutes_by_grouping
+
+
+def _get_percent(minutes: int, total_minutes: int) -> float | None:
+    """Return the share of the total minutes, or None for a total of zero
+    minutes, as SQL returns for a division by zero."""
+    return minutes / total_minutes if total_minutes else None
+
+
+def get_work_totals(
+    work: QuerySet,
+    max_buckets: int = WORK_CHART_MAX_TIME_BUCKETS,
+) -> WorkTotals:
+    """Return the work hours by work type, by caregiver role, by caregiver
+    role and work type, and by time bucket, caregiver role and work type,
+    computed in a single pass over the work.
+
+    PostgreSQL computes all groupings in one GROUPING SETS query. Other
+    databases, such as SQLite, return the rows of the finest grouping,
+    which are added up into the other groupings in memory.
+
+    The time buckets are days, weeks or months, whichever keeps the date
+    range of the work within max_buckets buckets, so the row count stays
+    bounded however long the work history is.
+
+    The caregiver role and work type rows have each work type's percent of
+    the caregiver role's hours, in the whole date range or in the time
+    bucket.
+
+    Args:
+        work (QuerySet): The Work records, or the WorkDailyTotal rows, to
+            include.
+        max_buckets (int): The number of time buckets to aim for.
+
+    Returns:
+        WorkTotals: The time bucket resolution ("day", "week" or "month")
+            and the rows of each grouping, ordered by their columns, with
+            the bucket start "date".
+    """
+    date_range = work.aggregate(start_date=Min("date"), end_date=Max("date"))
+
+    if date_range["start_date"] is None:
+        return WorkTotals("day", [], [], [], [])
+
+    resolution = get_time_bucket_resolution(
+        date_range["start_date"],
+        date_range["end_date"],
+        max_buckets,
+    )
+
+    rows = (
+        work.annotate(
+            bucket_date=Trunc("date", resolution, output_field=DateField()),
+        )
+        .values(
+            "bucket_date",
+            role_name=F("caregiver_role__name"),
+            work_type=F("type__name"),
+        )
+        .order_by()
+    )
+
+    if connection.vendor == "postgresql":
+        minutes_by_grouping = _get_work_minutes_with_grouping_sets(rows)
+    else:
+        minutes_by_grouping = _roll_up_work_minutes(rows)
+
+    minutes_by_role = minutes_by_grouping["by_caregiver_role"]
+    minutes_by_bucket_and_role = defaultdict(int)
+    for (bucket_date, role_name, _work_type), minutes in minutes_by_grouping[
+        "by_time_bucket_caregiver_role_and_type"
+    ].items():
+        minutes_by_bucket_and_role[bucket_date, role_name] += minutes
+
+    return WorkTotals(
+        resolution=resolution,
+        by_type=[
+            {"work_type": work_type, "total_hours": minutes / HOUR_MINUTES}
+            for (work_type,), minutes in sorted(
+                minutes_by_grouping["by_type"].items(),
+            )
+        ],
+        by_caregiver_role=[
+            {"role_name": role_name, "total_hours": minutes / HOUR_MINUTES}
+            for (role_name,), minutes in sorted(minutes_by_role.items())
+        ],
+        by_caregiver_role_and_type=[
+            {
+                "role_name": role_name,
+                "work_type": work_type,
+                "total_hours": minutes / HOUR_MINUTES,
+                "percent_of_role_total_hours": _get_percent(
+                    minutes,
+                    minutes_by_role[(role_name,)],
+                ),
+            }
+            for (role_name, work_type), minutes in sorted(
+                minutes_by_grouping["by_caregiver_role_and_type"].items(),
+            )
+        ],
+        by_time_bucket_caregiver_role_and_type=[
+            {
+                "date": bucket_date,
+                "role_name": role_name,
+                "work_type": work_type,
+                "total_hours": minutes / HOUR_MINUTES,
+                "percent_of_role_total_hours": _get_percent(
+                    minutes,
+                    minutes_by_bucket_and_role[bucket_date, role_name],
+                ),
+            }
+            for (bucket_date, role_name, work_type), minutes in sorted(
+                minutes_by_grouping["by_time_bucket_caregiver_role_and_type"].items(),
+            )
+        ],
+    )
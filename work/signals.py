@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Work, WorkDailyTotal
+
+
+@receiver(pre_save, sender=Work)
+def remember_previous_rollup_key(sender, instance, **kwargs):
+    """Remember the daily totals key existing work contributed to before it
+    is changed."""
+    previous = (
+        Work.objects.filter(pk=instance.pk).values_list("home_id", "date").first()
+        if instance.pk
+        else None
+    )
+
+    instance._previous_rollup_key = previous
+
+
+@receiver(post_save, sender=Work)
+def refresh_daily_totals_on_save(sender, instance, **kwargs):
+    """Refresh the daily work totals for created or updated work, which also
+    invalidates the cached charts of its homes."""
+    rollup_keys = {instance.rollup_key}
+
+    previous_rollup_key = getattr(instance, "_previous_rollup_key", None)
+    if previous_rollup_key is not None:
+        rollup_keys.add(previous_rollup_key)
+
+    WorkDailyTotal.objects.refresh(rollup_keys)
+
+
+@receiver(post_delete, sender=Work)
+def refresh_daily_totals_on_delete(sender, instance, **kwargs):
+    """Refresh the daily work totals for deleted work."""
+    WorkDailyTotal.objects.refresh([instance.rollup_key])
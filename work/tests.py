@@ -1 +1,651 @@
-# Create your tests here.
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from caregivers.factories import CaregiverRoleFactory
+from homes.charts import (
+    build_daily_work_percent_by_caregiver_role_and_type_chart,
+    build_work_by_caregiver_role_and_type_chart_for_home,
+    build_work_by_caregiver_role_chart,
+    build_work_by_type_chart,
+    build_work_percent_by_caregiver_role_and_type_chart_for_home,
+)
+from homes.factories import HomeFactory, HomeGroupFactory, HomeUserRelationFactory
+from homes.models import Home
+
+from .factories import WorkFactory, WorkTypeFactory
+from .models import Work, WorkDailyTotal
+from .queries import (
+    WORK_TOTALS_COLUMNS,
+    WORK_TOTALS_GROUPINGS,
+    WorkTotals,
+    _get_grouping_id,
+    _get_work_minutes_with_grouping_sets,
+    _roll_up_work_minutes,
+    filter_work,
+    get_time_bucket_resolution,
+    get_work_totals,
+)
+
+
+class TimeBucketResolutionTest(TestCase):
+    def test_picks_shortest_resolution_within_budget(self):
+        start_date = date(2024, 1, 1)
+
+        for range_days, expected_resolution in [
+            (1, "day"),
+            (120, "day"),
+            (121, "week"),
+            (840, "week"),
+            (841, "month"),
+            (3650, "month"),
+        ]:
+            with self.subTest(range_days=range_days):
+                self.assertEqual(
+                    get_time_bucket_resolution(
+                        start_date,
+                        start_date + timedelta(days=range_days - 1),
+                        max_buckets=120,
+                    ),
+                    expected_resolution,
+                )
+
+
+class TotalHoursByTimeBucketTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory()
+        self.nurse = CaregiverRoleFactory(name="Nurse")
+        self.cooking = WorkTypeFactory(name="Cooking")
+        self.cleaning = WorkTypeFactory(name="Cleaning")
+
+    def create_daily_work(self, start_date: date, days: int):
+        Work.objects.bulk_create(
+            [
+                Work(
+                    home=self.home,
+                    caregiver_role=self.nurse,
+                    type=self.cooking if day % 2 else self.cleaning,
+                    date=start_date + timedelta(days=day),
+                    duration_minutes=60,
+                )
+                for day in range(days)
+            ],
+        )
+
+    def test_no_work(self):
+        self.assertEqual(
+            get_work_totals(Work.objects.none()),
+            WorkTotals("day", [], [], [], []),
+        )
+
+    def test_short_history_is_daily(self):
+        self.create_daily_work(date(2024, 1, 1), 10)
+        WorkFactory(
+            home=self.home,
+            caregiver_role=self.nurse,
+            type=self.cooking,
+            date=date(2024, 1, 1),
+            duration_minutes=180,
+        )
+
+        work_totals = get_work_totals(Work.objects.filter(home=self.home))
+        resolution = work_totals.resolution
+        rows = work_totals.by_time_bucket_caregiver_role_and_type
+
+        self.assertEqual(resolution, "day")
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(
+            rows[:2],
+            [
+                {
+                    "date": date(2024, 1, 1),
+                    "role_name": "Nurse",
+                    "work_type": "Cleaning",
+                    "total_hours": 1.0,
+                    "percent_of_role_total_hours": 0.25,
+                },
+                {
+                    "date": date(2024, 1, 1),
+                    "role_name": "Nurse",
+                    "work_type": "Cooking",
+                    "total_hours": 3.0,
+                    "percent_of_role_total_hours": 0.75,
+                },
+            ],
+        )
+
+    def test_long_history_is_bucketed_within_budget(self):
+        # Four years of daily work, starting on a Monday
+        self.create_daily_work(date(2024, 1, 1), 4 * 365)
+
+        work_totals = get_work_totals(
+            Work.objects.filter(home=self.home),
+            max_buckets=52,
+        )
+        resolution = work_totals.resolution
+        rows = work_totals.by_time_bucket_caregiver_role_and_type
+
+        self.assertEqual(resolution, "month")
+        self.assertEqual(len({row["date"] for row in rows}), 48)
+        self.assertEqual(rows[0]["date"], date(2024, 1, 1))
+        self.assertEqual(rows[2]["date"], date(2024, 2, 1))
+        self.assertEqual(
+            sum(row["total_hours"] for row in rows),
+            4 * 365,
+        )
+
+        work_totals = get_work_totals(
+            Work.objects.filter(home=self.home, date__lt=date(2024, 7, 1)),
+            max_buckets=52,
+        )
+        resolution = work_totals.resolution
+        rows = work_totals.by_time_bucket_caregiver_role_and_type
+
+        self.assertEqual(resolution, "week")
+        self.assertEqual(rows[2]["date"], date(2024, 1, 8))
+        self.assertAlmostEqual(
+            rows[0]["percent_of_role_total_hours"]
+            + rows[1]["percent_of_role_total_hours"],
+            1,
+        )
+
+
+class WorkTotalsTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory()
+        self.nurse = CaregiverRoleFactory(name="Nurse")
+        self.volunteer = CaregiverRoleFactory(name="Volunteer")
+        self.cooking = WorkTypeFactory(name="Cooking")
+        self.cleaning = WorkTypeFactory(name="Cleaning")
+
+        for day, caregiver_role, work_type, duration_minutes in [
+            (1, self.nurse, self.cooking, 60),
+            (1, self.nurse, self.cleaning, 30),
+            (2, self.nurse, self.cooking, 90),
+            (2, self.volunteer, self.cooking, 120),
+            (3, self.volunteer, self.cleaning, 60),
+        ]:
+            WorkFactory(
+                home=self.home,
+                caregiver_role=caregiver_role,
+                type=work_type,
+                date=date(2024, 1, day),
+                duration_minutes=duration_minutes,
+            )
+
+    def test_groupings_match_separate_aggregations(self):
+        work_totals = get_work_totals(Work.objects.all())
+
+        def get_total_hours(*columns):
+            return [
+                (*row[:-1], row[-1] / 60)
+                for row in Work.objects.values(*columns)
+                .order_by(*columns)
+                .annotate(total_minutes=Sum("duration_minutes"))
+                .values_list(*columns, "total_minutes")
+            ]
+
+        self.assertEqual(
+            [(row["work_type"], row["total_hours"]) for row in work_totals.by_type],
+            get_total_hours("type__name"),
+        )
+        self.assertEqual(
+            [
+                (row["role_name"], row["total_hours"])
+                for row in work_totals.by_caregiver_role
+            ],
+            get_total_hours("caregiver_role__name"),
+        )
+        self.assertEqual(
+            [
+                (row["role_name"], row["work_type"], row["total_hours"])
+                for row in work_totals.by_caregiver_role_and_type
+            ],
+            get_total_hours("caregiver_role__name", "type__name"),
+        )
+        self.assertEqual(
+            [
+                row["percent_of_role_total_hours"]
+                for row in work_totals.by_caregiver_role_and_type
+            ],
+            [1 / 6, 5 / 6, 1 / 3, 2 / 3],
+        )
+        self.assertEqual(
+            [
+                (row["date"], row["role_name"], row["work_type"], row["total_hours"])
+                for row in work_totals.by_time_bucket_caregiver_role_and_type
+            ],
+            get_total_hours("date", "caregiver_role__name", "type__name"),
+        )
+
+    def test_zero_minute_work_has_no_percent(self):
+        cook = CaregiverRoleFactory(name="Cook")
+        WorkFactory(
+            home=self.home,
+            caregiver_role=cook,
+            type=self.cooking,
+            date=date(2024, 1, 4),
+            duration_minutes=0,
+        )
+
+        work_totals = get_work_totals(Work.objects.all())
+
+        self.assertIn(
+            {
+                "role_name": "Cook",
+                "work_type": "Cooking",
+                "total_hours": 0,
+                "percent_of_role_total_hours": None,
+            },
+            work_totals.by_caregiver_role_and_type,
+        )
+        self.assertIn(
+            {
+                "date": date(2024, 1, 4),
+                "role_name": "Cook",
+                "work_type": "Cooking",
+                "total_hours": 0,
+                "percent_of_role_total_hours": None,
+            },
+            work_totals.by_time_bucket_caregiver_role_and_type,
+        )
+
+    def test_single_aggregation_query(self):
+        # One query for the date range and one for all groupings
+        with self.assertNumQueries(2):
+            get_work_totals(Work.objects.filter(home=self.home))
+
+    def test_grouping_sets_match_rollup(self):
+        if connection.vendor != "postgresql":
+            self.skipTest(f"{connection.vendor} does not support GROUPING SETS")
+
+        rows = (
+            Work.objects.annotate(bucket_date=F("date"))
+            .values(
+                "bucket_date",
+                role_name=F("caregiver_role__name"),
+                work_type=F("type__name"),
+            )
+            .order_by()
+        )
+
+        self.assertEqual(
+            _get_work_minutes_with_grouping_sets(rows),
+            {
+                grouping: dict(minutes)
+                for grouping, minutes in _roll_up_work_minutes(rows).items()
+            },
+        )
+
+    def test_grouping_ids(self):
+        # GROUPING() sets a bit for each column that is not grouped by, with
+        # the first column as the highest bit
+        self.assertEqual(
+            {
+                grouping: _get_grouping_id(columns)
+                for grouping, columns in WORK_TOTALS_GROUPINGS.items()
+            },
+            {
+                "by_time_bucket_caregiver_role_and_type": 0b000,
+                "by_caregiver_role_and_type": 0b100,
+                "by_caregiver_role": 0b101,
+                "by_type": 0b110,
+            },
+        )
+
+    def test_grouping_sets_query(self):
+        rows = (
+            Work.objects.filter(home=self.home)
+            .annotate(bucket_date=F("date"))
+            .values(
+                "bucket_date",
+                role_name=F("caregiver_role__name"),
+                work_type=F("type__name"),
+            )
+            .order_by()
+        )
+        cursor = mock.MagicMock()
+        cursor.description = [
+            (column,)
+            for column in [*WORK_TOTALS_COLUMNS, "total_minutes", "grouping_id"]
+        ]
+        cursor.fetchall.return_value = [
+            (date(2024, 1, 1), "Nurse", "Cooking", 60, 0b000),
+            (None, "Nurse", "Cooking", 150, 0b100),
+            (None, "Nurse", None, 180, 0b101),
+            (None, None, "Cooking", 270, 0b110),
+        ]
+
+        with mock.patch("work.queries.connection") as connection_mock:
+            connection_mock.cursor.return_value.__enter__.return_value = cursor
+            minutes_by_grouping = _get_work_minutes_with_grouping_sets(rows)
+
+        query, params = cursor.execute.call_args.args
+        self.assertIn(
+            "grouping(bucket_date, role_name, work_type) as grouping_id",
+            query,
+        )
+        self.assertIn(
+            "group by grouping sets ("
+            "(bucket_date, role_name, work_type), "
+            "(role_name, work_type), "
+            "(role_name), "
+            "(work_type));",
+            query,
+        )
+        self.assertEqual(list(params), [self.home.id])
+        self.assertEqual(
+            minutes_by_grouping,
+            {
+                "by_time_bucket_caregiver_role_and_type": {
+                    (date(2024, 1, 1), "Nurse", "Cooking"): 60,
+                },
+                "by_caregiver_role_and_type": {("Nurse", "Cooking"): 150},
+                "by_caregiver_role": {("Nurse",): 180},
+                "by_type": {("Cooking",): 270},
+            },
+        )
+
+    def test_home_work_charts_share_one_aggregation(self):
+        chart_builders = [
+            build_work_by_type_chart,
+            build_work_by_caregiver_role_chart,
+            build_daily_work_percent_by_caregiver_role_and_type_chart,
+            build_work_percent_by_caregiver_role_and_type_chart_for_home,
+            build_work_by_caregiver_role_and_type_chart_for_home,
+        ]
+
+        def get_work_queries(build_charts):
+            # A fresh home, as in a separate request
+            home = Home.objects.get(pk=self.home.pk)
+
+            with CaptureQueriesContext(connection) as queries:
+                for build_chart in build_charts:
+                    build_chart(home)
+
+            return [
+                query["sql"]
+                for query in queries.captured_queries
+                if 'FROM "work"' in query["sql"]
+            ]
+
+        # One query for the date range and one for all groupings
+        self.assertEqual(len(get_work_queries(chart_builders)), 2)
+
+        # Charts of the home built in later requests reuse the cached totals
+        for build_chart in chart_builders:
+            self.assertEqual(get_work_queries([build_chart]), [])
+
+
+class WorkDailyTotalTest(TestCase):
+    def setUp(self):
+        self.home = HomeFactory(name="Home A")
+        self.nurse = CaregiverRoleFactory(name="Nurse")
+        self.cooking = WorkTypeFactory(name="Cooking")
+        self.cleaning = WorkTypeFactory(name="Cleaning")
+        self.today = date.today()
+
+    def _create_work(self, **kwargs):
+        work_kwargs = {
+            "home": self.home,
+            "caregiver_role": self.nurse,
+            "type": self.cooking,
+            "date": self.today,
+            "duration_minutes": 30,
+        }
+        work_kwargs.update(kwargs)
+
+        return Work.objects.create(**work_kwargs)
+
+    def _daily_totals(self):
+        return list(
+            WorkDailyTotal.objects.order_by(
+                "date", "home__name", "type__name"
+            ).values_list("home__name", "date", "type__name", "duration_minutes"),
+        )
+
+    def test_create(self):
+        self._create_work()
+        self._create_work(duration_minutes=45)
+        self._create_work(type=self.cleaning)
+
+        self.assertEqual(
+            self._daily_totals(),
+            [
+                ("Home A", self.today, "Cleaning", 30),
+                ("Home A", self.today, "Cooking", 75),
+            ],
+        )
+
+    def test_update_moves_work_between_homes(self):
+        work = self._create_work()
+        other_home = HomeFactory(name="Home B")
+        yesterday = self.today - timedelta(days=1)
+
+        work.home = other_home
+        work.date = yesterday
+        work.save()
+
+        self.assertEqual(
+            self._daily_totals(),
+            [("Home B", yesterday, "Cooking", 30)],
+        )
+
+    def test_delete(self):
+        work = self._create_work()
+        self._create_work()
+
+        work.delete()
+
+        self.assertEqual(self._daily_totals(), [("Home A", self.today, "Cooking", 30)])
+
+        Work.objects.all().delete()
+
+        self.assertEqual(self._daily_totals(), [])
+
+    def test_bulk_create(self):
+        Work.objects.bulk_create(
+            [
+                Work(
+                    home=self.home,
+                    caregiver_role=self.nurse,
+                    type=self.cleaning,
+                    date=self.today - timedelta(days=days_ago),
+                    duration_minutes=20,
+                )
+                for days_ago in [0, 0, 1]
+            ],
+        )
+
+        self.assertEqual(
+            self._daily_totals(),
+            [
+                ("Home A", self.today - timedelta(days=1), "Cleaning", 20),
+                ("Home A", self.today, "Cleaning", 40),
+            ],
+        )
+
+    def test_queryset_update(self):
+        self._create_work()
+        self._create_work(type=self.cleaning)
+
+        Work.objects.update(type=self.cleaning)
+
+        self.assertEqual(
+            self._daily_totals(),
+            [("Home A", self.today, "Cleaning", 60)],
+        )
+
+    def test_rebuild_command(self):
+        self._create_work()
+        self._create_work(duration_minutes=15)
+        WorkDailyTotal.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_work_daily_total", stdout=out)
+
+        self.assertIn("Rebuilt 1 work daily total rows.", out.getvalue())
+        self.assertEqual(self._daily_totals(), [("Home A", self.today, "Cooking", 45)])
+
+    def test_work_queries_match_daily_totals(self):
+        for days_ago in range(10):
+            for _ in range(3):
+                self._create_work(
+                    date=self.today - timedelta(days=days_ago),
+                    type=self.cooking if days_ago % 2 else self.cleaning,
+                )
+
+        self.assertEqual(
+            get_work_totals(WorkDailyTotal.objects.all()),
+            get_work_totals(Work.objects.all()),
+        )
+
+
+class WorkDailyTotalConcurrencyTest(TransactionTestCase):
+    def test_concurrent_refreshes_keep_all_work(self):
+        if connection.vendor != "postgresql":
+            self.skipTest(f"No concurrent transactions on {connection.vendor}")
+
+        work_kwargs = {
+            "home": HomeFactory(),
+            "caregiver_role": CaregiverRoleFactory(name="Nurse"),
+            "type": WorkTypeFactory(name="Cooking"),
+            "date": date(2024, 1, 1),
+        }
+        first_work_saved = threading.Event()
+
+        def save_first_work():
+            try:
+                with transaction.atomic():
+                    Work.objects.create(duration_minutes=30, **work_kwargs)
+                    first_work_saved.set()
+                    # Commit after the other transaction has saved its work
+                    time.sleep(0.5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=save_first_work)
+        thread.start()
+        self.assertTrue(first_work_saved.wait(timeout=10))
+
+        # Refreshing waits for the first transaction, then aggregates its work
+        with transaction.atomic():
+            Work.objects.create(duration_minutes=45, **work_kwargs)
+
+        thread.join()
+
+        self.assertEqual(
+            list(WorkDailyTotal.objects.values_list("duration_minutes", flat=True)),
+            [75],
+        )
+
+
+class WorkReportViewTest(TestCase):
+    def test_renders_work_percent_over_time_chart(self):
+        WorkFactory(date=date(2020, 1, 1))
+        WorkFactory(date=date(2024, 1, 1))
+
+        response = self.client.get(reverse("work-report-view"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response,
+            "Monthly work percent by caregiver role and work type",
+        )
+
+    def test_renders_zero_minute_work(self):
+        WorkFactory(duration_minutes=0)
+
+        response = self.client.get(reverse("work-report-view"))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_filters_by_date_range_and_home(self):
+        user = get_user_model().objects.create_user(
+            username="member",
+            password="password",
+        )
+        home = HomeFactory(name="Member home", home_group=HomeGroupFactory())
+        other_home = HomeFactory(name="Other home")
+        HomeUserRelationFactory(home=home, user=user)
+        nurse = CaregiverRoleFactory(name="Nurse")
+        volunteer = CaregiverRoleFactory(name="Volunteer")
+        WorkFactory(home=home, caregiver_role=nurse, date=date(2024, 1, 15))
+        WorkFactory(home=home, caregiver_role=volunteer, date=date(2023, 1, 15))
+        WorkFactory(home=other_home, caregiver_role=volunteer, date=date(2024, 1, 15))
+        self.client.login(username="member", password="password")
+
+        response = self.client.get(
+            reverse("work-report-view"),
+            {
+                "start_date": "2024-01-01",
+                "end_date": "2024-01-31",
+                "home_group": home.home_group.id,
+            },
+        )
+
+        # Only the member's home is offered and only its work is reported
+        self.assertQuerySetEqual(
+            response.context["filter_form"].fields["home"].queryset,
+            [home],
+        )
+        work_by_caregiver_role_chart = response.context["work_by_caregiver_role_chart"]
+        self.assertIn("Nurse", work_by_caregiver_role_chart)
+        self.assertNotIn("Volunteer", work_by_caregiver_role_chart)
+
+        response = self.client.get(
+            reverse("work-report-view"),
+            {"start_date": "2025-01-01", "home": home.id},
+        )
+
+        self.assertContains(
+            response,
+            "No work has been recorded for the selected dates and homes.",
+        )
+
+    def test_invalid_date_range(self):
+        WorkFactory(date=date(2024, 1, 1))
+
+        response = self.client.get(
+            reverse("work-report-view"),
+            {"start_date": "2024-02-01", "end_date": "2024-01-01"},
+        )
+
+        self.assertContains(
+            response,
+            "The start date must be on or before the end date.",
+        )
+        # The report falls back to all work
+        self.assertContains(response, "Daily work percent")
+
+
+class WorkFilterTest(TestCase):
+    def setUp(self):
+        self.homes = [HomeFactory() for _ in range(2)]
+        for home in self.homes:
+            for day in range(1, 11):
+                WorkFactory(home=home, date=date(2024, 1, day))
+
+    def test_home_date_range_uses_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest(f"No query plan checks for {connection.vendor}")
+
+        self.assertIn(
+            "work_daily_total_home_date",
+            filter_work(
+                WorkDailyTotal.objects.all(),
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 1, 31),
+                home_ids=[self.homes[0].id],
+            ).explain(),
+        )